@@ -0,0 +1,126 @@
+"""
+Synthetic, seeded datasets for the benchmark suite.
+
+Every generator is deterministic for a given shape and seed, so results are
+comparable between runs and machines.
+"""
+
+import os
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+SCALES = {
+    "small": (10_000, 10),
+    "medium": (100_000, 20),
+    "large": (1_000_000, 50),
+}
+
+
+def make_numeric(rows: int, columns: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Create correlated numerical columns with a few missing values.
+
+    Args:
+        rows: Number of rows
+        columns: Number of columns
+        seed: Random seed
+
+    Returns:
+        pd.DataFrame: Columns "x0", "x1", ...
+    """
+    rng = np.random.default_rng(seed)
+    latent = rng.normal(size=(rows, 1))
+    values = 0.5 * latent + rng.normal(size=(rows, columns))
+    values[rng.random((rows, columns)) < 0.001] = np.nan
+    return pd.DataFrame(values, columns=[f"x{i}" for i in range(columns)])
+
+
+def make_regression(rows: int, columns: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Create complete numerical features and a noisy linear "target" column.
+
+    Args:
+        rows: Number of rows
+        columns: Number of feature columns
+        seed: Random seed
+
+    Returns:
+        pd.DataFrame: Feature columns "x0", "x1", ... and "target"
+    """
+    rng = np.random.default_rng(seed)
+    features = rng.normal(size=(rows, columns))
+    target = features @ rng.normal(size=columns) + rng.normal(scale=0.1, size=rows)
+    data = pd.DataFrame(features, columns=[f"x{i}" for i in range(columns)])
+    data["target"] = target
+    return data
+
+
+def make_classification(rows: int, columns: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Create numerical features and a binary "target" column.
+
+    Args:
+        rows: Number of rows
+        columns: Number of feature columns
+        seed: Random seed
+
+    Returns:
+        pd.DataFrame: Feature columns "x0", "x1", ... and "target"
+    """
+    data = make_regression(rows, columns, seed)
+    data["target"] = (data["target"] > data["target"].median()).astype(int)
+    return data
+
+
+def make_mixed(rows: int, columns: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Create a frame of numerical, integer and low-cardinality text columns.
+
+    Args:
+        rows: Number of rows
+        columns: Number of numerical columns
+        seed: Random seed
+
+    Returns:
+        pd.DataFrame: Numerical columns plus "count" and "category"
+    """
+    rng = np.random.default_rng(seed)
+    data = make_numeric(rows, columns, seed)
+    data["count"] = rng.integers(0, 1000, size=rows)
+    data["category"] = rng.choice(["alpha", "beta", "gamma", "delta"], size=rows)
+    return data
+
+
+def write_csv(data: pd.DataFrame, directory: str, name: str) -> str:
+    """
+    Write a dataset to CSV once and return its path.
+
+    Args:
+        data: Dataset to write
+        directory: Directory to write to
+        name: File name without extension
+
+    Returns:
+        str: Path of the CSV file
+    """
+    path = os.path.join(directory, f"{name}.csv")
+    if not os.path.exists(path):
+        data.to_csv(path, index=False)
+    return path
+
+
+def shape(scale: str) -> Tuple[int, int]:
+    """
+    Look up the (rows, columns) of a named scale.
+
+    Args:
+        scale: One of the keys of SCALES
+
+    Returns:
+        Tuple[int, int]: Number of rows and columns
+    """
+    if scale not in SCALES:
+        raise ValueError(f"Unknown scale {scale!r}, expected one of {sorted(SCALES)}")
+    return SCALES[scale]
@@ -0,0 +1,475 @@
+#!/usr/bin/env python
+"""
+Benchmark suite for DataLib.
+
+Times the public datalib functions on synthetic datasets, records wall time
+and peak traced memory as JSON, and compares them with a saved baseline.
+
+Usage:
+    python benchmarks/run.py [--scale small|medium|large] [--filter NAME ...]
+    python benchmarks/run.py --save-baseline     # record the baseline to compare with
+    python benchmarks/run.py --list              # show the benchmark cases
+
+The run exits with status 1 if any case is slower or uses more memory than the
+baseline by more than --threshold.
+"""
+
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import datasets  # noqa: E402
+
+import datalib  # noqa: E402
+from datalib import data_manipulation, ml, statistics, visualization  # noqa: E402
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Differences below these are treated as noise when comparing with the baseline
+MIN_SECONDS = 0.005
+MIN_BYTES = 1 << 20
+
+
+class Context:
+    """Datasets of one scale, generated (and written to CSV) on first use."""
+
+    def __init__(self, rows: int, columns: int, directory: str):
+        self.rows = rows
+        self.columns = columns
+        self.directory = directory
+        self._cache: Dict[str, Any] = {}
+
+    def dataset(self, kind: str) -> pd.DataFrame:
+        """Return the dataset made by datasets.make_<kind>."""
+        if kind not in self._cache:
+            generator = getattr(datasets, f"make_{kind}")
+            self._cache[kind] = generator(self.rows, self.columns)
+        return self._cache[kind]
+
+    def csv(self, kind: str) -> str:
+        """Return the path of the dataset written as CSV."""
+        return datasets.write_csv(self.dataset(kind), self.directory, kind)
+
+    def features(self, kind: str) -> pd.DataFrame:
+        """Return the feature columns of a dataset with a target."""
+        return self.dataset(kind).drop(columns="target")
+
+
+CASES: Dict[str, Callable[[Context], Callable[[], Any]]] = {}
+
+
+def case(name: str):
+    """Register a benchmark; the decorated function prepares and returns the timed callable."""
+
+    def register(setup: Callable[[Context], Callable[[], Any]]):
+        CASES[name] = setup
+        return setup
+
+    return register
+
+
+def _consume(result: Any) -> None:
+    """Exhaust lazy results so that their work is part of the measurement."""
+    if hasattr(result, "__next__"):
+        for _ in result:
+            pass
+
+
+def _render(fig: Any) -> None:
+    """Draw a figure to PNG in memory."""
+    fig.savefig(io.BytesIO(), format="png")
+    fig.clear()
+
+
+@case("read_csv")
+def _read_csv(ctx: Context):
+    path = ctx.csv("mixed")
+    return lambda: data_manipulation.read_csv(path)
+
+
+@case("read_csv_optimized")
+def _read_csv_optimized(ctx: Context):
+    path = ctx.csv("mixed")
+    return lambda: data_manipulation.read_csv(path, optimize_memory=True)
+
+
+@case("read_csv_stream")
+def _read_csv_stream(ctx: Context):
+    path = ctx.csv("mixed")
+    return lambda: _consume(iter(data_manipulation.read_csv(path, stream=True)))
+
+
+@case("normalize_column_minmax")
+def _normalize_minmax(ctx: Context):
+    data = ctx.dataset("numeric")
+    return lambda: data_manipulation.normalize_column(data, "x0", method="minmax")
+
+
+@case("normalize_column_zscore")
+def _normalize_zscore(ctx: Context):
+    data = ctx.dataset("numeric")
+    return lambda: data_manipulation.normalize_column(data, "x0", method="zscore")
+
+
+@case("normalizer_fit_transform")
+def _normalizer(ctx: Context):
+    data = ctx.dataset("numeric")
+    return lambda: data_manipulation.Normalizer("zscore").fit_transform(data)
+
+
+@case("compact_frame")
+def _compact_frame(ctx: Context):
+    data = ctx.dataset("mixed")
+    return lambda: data_manipulation.compact_frame(data)
+
+
+@case("describe_column")
+def _describe_column(ctx: Context):
+    data = ctx.dataset("numeric")
+    return lambda: statistics.describe_column(data, "x0")
+
+
+@case("describe_column_approximate_stream")
+def _describe_column_stream(ctx: Context):
+    path = ctx.csv("mixed")
+    return lambda: statistics.describe_column(
+        data_manipulation.read_csv(path, stream=True), "x0", approximate=True
+    )
+
+
+@case("describe_frame")
+def _describe_frame(ctx: Context):
+    data = ctx.dataset("numeric")
+    return lambda: statistics.describe_frame(data)
+
+
+@case("correlation_analysis")
+def _correlation_analysis(ctx: Context):
+    data = ctx.dataset("numeric")
+    return lambda: statistics.correlation_analysis(data)
+
+
+@case("correlation_matrix_spearman")
+def _correlation_spearman(ctx: Context):
+    data = ctx.dataset("numeric").dropna()
+    return lambda: statistics.correlation_matrix(data, method="spearman")
+
+
+@case("correlation_matrix_kendall")
+def _correlation_kendall(ctx: Context):
+    # Kendall is O(columns^2 n log n); a fixed sample keeps it comparable across scales
+    data = ctx.dataset("numeric").dropna().head(10_000)
+    return lambda: statistics.correlation_matrix(data, method="kendall")
+
+
+@case("top_correlations")
+def _top_correlations(ctx: Context):
+    data = ctx.dataset("numeric").dropna()
+    return lambda: statistics.top_correlations(data, k=10)
+
+
+@case("ttest_columns")
+def _ttest_columns(ctx: Context):
+    data = ctx.dataset("numeric").dropna()
+    return lambda: statistics.ttest_columns(data, "x0", "x1")
+
+
+@case("ttest_many")
+def _ttest_many(ctx: Context):
+    data = ctx.dataset("classification")
+    return lambda: statistics.ttest_many(data, group_column="target", correction="fdr_bh")
+
+
+@case("regression_fit")
+def _regression_fit(ctx: Context):
+    X, y = ctx.features("regression"), ctx.dataset("regression")["target"]
+    return lambda: ml.RegressionModel().fit(X, y)
+
+
+@case("regression_partial_fit")
+def _regression_partial_fit(ctx: Context):
+    X, y = ctx.features("regression"), ctx.dataset("regression")["target"]
+
+    def run():
+        model = ml.RegressionModel()
+        for start in range(0, len(X), 10_000):
+            model.partial_fit(X[start : start + 10_000], y[start : start + 10_000])
+
+    return run
+
+
+@case("regression_predict_evaluate")
+def _regression_predict(ctx: Context):
+    X, y = ctx.features("regression"), ctx.dataset("regression")["target"]
+    model = ml.RegressionModel()
+    model.fit(X, y)
+    return lambda: model.evaluate(X, y)
+
+
+@case("polynomial_fit")
+def _polynomial_fit(ctx: Context):
+    data = ctx.dataset("regression").head(10_000)
+    X, y = data.drop(columns="target"), data["target"]
+    return lambda: ml.RegressionModel("polynomial", degree=2).fit(X, y)
+
+
+@case("logistic_fit")
+def _logistic_fit(ctx: Context):
+    X, y = ctx.features("classification"), ctx.dataset("classification")["target"]
+    return lambda: ml.ClassificationModel("logistic").fit(X, y)
+
+
+@case("logistic_predict_evaluate")
+def _logistic_predict(ctx: Context):
+    X, y = ctx.features("classification"), ctx.dataset("classification")["target"]
+    model = ml.ClassificationModel("logistic")
+    model.fit(X, y)
+    return lambda: model.evaluate(X, y, report=False)
+
+
+@case("knn_predict")
+def _knn_predict(ctx: Context):
+    X, y = ctx.features("classification"), ctx.dataset("classification")["target"]
+    model = ml.ClassificationModel("knn")
+    model.fit(X, y)
+    queries = X.head(1000)
+    return lambda: model.predict(queries)
+
+
+@case("approximate_knn_predict")
+def _approximate_knn_predict(ctx: Context):
+    X, y = ctx.features("classification"), ctx.dataset("classification")["target"]
+    model = ml.ClassificationModel("approximate_knn", random_state=0)
+    model.fit(X, y)
+    queries = X.head(1000)
+    return lambda: model.predict(queries)
+
+
+@case("prepare_data")
+def _prepare_data(ctx: Context):
+    data = ctx.dataset("classification")
+    return lambda: ml.prepare_data(data, "target", random_state=0)
+
+
+@case("split_indices")
+def _split_indices(ctx: Context):
+    data = ctx.dataset("classification")
+    return lambda: ml.split_indices(data, stratify="target", random_state=0)
+
+
+@case("plot_histogram")
+def _plot_histogram(ctx: Context):
+    data = ctx.dataset("numeric")
+    return lambda: _render(visualization.plot_histogram(data, "x0"))
+
+
+@case("plot_scatter")
+def _plot_scatter(ctx: Context):
+    data = ctx.dataset("numeric")
+    return lambda: _render(visualization.plot_scatter(data, "x0", "x1"))
+
+
+@case("plot_scatter_density")
+def _plot_scatter_density(ctx: Context):
+    data = ctx.dataset("numeric")
+    return lambda: _render(visualization.plot_scatter(data, "x0", "x1", mode="density"))
+
+
+@case("plot_scatter_sample")
+def _plot_scatter_sample(ctx: Context):
+    data = ctx.dataset("numeric")
+    return lambda: _render(
+        visualization.plot_scatter(data, "x0", "x1", mode="sample", random_state=0)
+    )
+
+
+@case("plot_correlation_matrix")
+def _plot_correlation_matrix(ctx: Context):
+    # Annotated heatmaps are only readable for a handful of columns
+    data = ctx.dataset("numeric").iloc[:, :10]
+    return lambda: _render(visualization.plot_correlation_matrix(data))
+
+
+@case("plot_boxplot")
+def _plot_boxplot(ctx: Context):
+    data = ctx.dataset("numeric")
+    columns = list(data.columns[:5])
+    return lambda: _render(visualization.plot_boxplot(data, columns))
+
+
+def measure(run: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """
+    Time a callable and measure its peak traced memory.
+
+    An untimed warm-up call runs first, so that lazy imports are not measured.
+    Memory is measured in a separate call, because tracing slows allocation down.
+
+    Args:
+        run: The benchmarked callable
+        repeat: Number of timed calls
+
+    Returns:
+        Dict[str, Any]: Minimum and median seconds and peak bytes
+    """
+    _consume(run())
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        _consume(run())
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        _consume(run())
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        "seconds_min": min(times),
+        "seconds_median": float(np.median(times)),
+        "peak_bytes": peak,
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], threshold: float
+) -> List[Dict[str, Any]]:
+    """
+    Compare results with a baseline.
+
+    Args:
+        results: Current results by case name
+        baseline: Baseline results by case name
+        threshold: Allowed relative increase (0.2 means 20% slower or larger)
+
+    Returns:
+        List[Dict[str, Any]]: One entry per case and metric, with "regression" set
+        when the increase exceeds both the threshold and the noise floor
+    """
+    rows = []
+    for name, current in results.items():
+        if name not in baseline:
+            continue
+        for metric, floor in (("seconds_min", MIN_SECONDS), ("peak_bytes", MIN_BYTES)):
+            before, after = baseline[name][metric], current[metric]
+            ratio = after / before if before else float("inf")
+            rows.append(
+                {
+                    "case": name,
+                    "metric": metric,
+                    "baseline": before,
+                    "current": after,
+                    "ratio": ratio,
+                    "regression": ratio > 1 + threshold and after - before > floor,
+                }
+            )
+    return rows
+
+
+def run_suite(
+    scale: str, repeat: int, filters: Optional[List[str]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run the selected benchmark cases at one scale.
+
+    Args:
+        scale: Dataset scale (see datasets.SCALES)
+        repeat: Number of timed calls per case
+        filters: Only run cases whose name contains one of these substrings
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Measurements by case name
+    """
+    rows, columns = datasets.shape(scale)
+    names = [name for name in CASES if not filters or any(f in name for f in filters)]
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        ctx = Context(rows, columns, directory)
+        for name in names:
+            run = CASES[name](ctx)
+            results[name] = {"rows": rows, "columns": columns, **measure(run, repeat)}
+            print(
+                f"{name:<40} {results[name]['seconds_min']:>10.4f} s "
+                f"{results[name]['peak_bytes'] / 2**20:>10.1f} MiB",
+                flush=True,
+            )
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--scale", default="small", choices=sorted(datasets.SCALES))
+    parser.add_argument("--repeat", type=int, default=3, help="timed calls per case")
+    parser.add_argument("--filter", nargs="*", help="only run cases containing these names")
+    parser.add_argument("--output", help="results file (default: results/<scale>.json)")
+    parser.add_argument("--baseline", help="baseline file (default: results/baseline-<scale>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="store results as baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative increase")
+    parser.add_argument("--list", action="store_true", help="list the cases and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(CASES))
+        return 0
+
+    results = run_suite(args.scale, args.repeat, args.filter)
+    report = {
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "scale": args.scale,
+            "repeat": args.repeat,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "datalib": datalib.__version__,
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+        },
+        "results": results,
+    }
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    output = Path(args.output or RESULTS_DIR / f"{args.scale}.json")
+    baseline_path = Path(args.baseline or RESULTS_DIR / f"baseline-{args.scale}.json")
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {output}")
+
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(report, indent=2))
+        print(f"Baseline written to {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --save-baseline to create one")
+        return 0
+
+    baseline = json.loads(baseline_path.read_text())["results"]
+    regressions = [row for row in compare(results, baseline, args.threshold) if row["regression"]]
+    for row in regressions:
+        print(
+            f"REGRESSION {row['case']} {row['metric']}: "
+            f"{row['baseline']:.4g} -> {row['current']:.4g} ({row['ratio']:.2f}x)"
+        )
+    if not regressions:
+        print(f"No regressions against {baseline_path} (threshold {args.threshold:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
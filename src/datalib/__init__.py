@@ -2,6 +2,33 @@
 DataLib - A Python library for data manipulation and analysis
 """
 
+import importlib
+
 __version__ = "0.1.0"
 __author__ = "Nader Ferjani"
 __email__ = "ferjani.nader@hotmail.fr"
+
+# Submodules are imported on first attribute access (e.g. ``datalib.ml``), so that
+# ``import datalib`` stays cheap and only the heavy dependencies a caller
+# actually uses (scikit-learn, scipy, matplotlib, seaborn) are ever loaded.
+_SUBMODULES = (
+    "data_manipulation",
+    "statistics",
+    "visualization",
+    "ml",
+    "instrumentation",
+    "pipeline",
+    "memoization",
+)
+
+__all__ = list(_SUBMODULES)
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES))
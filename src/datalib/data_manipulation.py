@@ -2,45 +2,608 @@
 Data manipulation module for handling CSV files and data transformations.
 """
 
-from typing import Optional, Union
+import glob
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
 
+from .instrumentation import instrument
 
-def read_csv(filepath: str, **kwargs) -> pd.DataFrame:
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+DEFAULT_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+DEFAULT_CATEGORICAL_THRESHOLD = 0.5
+_SAMPLE_ROWS = 1000
+_CACHE_FORMAT_VERSION = 1
+_MANIFEST = "manifest.json"
+
+
+class CSVChunks:
+    """
+    Lazy, re-iterable view of a CSV file as bounded-size DataFrame chunks.
+
+    Every iteration re-opens the file, so the same source can be scanned several
+    times (e.g. once to fit statistics and once to transform) without ever
+    holding the whole table in memory.
+    """
+
+    def __init__(self, filepath: str, chunksize: int, **kwargs):
+        """
+        Initialize the chunked reader.
+
+        Args:
+            filepath: Path to the CSV file
+            chunksize: Number of rows per chunk
+            **kwargs: Additional arguments passed to pandas.read_csv
+        """
+        self.filepath = filepath
+        self.chunksize = chunksize
+        self.kwargs = kwargs
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        with pd.read_csv(self.filepath, chunksize=self.chunksize, **self.kwargs) as reader:
+            yield from reader
+
+
+def _is_chunked(data) -> bool:
+    """Return True if data is an iterable of DataFrame chunks rather than a DataFrame."""
+    return not isinstance(data, pd.DataFrame) and isinstance(data, Iterable)
+
+
+def _chunk_rows(filepath: str, memory_budget: int, **kwargs) -> int:
+    """Estimate how many rows fit in memory_budget bytes from a sample of the file."""
+    sample_rows = min(kwargs.pop("nrows", None) or _SAMPLE_ROWS, _SAMPLE_ROWS)
+    sample = pd.read_csv(filepath, nrows=sample_rows, **kwargs)
+    if sample.empty:
+        return sample_rows
+    bytes_per_row = sample.memory_usage(index=True, deep=True).sum() / len(sample)
+    return max(1, int(memory_budget // bytes_per_row))
+
+
+def _cache_key(filepath: str, kwargs: dict, optimize_memory: bool) -> str:
+    """Cache key derived from the file's identity, size, mtime and read arguments."""
+    stat = os.stat(filepath)
+    identity = {
+        "version": _CACHE_FORMAT_VERSION,
+        "path": os.path.abspath(filepath),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "kwargs": repr(sorted(kwargs.items())),
+        "optimize_memory": optimize_memory,
+    }
+    return hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()
+
+
+def _encode_column(series: pd.Series, path: str) -> Optional[dict]:
+    """
+    Write one column to a .npy file and return its manifest entry.
+
+    Plain NumPy columns are stored as-is so they can be memory-mapped; everything
+    else is stored as integer codes plus a JSON list of unique values. Returns
+    None if the column cannot be represented.
+    """
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "biufcmM":
+        np.save(path, series.to_numpy())
+        return {"dtype": str(dtype), "encoding": "array"}
+
+    codes, uniques = pd.factorize(series)
+    values = uniques.tolist()
+    try:
+        json.dumps(values)
+    except (TypeError, ValueError):
+        return None
+    np.save(path, codes)
+    return {"dtype": str(dtype), "encoding": "codes", "values": values}
+
+
+def _decode_column(entry: dict, path: str, rows: int) -> Union[np.ndarray, pd.Series]:
+    """Load one column written by _encode_column, memory-mapping plain arrays."""
+    # Copy-on-write mapping: zero-copy to load, yet safe to modify in memory
+    array = np.load(path, mmap_mode="c" if rows else None)
+    if entry["encoding"] == "array":
+        return array.view(np.ndarray)
+    values = np.empty(len(entry["values"]) + 1, dtype=object)
+    values[:-1] = entry["values"]
+    values[-1] = None
+    return pd.Series(values[array], copy=False).astype(entry["dtype"])
+
+
+def _cache_store(entry_dir: str, frame: pd.DataFrame) -> None:
+    """Write frame to entry_dir as per-column .npy files plus a dtype manifest."""
+    if not isinstance(frame.index, pd.RangeIndex) or frame.index.start != 0:
+        return
+    if frame.index.step != 1 or not all(isinstance(c, (str, int)) for c in frame.columns):
+        return
+
+    parent = os.path.dirname(entry_dir)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=parent, prefix=".tmp-")
+    try:
+        columns = []
+        for i, name in enumerate(frame.columns):
+            entry = _encode_column(frame.iloc[:, i], os.path.join(staging, f"{i}.npy"))
+            if entry is None:
+                return
+            columns.append(dict(entry, name=name))
+        manifest = {"version": _CACHE_FORMAT_VERSION, "rows": len(frame), "columns": columns}
+        with open(os.path.join(staging, _MANIFEST), "w") as f:
+            json.dump(manifest, f)
+        os.replace(staging, entry_dir)
+    except OSError:
+        # Another process may have populated the same entry concurrently
+        pass
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def _cache_load(entry_dir: str) -> Optional[pd.DataFrame]:
+    """Load a cached frame from entry_dir, or return None on a miss."""
+    manifest_path = os.path.join(entry_dir, _MANIFEST)
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        if manifest.get("version") != _CACHE_FORMAT_VERSION:
+            return None
+        columns = {
+            i: _decode_column(entry, os.path.join(entry_dir, f"{i}.npy"), manifest["rows"])
+            for i, entry in enumerate(manifest["columns"])
+        }
+        # Record the access for LRU eviction
+        os.utime(manifest_path)
+    except (OSError, ValueError, KeyError):
+        return None
+
+    frame = pd.DataFrame(columns, index=pd.RangeIndex(manifest["rows"]), copy=False)
+    frame.columns = [entry["name"] for entry in manifest["columns"]]
+    return frame
+
+
+def _cache_evict(cache_dir: str, max_bytes: int) -> None:
+    """Remove least recently used entries until the cache fits in max_bytes."""
+    entries = []
+    for name in os.listdir(cache_dir):
+        entry_dir = os.path.join(cache_dir, name)
+        try:
+            last_used = os.path.getmtime(os.path.join(entry_dir, _MANIFEST))
+            size = sum(entry.stat().st_size for entry in os.scandir(entry_dir))
+        except OSError:
+            continue
+        entries.append((last_used, size, entry_dir))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, entry_dir in sorted(entries):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        total -= size
+
+
+def _is_text(series: pd.Series) -> bool:
+    """Return True for object or string columns."""
+    return pd.api.types.is_object_dtype(series.dtype) or isinstance(series.dtype, pd.StringDtype)
+
+
+def _compact_series(series: pd.Series, categorical_threshold: float) -> pd.Series:
+    """Return series in the smallest dtype that represents its values exactly."""
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "iu":
+        unsigned = series.empty or series.min() >= 0
+        return pd.to_numeric(series, downcast="unsigned" if unsigned else "integer")
+    if isinstance(dtype, np.dtype) and dtype.kind == "f" and dtype.itemsize > 4:
+        values = series.to_numpy()
+        narrow = values.astype(np.float32)
+        with np.errstate(over="ignore"):
+            if np.array_equal(narrow.astype(dtype), values, equal_nan=True):
+                return series.astype(np.float32)
+        return series
+    if _is_text(series) and len(series):
+        if series.nunique(dropna=True) / len(series) <= categorical_threshold:
+            return series.astype("category")
+    return series
+
+
+@instrument
+def compact_frame(
+    data: pd.DataFrame, categorical_threshold: float = DEFAULT_CATEGORICAL_THRESHOLD
+) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """
+    Reduce the memory footprint of a DataFrame without changing its values.
+
+    Integers are downcast to the narrowest type that holds their range, floats
+    become float32 when that is lossless, and text columns whose ratio of
+    distinct values to rows is at most categorical_threshold become categoricals.
+
+    Args:
+        data: Input DataFrame
+        categorical_threshold: Maximum distinct-to-total ratio for converting a
+            text column to a categorical
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, int]]: The compacted DataFrame and a report
+        with the memory usage in bytes "before" and "after"
+    """
+    before = int(data.memory_usage(deep=True).sum())
+    compacted = pd.DataFrame(
+        {i: _compact_series(data.iloc[:, i], categorical_threshold) for i in range(data.shape[1])},
+        index=data.index,
+    )
+    compacted.columns = data.columns
+    after = int(compacted.memory_usage(deep=True).sum())
+    return compacted, {"before": before, "after": after}
+
+
+def _categorical_hints(filepath: str, categorical_threshold: float, **kwargs) -> dict:
+    """Choose categorical dtypes for text columns from a sample of the file."""
+    kwargs.pop("nrows", None)
+    sample = pd.read_csv(filepath, nrows=_SAMPLE_ROWS, **kwargs)
+    return {
+        name: "category"
+        for name in sample.columns
+        if _is_text(sample[name])
+        and sample[name].nunique(dropna=True) / max(len(sample), 1) <= categorical_threshold
+    }
+
+
+def _read_optimized(filepath: str, **kwargs) -> pd.DataFrame:
+    """Parse once with sampled categorical hints, then downcast numeric columns."""
+    dtype = kwargs.pop("dtype", None)
+    if dtype is None or isinstance(dtype, dict):
+        hints = _categorical_hints(filepath, DEFAULT_CATEGORICAL_THRESHOLD, dtype=dtype, **kwargs)
+        dtype = {**hints, **(dtype or {})}
+    frame = pd.read_csv(filepath, dtype=dtype, **kwargs)
+    return compact_frame(frame)[0]
+
+
+@instrument
+def read_csv(
+    filepath: str,
+    stream: bool = False,
+    memory_budget: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+    cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    optimize_memory: bool = False,
+    **kwargs,
+) -> Union[pd.DataFrame, CSVChunks]:
     """
     Read a CSV file into a pandas DataFrame.
 
     Args:
         filepath: Path to the CSV file
+        stream: If True, return a lazy iterable of DataFrame chunks instead of
+            loading the whole file
+        memory_budget: Approximate size in bytes of each streamed chunk
+            (defaults to DEFAULT_MEMORY_BUDGET; ignored unless stream is True)
+        cache_dir: Directory of an on-disk columnar cache. When set, the parsed
+            frame is stored as memory-mappable per-column arrays keyed by the
+            file's path, size, mtime and the read arguments, and later reads
+            load it from there instead of parsing the CSV again.
+        cache_max_bytes: Total size of cache_dir above which the least recently
+            used entries are evicted
+        optimize_memory: If True, store the data in compact dtypes (see
+            compact_frame). Low-cardinality text columns are detected on a sample
+            and parsed directly as categoricals.
         **kwargs: Additional arguments passed to pandas.read_csv
 
     Returns:
-        pd.DataFrame: The loaded data
+        Union[pd.DataFrame, CSVChunks]: The loaded data, or a chunked reader in
+        streaming mode
     """
-    return pd.read_csv(filepath, **kwargs)
+    if stream:
+        if cache_dir is not None or optimize_memory:
+            raise ValueError("cache_dir and optimize_memory cannot be combined with stream=True")
+        chunksize = kwargs.pop("chunksize", None)
+        if chunksize is None:
+            chunksize = _chunk_rows(filepath, memory_budget or DEFAULT_MEMORY_BUDGET, **kwargs)
+        return CSVChunks(filepath, chunksize, **kwargs)
 
+    parse = _read_optimized if optimize_memory else pd.read_csv
+    if cache_dir is None:
+        return parse(filepath, **kwargs)
 
-def normalize_column(data: pd.DataFrame, column: str, method: str = "minmax") -> pd.DataFrame:
+    entry_dir = os.path.join(cache_dir, _cache_key(filepath, kwargs, optimize_memory))
+    frame = _cache_load(entry_dir)
+    if frame is None:
+        frame = parse(filepath, **kwargs)
+        _cache_store(entry_dir, frame)
+        _cache_evict(cache_dir, cache_max_bytes)
+    return frame
+
+
+def _common_dtypes(frames: List[pd.DataFrame]) -> dict:
+    """Pick one dtype per column that every frame's version of it can be cast to."""
+    seen = {}
+    missing = set()
+    for frame in frames:
+        for name, dtype in frame.dtypes.items():
+            has_values = frame[name].notna()
+            if not has_values.all():
+                missing.add(name)
+            # All-missing columns carry no type information (pandas reads them as float)
+            if has_values.any():
+                seen.setdefault(name, set()).add(dtype)
+    for frame in frames:
+        missing.update(name for name in seen if name not in frame.columns)
+
+    return {name: _reconcile_dtypes(dtypes, name in missing) for name, dtypes in seen.items()}
+
+
+def _reconcile_dtypes(dtypes: set, has_missing: bool) -> Union[np.dtype, pd.CategoricalDtype]:
+    """Pick the dtype one column's dtypes across frames can all be cast to."""
+    if len(dtypes) == 1:
+        dtype = next(iter(dtypes))
+    elif all(isinstance(d, pd.CategoricalDtype) for d in dtypes):
+        dtype = pd.CategoricalDtype(pd.Index(sorted(set().union(*(d.categories for d in dtypes)))))
+    elif all(isinstance(d, np.dtype) and d.kind in "iuf" for d in dtypes):
+        dtype = np.result_type(*dtypes)
+    else:
+        dtype = np.dtype(object)
+    if has_missing and isinstance(dtype, np.dtype) and dtype.kind in "iub":
+        # Integer and boolean columns cannot hold the missing values
+        dtype = np.dtype(float) if dtype.kind != "b" else np.dtype(object)
+    return dtype
+
+
+@instrument
+def read_csv_many(
+    paths: Union[str, List[str]],
+    max_workers: Optional[int] = None,
+    max_memory: Optional[int] = None,
+    source_column: Optional[str] = None,
+    **kwargs,
+) -> pd.DataFrame:
+    """
+    Read several CSV files in parallel and concatenate them into one DataFrame.
+
+    Args:
+        paths: List of file paths, or a glob pattern (matches are sorted)
+        max_workers: Maximum number of worker processes (defaults to the CPU count)
+        max_memory: Upper bound in bytes on the combined on-disk size of files
+            being parsed at the same time; at least one file is always in flight
+        source_column: If given, name of a categorical column recording the file
+            each row came from
+        **kwargs: Additional arguments passed to read_csv for every file
+
+    Returns:
+        pd.DataFrame: The concatenated data, in the order of paths
+    """
+    if kwargs.get("stream"):
+        raise ValueError("read_csv_many does not support stream=True")
+    if isinstance(paths, str):
+        paths = sorted(glob.glob(paths))
+    paths = [os.fspath(path) for path in paths]
+    if not paths:
+        raise ValueError("No files to read")
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(paths))
+    if max_workers == 1:
+        frames = [read_csv(path, **kwargs) for path in paths]
+    else:
+        frames = [None] * len(paths)
+        sizes = [os.path.getsize(path) for path in paths]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            pending = {}
+            next_index = 0
+            while next_index < len(paths) or pending:
+                in_flight = sum(sizes[i] for i in pending.values())
+                # Submit files in order while the worker and memory budgets allow
+                while (
+                    next_index < len(paths)
+                    and len(pending) < max_workers
+                    and (
+                        not pending
+                        or max_memory is None
+                        or in_flight + sizes[next_index] <= max_memory
+                    )
+                ):
+                    future = executor.submit(read_csv, paths[next_index], **kwargs)
+                    pending[future] = next_index
+                    in_flight += sizes[next_index]
+                    next_index += 1
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    frames[pending.pop(future)] = future.result()
+
+    if source_column is not None:
+        sources = pd.CategoricalDtype(paths)
+        for path, frame in zip(paths, frames):
+            frame[source_column] = pd.Series(path, index=frame.index, dtype=sources)
+
+    dtypes = _common_dtypes(frames)
+    frames = [
+        frame.astype({name: dtypes[name] for name in frame.columns if name in dtypes})
+        for frame in frames
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+
+class Normalizer:
+    """
+    Min-max or z-score normalization of many columns with reusable parameters.
+
+    Parameters for all columns are computed together from one 2-D NumPy block.
+    Fitting can also be done incrementally over chunks with partial_fit, which
+    keeps a running min/max and Welford mean/variance (merged per chunk with
+    Chan's parallel update), so the result equals a fit on the concatenated data.
+    """
+
+    def __init__(self, method: str = "minmax", columns: Optional[List[str]] = None):
+        """
+        Initialize the normalizer.
+
+        Args:
+            method: Normalization method ("minmax" or "zscore")
+            columns: Columns to normalize (if None, use all numerical columns of
+                the first fitted data)
+        """
+        if method not in ("minmax", "zscore"):
+            raise ValueError("Method must be either 'minmax' or 'zscore'")
+        self.method = method
+        self.columns = list(columns) if columns is not None else None
+        self.is_fitted = False
+
+    def _reset(self) -> None:
+        size = len(self.columns)
+        self._count = np.zeros(size)
+        self._mean = np.zeros(size)
+        self._m2 = np.zeros(size)
+        self._min = np.full(size, np.inf)
+        self._max = np.full(size, -np.inf)
+
+    @instrument
+    def partial_fit(self, data: pd.DataFrame) -> "Normalizer":
+        """
+        Update the normalization parameters with a chunk of data.
+
+        Args:
+            data: Input DataFrame chunk
+
+        Returns:
+            Normalizer: The normalizer itself
+        """
+        if self.columns is None:
+            self.columns = list(data.select_dtypes(include=[np.number]).columns)
+        if not self.is_fitted:
+            self._reset()
+
+        values = data[self.columns].to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        count = valid.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(valid, values, 0.0).sum(axis=0) / count
+            m2 = (np.where(valid, values - mean, 0.0) ** 2).sum(axis=0)
+            total = self._count + count
+            delta = mean - self._mean
+            update = count > 0
+            self._m2 = np.where(
+                update, self._m2 + m2 + delta**2 * self._count * count / total, self._m2
+            )
+            self._mean = np.where(update, self._mean + delta * count / total, self._mean)
+        self._count = total
+        self._min = np.fmin(self._min, np.nanmin(values, axis=0, initial=np.inf, where=valid))
+        self._max = np.fmax(self._max, np.nanmax(values, axis=0, initial=-np.inf, where=valid))
+        self.is_fitted = True
+        return self
+
+    @instrument
+    def fit(self, data: Union[pd.DataFrame, Iterable[pd.DataFrame]]) -> "Normalizer":
+        """
+        Compute the normalization parameters, discarding any previous fit.
+
+        Args:
+            data: Input DataFrame, or an iterable of DataFrame chunks
+
+        Returns:
+            Normalizer: The normalizer itself
+        """
+        self.is_fitted = False
+        for chunk in data if _is_chunked(data) else [data]:
+            self.partial_fit(chunk)
+        return self
+
+    def parameters(self) -> pd.DataFrame:
+        """
+        Get the fitted offset and scale of each column.
+
+        Returns:
+            pd.DataFrame: Offset and scale indexed by column, such that
+            normalized = (value - offset) / scale
+        """
+        if not self.is_fitted:
+            raise ValueError("Normalizer must be fitted before use")
+        if self.method == "minmax":
+            offset, scale = self._min, self._max - self._min
+        else:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                variance = np.where(self._count > 1, self._m2 / (self._count - 1), np.nan)
+            offset, scale = self._mean, np.sqrt(variance)
+        return pd.DataFrame({"offset": offset, "scale": scale}, index=self.columns)
+
+    @instrument
+    def transform(
+        self, data: Union[pd.DataFrame, Iterable[pd.DataFrame]], copy: bool = True
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+        """
+        Normalize the fitted columns with the fitted parameters.
+
+        Args:
+            data: Input DataFrame, or an iterable of DataFrame chunks
+            copy: If False, write the normalized columns into data itself instead
+                of a copy
+
+        Returns:
+            Union[pd.DataFrame, Iterator[pd.DataFrame]]: The normalized DataFrame,
+            or a lazy iterator of normalized chunks for chunked input
+        """
+        params = self.parameters()
+        offset, scale = params["offset"].to_numpy(), params["scale"].to_numpy()
+        if _is_chunked(data):
+            return (self._apply(chunk, offset, scale, copy) for chunk in data)
+        return self._apply(data, offset, scale, copy)
+
+    def _apply(
+        self, data: pd.DataFrame, offset: np.ndarray, scale: np.ndarray, copy: bool
+    ) -> pd.DataFrame:
+        df = data.copy() if copy else data
+        with np.errstate(invalid="ignore", divide="ignore"):
+            df[self.columns] = (data[self.columns].to_numpy(dtype=float) - offset) / scale
+        return df
+
+    def fit_transform(self, data: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
+        """
+        Fit the parameters on data and normalize it.
+
+        Args:
+            data: Input DataFrame
+            copy: If False, normalize data in place
+
+        Returns:
+            pd.DataFrame: The normalized DataFrame
+        """
+        return self.fit(data).transform(data, copy=copy)
+
+
+@instrument
+def normalize_column(
+    data: Union[pd.DataFrame, Iterable[pd.DataFrame]], column: str, method: str = "minmax"
+) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
     """
     Normalize a column in the DataFrame.
 
     Args:
-        data: Input DataFrame
+        data: Input DataFrame, or a re-iterable of DataFrame chunks such as the
+            result of read_csv(..., stream=True)
         column: Name of the column to normalize
         method: Normalization method ("minmax" or "zscore")
 
     Returns:
-        pd.DataFrame: DataFrame with normalized column
+        Union[pd.DataFrame, Iterator[pd.DataFrame]]: DataFrame with normalized
+        column, or a lazy iterator of normalized chunks for chunked input
     """
+    if method not in ("minmax", "zscore"):
+        raise ValueError("Method must be either 'minmax' or 'zscore'")
+
+    if _is_chunked(data):
+        if iter(data) is data:
+            raise ValueError(
+                "Normalizing streamed data needs a re-iterable source such as "
+                "read_csv(..., stream=True)"
+            )
+        # Chunks read by CSVChunks are fresh frames; any others belong to the caller
+        normalizer = Normalizer(method, columns=[column]).fit(data)
+        return normalizer.transform(data, copy=not isinstance(data, CSVChunks))
+
     df = data.copy()
 
     if method == "minmax":
         df[column] = (df[column] - df[column].min()) / (df[column].max() - df[column].min())
-    elif method == "zscore":
-        df[column] = (df[column] - df[column].mean()) / df[column].std()
     else:
-        raise ValueError("Method must be either 'minmax' or 'zscore'")
+        df[column] = (df[column] - df[column].mean()) / df[column].std()
 
     return df
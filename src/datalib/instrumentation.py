@@ -0,0 +1,319 @@
+"""
+Opt-in instrumentation of datalib calls.
+
+Public functions and model methods are decorated with :func:`instrument`. While
+instrumentation is disabled (the default) the decorator adds a single global
+check per call. Once enabled, every call emits an event with its wall and CPU
+time, the number of rows it processed and, optionally, the bytes it allocated,
+to a pluggable sink.
+
+Example:
+    >>> from datalib import instrumentation
+    >>> sink = instrumentation.enable()
+    >>> ...  # use datalib
+    >>> instrumentation.disable()
+    >>> sink.summary()
+"""
+
+import functools
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Union
+
+import pandas as pd
+
+_sink: Optional["Sink"] = None
+_track_memory = False
+_started_tracemalloc = False
+_local = threading.local()
+# tracemalloc.reset_peak is new in Python 3.9
+_CAN_RESET_PEAK = hasattr(tracemalloc, "reset_peak")
+
+
+class Sink:
+    """Base class of instrumentation sinks; subclasses implement record()."""
+
+    def record(self, event: Dict[str, Any]) -> None:
+        """
+        Handle one call event.
+
+        Args:
+            event: Dictionary with "name", "timestamp", "wall_seconds",
+                "cpu_seconds", "rows", "bytes" and "error"
+        """
+        raise NotImplementedError
+
+
+class MemorySink(Sink):
+    """Aggregate events in memory per instrumented function."""
+
+    def __init__(self):
+        """Initialize an empty aggregator."""
+        self._lock = threading.Lock()
+        self._totals: Dict[str, Dict[str, float]] = {}
+
+    def record(self, event: Dict[str, Any]) -> None:
+        """
+        Add one call event to the totals of its function.
+
+        Args:
+            event: Call event
+        """
+        with self._lock:
+            totals = self._totals.setdefault(
+                event["name"],
+                {
+                    "calls": 0,
+                    "errors": 0,
+                    "wall_seconds": 0.0,
+                    "cpu_seconds": 0.0,
+                    "rows": 0,
+                    "bytes": 0,
+                    "max_wall_seconds": 0.0,
+                },
+            )
+            totals["calls"] += 1
+            totals["errors"] += event["error"] is not None
+            totals["wall_seconds"] += event["wall_seconds"]
+            totals["cpu_seconds"] += event["cpu_seconds"]
+            totals["rows"] += event["rows"] or 0
+            totals["bytes"] += event["bytes"] or 0
+            totals["max_wall_seconds"] = max(totals["max_wall_seconds"], event["wall_seconds"])
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Return the aggregated totals.
+
+        Returns:
+            pd.DataFrame: One row per function, sorted by total wall time, with
+            call and error counts, total and maximum wall time, CPU time, rows
+            and bytes allocated
+        """
+        with self._lock:
+            summary = pd.DataFrame.from_dict(self._totals, orient="index")
+        if summary.empty:
+            return summary
+        return summary.sort_values("wall_seconds", ascending=False)
+
+    def reset(self) -> None:
+        """Discard all totals."""
+        with self._lock:
+            self._totals.clear()
+
+
+class JSONLinesSink(Sink):
+    """Append every event as one JSON line to a file."""
+
+    def __init__(self, file: Union[str, IO[str]]):
+        """
+        Initialize the sink.
+
+        Args:
+            file: Path to append to, or an open text file
+        """
+        self._owns_file = isinstance(file, str)
+        self._file = open(file, "a", buffering=1) if isinstance(file, str) else file
+        self._lock = threading.Lock()
+
+    def record(self, event: Dict[str, Any]) -> None:
+        """
+        Write one call event.
+
+        Args:
+            event: Call event
+        """
+        line = json.dumps(event) + "\n"
+        with self._lock:
+            self._file.write(line)
+
+    def close(self) -> None:
+        """Close the file if the sink opened it."""
+        if self._owns_file:
+            self._file.close()
+
+
+class CallbackSink(Sink):
+    """Pass every event to a function."""
+
+    def __init__(self, callback: Callable[[Dict[str, Any]], None]):
+        """
+        Initialize the sink.
+
+        Args:
+            callback: Function called with each event
+        """
+        self.callback = callback
+
+    def record(self, event: Dict[str, Any]) -> None:
+        """
+        Forward one call event to the callback.
+
+        Args:
+            event: Call event
+        """
+        self.callback(event)
+
+
+def enable(
+    sink: Optional[Union[Sink, Callable[[Dict[str, Any]], None]]] = None,
+    track_memory: bool = False,
+) -> Sink:
+    """
+    Start recording instrumented calls.
+
+    Args:
+        sink: Where to send events: a Sink, or a function (wrapped in a
+            CallbackSink); defaults to a new MemorySink
+        track_memory: If True, also measure the peak bytes allocated by each call
+            with tracemalloc, which slows allocations down noticeably (on
+            Python 3.8, the bytes still allocated when the call returns)
+
+    Returns:
+        Sink: The active sink
+    """
+    global _sink, _track_memory, _started_tracemalloc
+    if sink is None:
+        sink = MemorySink()
+    elif not isinstance(sink, Sink):
+        sink = CallbackSink(sink)
+    if track_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracemalloc = True
+    _track_memory = track_memory
+    _sink = sink
+    return sink
+
+
+def disable() -> None:
+    """Stop recording instrumented calls."""
+    global _sink, _track_memory, _started_tracemalloc
+    _sink = None
+    _track_memory = False
+    if _started_tracemalloc:
+        tracemalloc.stop()
+        _started_tracemalloc = False
+
+
+def is_enabled() -> bool:
+    """
+    Check whether calls are being recorded.
+
+    Returns:
+        bool: True if instrumentation is enabled
+    """
+    return _sink is not None
+
+
+@contextmanager
+def instrumented(
+    sink: Optional[Union[Sink, Callable[[Dict[str, Any]], None]]] = None,
+    track_memory: bool = False,
+) -> Iterator[Sink]:
+    """
+    Record instrumented calls within a with block.
+
+    Args:
+        sink: Where to send events (see enable)
+        track_memory: If True, also measure bytes allocated per call
+
+    Yields:
+        Sink: The active sink
+    """
+    active = enable(sink, track_memory)
+    try:
+        yield active
+    finally:
+        disable()
+
+
+def _count_rows(args: tuple, result: Any) -> Optional[int]:
+    """Rows of the first table-like argument, or of a table-like result."""
+    for value in args:
+        shape = getattr(value, "shape", ())
+        if isinstance(shape, tuple) and len(shape) > 0:
+            return int(shape[0])
+    if isinstance(result, pd.DataFrame):
+        return len(result)
+    return None
+
+
+def _memory_stack() -> List[List[int]]:
+    """Per-thread stack of [start bytes, peak bytes seen by nested calls]."""
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def instrument(func: Callable) -> Callable:
+    """
+    Decorate a function or method so that its calls are recorded when enabled.
+
+    Lazy results (iterators of chunks) are timed until they are returned, not
+    while they are consumed.
+
+    Args:
+        func: Function to instrument
+
+    Returns:
+        Callable: The wrapped function
+    """
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _sink is None:
+            return func(*args, **kwargs)
+
+        track_memory = _track_memory and tracemalloc.is_tracing()
+        if track_memory:
+            # tracemalloc has one global peak: fold it into the caller's frame
+            # before resetting it for this call
+            stack = _memory_stack()
+            current, peak = tracemalloc.get_traced_memory()
+            if _CAN_RESET_PEAK:
+                if stack:
+                    stack[-1][1] = max(stack[-1][1], peak)
+                tracemalloc.reset_peak()
+            stack.append([current, current])
+
+        error = None
+        result = None
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            result = func(*args, **kwargs)
+            return result
+        except BaseException as exc:
+            error = type(exc).__name__
+            raise
+        finally:
+            wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+            allocated = None
+            if track_memory:
+                start, nested_peak = stack.pop()
+                current, peak = tracemalloc.get_traced_memory()
+                if _CAN_RESET_PEAK:
+                    peak = max(peak, nested_peak)
+                    allocated = peak - start
+                    if stack:
+                        stack[-1][1] = max(stack[-1][1], peak)
+                else:
+                    # Without a per-call peak, report the traced delta
+                    allocated = max(current - start, 0)
+            sink = _sink
+            if sink is not None:
+                sink.record(
+                    {
+                        "name": name,
+                        "timestamp": time.time(),
+                        "wall_seconds": wall,
+                        "cpu_seconds": cpu,
+                        "rows": _count_rows(args, result),
+                        "bytes": allocated,
+                        "error": error,
+                    }
+                )
+
+    return wrapper
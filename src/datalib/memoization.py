@@ -0,0 +1,411 @@
+"""
+Opt-in memoization of statistics keyed by a fingerprint of the data.
+
+Functions decorated with :func:`memoize` (describe_column, correlation_analysis,
+and through it plot_correlation_matrix) look their results up by the content
+of the columns they read plus their other arguments, so repeated calls on
+unchanged data return immediately. While memoization is disabled (the default)
+the decorator adds a single global check per call.
+
+Example:
+    >>> from datalib import memoization
+    >>> memo = memoization.enable(max_entries=256, cache_dir=".datalib-cache")
+    >>> ...  # use datalib
+    >>> memoization.invalidate(data)  # after modifying data in place
+    >>> memoization.disable()
+"""
+
+import copy
+import functools
+import glob
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_ENTRIES = 128
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_BLOCK_SIZE = 4096
+DEFAULT_SAMPLE_BLOCKS = 64
+
+_memo: Optional["Memo"] = None
+
+
+def _hash_column(digest: Any, series: pd.Series, block_size: int, blocks: int) -> None:
+    """Feed one column's values into digest."""
+    dtype = series.dtype
+    if not (isinstance(dtype, np.dtype) and dtype.kind in "biufcmM"):
+        digest.update(pd.util.hash_pandas_object(series, index=False).to_numpy().tobytes())
+        return
+
+    buffer = np.ascontiguousarray(series.to_numpy()).view(np.uint8)
+    if buffer.nbytes <= block_size * blocks:
+        digest.update(buffer)
+        return
+    # Hash evenly spaced blocks (always including the first and the last) and
+    # add a wrapping sum of the whole buffer, so any single changed value is
+    # still detected at a fraction of the cost of hashing everything
+    for start in np.linspace(0, buffer.nbytes - block_size, blocks).astype(np.int64):
+        digest.update(buffer[start : start + block_size])
+    words = buffer[: buffer.nbytes - buffer.nbytes % 8].view(np.uint64)
+    checksum = np.add.reduce(words, dtype=np.uint64)
+    digest.update(checksum.tobytes() + buffer[words.nbytes :].tobytes())
+
+
+def _column_fingerprints(data: pd.DataFrame, block_size: int, sample_blocks: int) -> List[str]:
+    """Fingerprint of each column's name, dtype and values."""
+    fingerprints = []
+    for i, (name, dtype) in enumerate(data.dtypes.items()):
+        digest = hashlib.blake2b(repr((str(name), str(dtype))).encode(), digest_size=16)
+        _hash_column(digest, data.iloc[:, i], block_size, sample_blocks)
+        fingerprints.append(digest.hexdigest())
+    return fingerprints
+
+
+def _combine(data: pd.DataFrame, columns: List[str]) -> str:
+    """Fingerprint of a frame from those of its columns."""
+    return hashlib.blake2b(repr((data.shape, columns)).encode(), digest_size=16).hexdigest()
+
+
+def fingerprint(
+    data: pd.DataFrame,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    sample_blocks: int = DEFAULT_SAMPLE_BLOCKS,
+) -> str:
+    """
+    Compute a fast fingerprint of a DataFrame's column names, dtypes and values.
+
+    Columns of plain NumPy dtypes up to block_size * sample_blocks bytes are
+    hashed entirely. Larger ones hash sample_blocks evenly spaced blocks of their
+    buffer plus a checksum of all of it: a change is missed only if it keeps
+    the sampled blocks and the checksum unchanged, for instance two values
+    swapped outside the sampled blocks. Other columns are hashed value by value.
+    The index is not part of the fingerprint.
+
+    Args:
+        data: Input DataFrame
+        block_size: Size in bytes of each sampled block
+        sample_blocks: Number of blocks sampled per column
+
+    Returns:
+        str: Hexadecimal fingerprint
+    """
+    return _combine(data, _column_fingerprints(data, block_size, sample_blocks))
+
+
+class Memo:
+    """Bounded in-memory LRU of results with an optional on-disk tier."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        cache_dir: Optional[str] = None,
+        cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        sample_blocks: int = DEFAULT_SAMPLE_BLOCKS,
+    ):
+        """
+        Initialize an empty memo.
+
+        Args:
+            max_entries: Number of results kept in memory; the least recently
+                used are dropped beyond it
+            cache_dir: Directory where results are also pickled, so they survive
+                the process; only use directories you trust, as entries are unpickled
+            cache_max_bytes: Total size of cache_dir above which the least
+                recently used entries are removed
+            block_size: Size in bytes of the blocks sampled by fingerprint
+            sample_blocks: Number of blocks sampled per column by fingerprint
+        """
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.cache_max_bytes = cache_max_bytes
+        self.block_size = block_size
+        self.sample_blocks = sample_blocks
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, name: str, data: pd.DataFrame, params: dict) -> str:
+        """
+        Build the key of a call.
+
+        Args:
+            name: Name of the memoized function
+            data: Columns the function reads
+            params: Other arguments of the call
+
+        Returns:
+            str: "<data fingerprint>-<hash of name and arguments>"
+        """
+        return self._key_and_columns(name, data, params)[0]
+
+    def _key_and_columns(
+        self, name: str, data: pd.DataFrame, params: dict
+    ) -> Tuple[str, List[str]]:
+        """Key of a call and the fingerprints of the columns it reads."""
+        columns = _column_fingerprints(data, self.block_size, self.sample_blocks)
+        call = repr((name, sorted(params.items()))).encode()
+        call_part = hashlib.blake2b(call, digest_size=8).hexdigest()
+        return f"{_combine(data, columns)}-{call_part}", columns
+
+    def _path(self, key: str, suffix: str = ".pkl") -> str:
+        return os.path.join(self.cache_dir, key + suffix)
+
+    def _unlink(self, key: str) -> None:
+        """Remove an entry's files from cache_dir."""
+        for suffix in (".pkl", ".columns"):
+            try:
+                os.unlink(self._path(key, suffix))
+            except OSError:
+                pass
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Look a result up in memory, then on disk.
+
+        Args:
+            key: Key of the call
+            default: Value returned on a miss
+
+        Returns:
+            Any: A copy of the stored result, or default
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(self._entries[key][0])
+        if self.cache_dir is not None:
+            path = self._path(key)
+            try:
+                with open(path, "rb") as f:
+                    value = pickle.load(f)
+                # Record the access for LRU eviction
+                os.utime(path)
+            except FileNotFoundError:
+                pass
+            except Exception:
+                # Unreadable, e.g. truncated or written by other library versions
+                self._unlink(key)
+            else:
+                self._remember(key, value, self._read_columns(key))
+                with self._lock:
+                    self.hits += 1
+                return copy.deepcopy(value)
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def _read_columns(self, key: str) -> List[str]:
+        try:
+            with open(self._path(key, ".columns")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def _remember(self, key: str, value: Any, columns: List[str]) -> None:
+        with self._lock:
+            self._entries[key] = (value, columns)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def put(self, key: str, value: Any, columns: Optional[List[str]] = None) -> None:
+        """
+        Store a result in memory and, if configured, on disk.
+
+        Args:
+            key: Key of the call
+            value: Result to store (a copy is kept)
+            columns: Fingerprints of the columns the result was computed from,
+                used by invalidate to find the results derived from a frame
+        """
+        columns = list(columns or [])
+        self._remember(key, copy.deepcopy(value), columns)
+        if self.cache_dir is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        try:
+            # The column index is written first so no result is left without one
+            self._write(key, ".columns", lambda f: f.write(json.dumps(columns).encode()))
+            self._write(
+                key, ".pkl", lambda f: pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            )
+        except (OSError, pickle.PicklingError):
+            self._unlink(key)
+            return
+        self._evict()
+
+    def _write(self, key: str, suffix: str, write: Callable[[Any], Any]) -> None:
+        """Atomically write an entry file."""
+        handle, staging = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp-")
+        try:
+            with os.fdopen(handle, "wb") as f:
+                write(f)
+            os.replace(staging, self._path(key, suffix))
+        except BaseException:
+            os.unlink(staging)
+            raise
+
+    def _evict(self) -> None:
+        """Remove least recently used files until cache_dir fits in cache_max_bytes."""
+        entries = []
+        for path in glob.glob(os.path.join(self.cache_dir, "*.pkl")):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.cache_max_bytes:
+                break
+            self._unlink(os.path.basename(path)[: -len(".pkl")])
+            total -= size
+
+    def invalidate(self, data: Optional[pd.DataFrame] = None) -> None:
+        """
+        Drop stored results, in memory and on disk.
+
+        Modified data gets a new fingerprint, so invalidating is only needed when
+        a change may have escaped the sampled fingerprint, or to free space.
+
+        Args:
+            data: Drop only the results computed from any of these columns, e.g.
+                every describe_column and correlation_analysis result of a
+                frame (if None, drop everything)
+        """
+        if data is None:
+            stale = None
+        else:
+            stale = set(_column_fingerprints(data, self.block_size, self.sample_blocks))
+        with self._lock:
+            for key, (_, columns) in list(self._entries.items()):
+                if stale is None or stale.intersection(columns):
+                    del self._entries[key]
+        if self.cache_dir is None:
+            return
+        for path in glob.glob(os.path.join(self.cache_dir, "*.pkl")):
+            key = os.path.basename(path)[: -len(".pkl")]
+            if stale is None or stale.intersection(self._read_columns(key)):
+                self._unlink(key)
+
+    def clear(self) -> None:
+        """Drop every stored result and reset the hit and miss counters."""
+        self.invalidate()
+        self.hits = self.misses = 0
+
+
+def enable(
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+    cache_dir: Optional[str] = None,
+    cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    sample_blocks: int = DEFAULT_SAMPLE_BLOCKS,
+) -> Memo:
+    """
+    Start memoizing results.
+
+    Args:
+        max_entries: Number of results kept in memory
+        cache_dir: Optional directory of the on-disk tier
+        cache_max_bytes: Maximum total size of cache_dir
+        block_size: Size in bytes of the blocks sampled by fingerprint
+        sample_blocks: Number of blocks sampled per column by fingerprint
+
+    Returns:
+        Memo: The active memo
+    """
+    global _memo
+    _memo = Memo(max_entries, cache_dir, cache_max_bytes, block_size, sample_blocks)
+    return _memo
+
+
+def disable() -> None:
+    """Stop memoizing results; stored results are dropped from memory."""
+    global _memo
+    _memo = None
+
+
+def is_enabled() -> bool:
+    """
+    Check whether results are being memoized.
+
+    Returns:
+        bool: True if memoization is enabled
+    """
+    return _memo is not None
+
+
+def invalidate(data: Optional[pd.DataFrame] = None) -> None:
+    """
+    Drop stored results of the active memo (see Memo.invalidate).
+
+    Args:
+        data: Drop only the results computed from any of these columns (if
+            None, drop everything)
+    """
+    if _memo is not None:
+        _memo.invalidate(data)
+
+
+def memoize(columns: Callable[[dict], Optional[pd.DataFrame]]) -> Callable:
+    """
+    Decorate a function whose first argument is data so its results are memoized when enabled.
+
+    Args:
+        columns: Function of the call's bound arguments returning the columns of
+            data the result depends on, or None if the call cannot be memoized
+            (e.g. chunked input)
+
+    Returns:
+        Callable: Decorator
+    """
+
+    def decorator(func: Callable) -> Callable:
+        name = f"{func.__module__}.{func.__qualname__}"
+        signature = inspect.signature(func)
+        data_name = next(iter(signature.parameters))
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            memo = _memo
+            if memo is None:
+                return func(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            if not isinstance(arguments[data_name], pd.DataFrame):
+                return func(*args, **kwargs)
+            try:
+                data = columns(arguments)
+            except (KeyError, ValueError):
+                # Let the function raise its own error
+                return func(*args, **kwargs)
+            if data is None:
+                return func(*args, **kwargs)
+            del arguments[data_name]
+            key, data_columns = memo._key_and_columns(name, data, arguments)
+            missing = object()
+            result = memo.get(key, missing)
+            if result is missing:
+                result = func(*args, **kwargs)
+                memo.put(key, result, data_columns)
+            return result
+
+        return wrapper
+
+    return decorator
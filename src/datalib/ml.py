@@ -2,31 +2,722 @@
 Machine learning module providing regression and classification capabilities.
 """
 
-from typing import Any, Dict, List, Optional, Tuple, Union
+import asyncio
+import inspect
+import itertools
+import json
+import mmap as _mmap
+import os
+import pickle
+import queue
+import sys
+import threading
+import time
+import warnings
+from concurrent.futures import Future, InvalidStateError, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
-from sklearn.linear_model import LinearRegression, LogisticRegression
-from sklearn.metrics import accuracy_score, classification_report, mean_squared_error, r2_score
-from sklearn.model_selection import train_test_split
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.tree import DecisionTreeClassifier
+
+from . import __version__
+from .data_manipulation import DEFAULT_MEMORY_BUDGET, _is_chunked
+from .instrumentation import instrument
+
+_MODEL_FORMAT_VERSION = 1
+_MODEL_MANIFEST = "manifest.json"
+_MODEL_STATE = "model.pkl"
+
+
+def _save_model(model: Any, path: str) -> None:
+    """
+    Save a model to a directory.
+
+    The model is pickled with protocol 5 and its large arrays (coefficients,
+    training data, tree nodes, ...) are written out-of-band as raw buffer files,
+    next to a manifest with format and library versions.
+    """
+    import sklearn
+
+    os.makedirs(path, exist_ok=True)
+    buffers: List[pickle.PickleBuffer] = []
+    state = pickle.dumps(model.__dict__, protocol=5, buffer_callback=buffers.append)
+    sizes = []
+    for i, buffer in enumerate(buffers):
+        raw = buffer.raw()
+        with open(os.path.join(path, f"buffer-{i}.bin"), "wb") as f:
+            f.write(raw)
+        sizes.append(raw.nbytes)
+    with open(os.path.join(path, _MODEL_STATE), "wb") as f:
+        f.write(state)
+    manifest = {
+        "format_version": _MODEL_FORMAT_VERSION,
+        "class": type(model).__name__,
+        "model_type": model.model_type,
+        "datalib_version": __version__,
+        "sklearn_version": sklearn.__version__,
+        "buffers": sizes,
+    }
+    with open(os.path.join(path, _MODEL_MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def _load_model(cls: type, path: str, mmap: bool) -> Any:
+    """Load a model saved with _save_model, optionally memory-mapping its arrays."""
+    import sklearn
+
+    with open(os.path.join(path, _MODEL_MANIFEST)) as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != _MODEL_FORMAT_VERSION:
+        raise ValueError(f"Unsupported model format version: {manifest.get('format_version')}")
+    if manifest.get("class") != cls.__name__:
+        raise ValueError(f"Saved model is a {manifest.get('class')}, not a {cls.__name__}")
+    if manifest.get("sklearn_version") != sklearn.__version__:
+        warnings.warn(
+            f"Model was saved with scikit-learn {manifest.get('sklearn_version')}, "
+            f"loading with {sklearn.__version__}"
+        )
+
+    buffers = []
+    for i, size in enumerate(manifest["buffers"]):
+        with open(os.path.join(path, f"buffer-{i}.bin"), "rb") as f:
+            if mmap and size:
+                # Private mapping: pages are shared between processes until written
+                buffers.append(_mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_COPY))
+            else:
+                buffers.append(bytearray(f.read()))
+    with open(os.path.join(path, _MODEL_STATE), "rb") as f:
+        state = pickle.loads(f.read(), buffers=buffers)
+
+    model = cls.__new__(cls)
+    model.__dict__.update(state)
+    return model
+
+
+class _NormalEquations:
+    """
+    Mergeable least-squares accumulator.
+
+    Keeps the row count, feature/target means and the centered cross-products
+    X^T X and X^T y, combined across chunks with the pairwise update of Chan et
+    al., so solving at the end gives the same coefficients as a batch fit.
+    Without an intercept the means are kept at zero, so the cross-products are
+    uncentered and merging reduces to adding them.
+    """
+
+    def __init__(self, fit_intercept: bool = True):
+        self.n = 0
+        self.fit_intercept = fit_intercept
+
+    def update(self, X: np.ndarray, y: np.ndarray) -> None:
+        """Add a chunk of rows (X of shape (n, p), y of shape (n,) or (n, k))."""
+        other = _NormalEquations(self.fit_intercept)
+        other.n = len(X)
+        other.target_ndim = y.ndim
+        y = y.reshape(len(y), -1)
+        if self.fit_intercept:
+            other.mean_x = X.mean(axis=0)
+            other.mean_y = y.mean(axis=0)
+        else:
+            other.mean_x = np.zeros(X.shape[1])
+            other.mean_y = np.zeros(y.shape[1])
+        centered_x = X - other.mean_x
+        other.xtx = centered_x.T @ centered_x
+        other.xty = centered_x.T @ (y - other.mean_y)
+        self.merge(other)
+
+    def merge(self, other: "_NormalEquations") -> None:
+        """Fold another accumulator into this one."""
+        if other.fit_intercept != self.fit_intercept:
+            raise ValueError("Cannot merge models fitted with and without an intercept")
+        if other.n == 0:
+            return
+        if self.n == 0:
+            self.__dict__.update(other.__dict__)
+            return
+        n = self.n + other.n
+        weight = self.n * other.n / n
+        delta_x = other.mean_x - self.mean_x
+        delta_y = other.mean_y - self.mean_y
+        self.xtx = self.xtx + other.xtx + weight * np.outer(delta_x, delta_x)
+        self.xty = self.xty + other.xty + weight * np.outer(delta_x, delta_y)
+        self.mean_x = self.mean_x + delta_x * other.n / n
+        self.mean_y = self.mean_y + delta_y * other.n / n
+        self.n = n
+
+    def solve(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return coefficients and intercepts shaped like LinearRegression's."""
+        coef = np.linalg.lstsq(self.xtx, self.xty, rcond=None)[0]
+        intercept = self.mean_y - self.mean_x @ coef
+        if self.target_ndim == 1:
+            return coef[:, 0], intercept[0]
+        return coef.T, intercept
+
+
+class RegressionMetrics:
+    """
+    Incremental regression metrics computed from residuals in a single pass.
+
+    Batches of predictions are folded into running sums, so evaluation can
+    stream over data that does not fit in memory, and accumulators built on
+    different shards can be merged. Multi-output targets are averaged over
+    outputs, like scikit-learn's defaults.
+    """
+
+    def __init__(self):
+        """Initialize an empty accumulator."""
+        self.n = 0
+        self.sse: Union[float, np.ndarray] = 0.0
+        self.sae: Union[float, np.ndarray] = 0.0
+        self.mean_y: Union[float, np.ndarray] = 0.0
+        self.m2_y: Union[float, np.ndarray] = 0.0
+
+    def update(
+        self, y_true: Union[pd.Series, np.ndarray], y_pred: Union[pd.Series, np.ndarray]
+    ) -> "RegressionMetrics":
+        """
+        Add a batch of true and predicted values.
+
+        Args:
+            y_true: True target values
+            y_pred: Predicted target values
+
+        Returns:
+            RegressionMetrics: self
+        """
+        y_true = np.asarray(y_true, dtype=float)
+        residuals = y_true - np.asarray(y_pred, dtype=float).reshape(y_true.shape)
+        n = len(y_true)
+        if n == 0:
+            return self
+        mean = y_true.mean(axis=0)
+        batch = RegressionMetrics()
+        batch.n = n
+        batch.sse = np.einsum("i...,i...->...", residuals, residuals)
+        batch.sae = np.abs(residuals).sum(axis=0)
+        batch.mean_y = mean
+        centered = y_true - mean
+        batch.m2_y = np.einsum("i...,i...->...", centered, centered)
+        return self.merge(batch)
+
+    def merge(self, other: "RegressionMetrics") -> "RegressionMetrics":
+        """
+        Merge the sums of another accumulator into this one.
+
+        Args:
+            other: Accumulator built on other data
+
+        Returns:
+            RegressionMetrics: self
+        """
+        if other.n == 0:
+            return self
+        n = self.n + other.n
+        delta = other.mean_y - self.mean_y
+        self.m2_y = self.m2_y + other.m2_y + delta**2 * self.n * other.n / n
+        self.mean_y = self.mean_y + delta * other.n / n
+        self.sse = self.sse + other.sse
+        self.sae = self.sae + other.sae
+        self.n = n
+        return self
+
+    def result(self) -> Dict[str, float]:
+        """
+        Compute the metrics for everything accumulated so far.
+
+        Returns:
+            Dict[str, float]: "mse", "rmse", "mae" and "r2"
+        """
+        if self.n == 0:
+            raise ValueError("No predictions have been accumulated")
+        sse = np.asarray(self.sse, dtype=float)
+        m2_y = np.asarray(self.m2_y, dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r2 = np.where(m2_y > 0, 1 - sse / m2_y, np.where(sse == 0, 1.0, 0.0))
+        mse = float(np.mean(sse / self.n))
+        return {
+            "mse": mse,
+            "rmse": float(np.sqrt(mse)),
+            "mae": float(np.mean(np.asarray(self.sae) / self.n)),
+            "r2": float(np.mean(r2)),
+        }
+
+
+class ClassificationMetrics:
+    """
+    Incremental classification metrics computed from one confusion matrix.
+
+    Every batch only adds to the confusion matrix; accuracy and per-class
+    precision, recall and F1 are all derived from it when requested. Classes
+    seen for the first time in a later batch are added on the fly.
+    """
+
+    def __init__(self, labels: Optional[List[Any]] = None):
+        """
+        Initialize an empty accumulator.
+
+        Args:
+            labels: Known class labels (if None, discovered from the data)
+        """
+        self.labels = np.unique(np.asarray(labels)) if labels is not None else None
+        self.matrix = np.zeros((0, 0), dtype=np.int64)
+        if self.labels is not None:
+            self.matrix = np.zeros((len(self.labels), len(self.labels)), dtype=np.int64)
+
+    def _extend_labels(self, values: np.ndarray) -> None:
+        """Add unseen labels, keeping them sorted and the matrix aligned."""
+        if self.labels is None:
+            self.labels = np.unique(values)
+            self.matrix = np.zeros((len(self.labels), len(self.labels)), dtype=np.int64)
+            return
+        labels = np.union1d(self.labels, values)
+        if len(labels) == len(self.labels):
+            return
+        positions = np.searchsorted(labels, self.labels)
+        matrix = np.zeros((len(labels), len(labels)), dtype=np.int64)
+        matrix[np.ix_(positions, positions)] = self.matrix
+        self.labels, self.matrix = labels, matrix
+
+    def update(
+        self, y_true: Union[pd.Series, np.ndarray], y_pred: Union[pd.Series, np.ndarray]
+    ) -> "ClassificationMetrics":
+        """
+        Add a batch of true and predicted classes.
+
+        Args:
+            y_true: True classes
+            y_pred: Predicted classes
+
+        Returns:
+            ClassificationMetrics: self
+        """
+        y_true, y_pred = np.asarray(y_true), np.asarray(y_pred)
+        self._extend_labels(np.concatenate([y_true, y_pred]))
+        k = len(self.labels)
+        codes = np.searchsorted(self.labels, y_true) * k + np.searchsorted(self.labels, y_pred)
+        self.matrix += np.bincount(codes, minlength=k * k).reshape(k, k)
+        return self
+
+    def merge(self, other: "ClassificationMetrics") -> "ClassificationMetrics":
+        """
+        Merge the confusion matrix of another accumulator into this one.
+
+        Args:
+            other: Accumulator built on other data
+
+        Returns:
+            ClassificationMetrics: self
+        """
+        if other.labels is None:
+            return self
+        self._extend_labels(other.labels)
+        positions = np.searchsorted(self.labels, other.labels)
+        self.matrix[np.ix_(positions, positions)] += other.matrix
+        return self
+
+    def confusion_matrix(self) -> pd.DataFrame:
+        """
+        Return the accumulated confusion matrix.
+
+        Returns:
+            pd.DataFrame: Counts with true classes as rows and predictions as columns
+        """
+        labels = self.labels if self.labels is not None else []
+        return pd.DataFrame(self.matrix, index=labels, columns=labels)
+
+    def per_class(self) -> pd.DataFrame:
+        """
+        Compute precision, recall, F1 score and support of every class.
+
+        Classes without predictions (or without samples) get a precision (or
+        recall) of 0, like scikit-learn with zero_division=0.
+
+        Returns:
+            pd.DataFrame: One row per class
+        """
+        true_positives = np.diag(self.matrix).astype(float)
+        support = self.matrix.sum(axis=1)
+        predicted = self.matrix.sum(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            precision = np.where(predicted > 0, true_positives / predicted, 0.0)
+            recall = np.where(support > 0, true_positives / support, 0.0)
+            total = precision + recall
+            f1 = np.where(total > 0, 2 * precision * recall / total, 0.0)
+        return pd.DataFrame(
+            {"precision": precision, "recall": recall, "f1": f1, "support": support},
+            index=self.labels if self.labels is not None else [],
+        )
+
+    def result(self) -> Dict[str, float]:
+        """
+        Compute the summary metrics for everything accumulated so far.
+
+        Returns:
+            Dict[str, float]: "accuracy" and macro and support-weighted averages
+            of precision, recall and F1 score
+        """
+        total = self.matrix.sum()
+        if total == 0:
+            raise ValueError("No predictions have been accumulated")
+        per_class = self.per_class()
+        weights = per_class["support"] / total
+        metrics = {"accuracy": float(np.trace(self.matrix) / total)}
+        for name in ["precision", "recall", "f1"]:
+            metrics[f"macro_{name}"] = float(per_class[name].mean())
+            metrics[f"weighted_{name}"] = float((per_class[name] * weights).sum())
+        return metrics
+
+
+def _issparse(X: Any) -> bool:
+    """Return True for scipy sparse matrices, without importing scipy if it is not loaded."""
+    module = sys.modules.get("scipy.sparse")
+    return module is not None and module.issparse(X)
+
+
+def _column_product(X: Any, columns: Tuple[int, ...]) -> Optional[np.ndarray]:
+    """Row-wise product of the given columns of a dense or sparse matrix (None if empty)."""
+    if not columns:
+        return None
+    product = np.ones(X.shape[0])
+    for column in columns:
+        if _issparse(X):
+            product *= X[:, [column]].toarray().ravel()
+        else:
+            product *= X[:, column]
+    return product
+
+
+class PolynomialExpansion:
+    """
+    Polynomial and interaction features that are never materialized in full.
+
+    The expanded design matrix Z has O(p^degree) columns, so instead of building
+    it this class computes what a solver needs from the original features:
+    dense row blocks of bounded size (transform and iter_transform) and the
+    products Z v and Z^T u (matvec and rmatvec). Terms of degree two and higher
+    are grouped by their leading factors, and each group is one upper triangle
+    of X^T diag(w) X, so the products run as dense (or sparse) matrix
+    multiplications with O(n p + p^2) extra memory.
+
+    Terms are ordered by degree and then lexicographically, like
+    scikit-learn's PolynomialFeatures without the bias column.
+    """
+
+    def __init__(self, degree: int = 2, interaction_only: bool = False):
+        """
+        Initialize the expansion.
+
+        Args:
+            degree: Maximum degree of the polynomial terms
+            interaction_only: If True, only include products of distinct features
+        """
+        if degree < 1:
+            raise ValueError("degree must be at least 1")
+        self.degree = degree
+        self.interaction_only = interaction_only
+
+    def fit(self, X: Any) -> "PolynomialExpansion":
+        """
+        Enumerate the terms for the number of features of X.
+
+        Args:
+            X: Features (dense array or scipy sparse matrix)
+
+        Returns:
+            PolynomialExpansion: self
+        """
+        p = X.shape[1]
+        strict = int(self.interaction_only)
+        self.n_features_in_ = p
+        self._rows, self._cols = np.triu_indices(p, k=strict)
+        combinations = itertools.combinations if strict else itertools.combinations_with_replacement
+        self._groups = []
+        offset = p
+        for degree in range(2, self.degree + 1):
+            for parent in combinations(range(p), degree - 2):
+                first = parent[-1] + strict if parent else 0
+                remaining = p - first
+                size = remaining * (remaining + 1 - 2 * strict) // 2
+                if size > 0:
+                    self._groups.append((parent, len(self._rows) - size, offset, size))
+                    offset += size
+        self.n_output_features_ = offset
+        return self
+
+    def transform(self, X: Any) -> np.ndarray:
+        """
+        Build the dense expanded matrix of a (small) block of rows.
+
+        Args:
+            X: Features (dense array or scipy sparse matrix)
+
+        Returns:
+            np.ndarray: Expanded features of shape (n, n_output_features_)
+        """
+        X = X.toarray() if _issparse(X) else np.asarray(X, dtype=float)
+        out = np.empty((len(X), self.n_output_features_))
+        out[:, : self.n_features_in_] = X
+        for parent, start, offset, size in self._groups:
+            block = X[:, self._rows[start:]] * X[:, self._cols[start:]]
+            product = _column_product(X, parent)
+            out[:, offset : offset + size] = block if product is None else block * product[:, None]
+        return out
+
+    def iter_transform(
+        self, X: Any, memory_budget: int = DEFAULT_MEMORY_BUDGET
+    ) -> Iterator[Tuple[slice, np.ndarray]]:
+        """
+        Yield the dense expansion in row blocks of at most memory_budget bytes.
+
+        Args:
+            X: Features (dense array or scipy sparse matrix)
+            memory_budget: Approximate size of each block in bytes
+
+        Yields:
+            Tuple of the block's row slice and its expanded features
+        """
+        rows = max(1, memory_budget // (8 * self.n_output_features_))
+        for start in range(0, X.shape[0], rows):
+            block = slice(start, min(start + rows, X.shape[0]))
+            yield block, self.transform(X[block])
+
+    def matvec(self, X: Any, v: np.ndarray) -> np.ndarray:
+        """
+        Compute Z v without building the expanded matrix Z.
+
+        Args:
+            X: Features (dense array or scipy sparse matrix)
+            v: Vector of length n_output_features_
+
+        Returns:
+            np.ndarray: Vector of length n
+        """
+        p = self.n_features_in_
+        out = np.asarray(X @ v[:p], dtype=float).ravel()
+        for parent, start, offset, size in self._groups:
+            weights = np.zeros((p, p))
+            weights[self._rows[start:], self._cols[start:]] = v[offset : offset + size]
+            mixed = X @ weights.T
+            if _issparse(X):
+                values = np.asarray(X.multiply(mixed).sum(axis=1)).ravel()
+            else:
+                values = np.einsum("ij,ij->i", X, mixed)
+            product = _column_product(X, parent)
+            out += values if product is None else values * product
+        return out
+
+    def rmatvec(self, X: Any, u: np.ndarray) -> np.ndarray:
+        """
+        Compute Z^T u without building the expanded matrix Z.
+
+        Args:
+            X: Features (dense array or scipy sparse matrix)
+            u: Vector of length n
+
+        Returns:
+            np.ndarray: Vector of length n_output_features_
+        """
+        p = self.n_features_in_
+        out = np.empty(self.n_output_features_)
+        out[:p] = X.T @ u
+        for parent, start, offset, size in self._groups:
+            product = _column_product(X, parent)
+            weights = u if product is None else u * product
+            if _issparse(X):
+                gram = (X.T @ X.multiply(weights[:, None])).toarray()
+            else:
+                gram = X.T @ (X * weights[:, None])
+            out[offset : offset + size] = gram[self._rows[start:], self._cols[start:]]
+        return out
+
+
+class PolynomialRegression:
+    """
+    Least-squares regression on polynomial features of the inputs.
+
+    With few expanded features the normal equations are accumulated over row
+    blocks of the expansion and solved exactly. With many (e.g. degree 3 on
+    hundreds of features) the standardized design is wrapped in a scipy
+    LinearOperator and solved iteratively with LSQR, so memory stays
+    O(n p + P) instead of O(n P) for P expanded features.
+    """
+
+    def __init__(
+        self,
+        degree: int = 2,
+        interaction_only: bool = False,
+        solver: str = "auto",
+        max_iter: Optional[int] = None,
+        tol: float = 1e-10,
+        max_normal_features: int = 2048,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    ):
+        """
+        Initialize the estimator.
+
+        Args:
+            degree: Maximum degree of the polynomial terms
+            interaction_only: If True, only include products of distinct features
+            solver: "normal", "lsqr", or "auto" to use the normal equations up to
+                max_normal_features expanded features and LSQR above
+            max_iter: Maximum number of LSQR iterations (defaults to scipy's)
+            tol: LSQR stopping tolerance (atol and btol)
+            max_normal_features: Largest expansion solved with "auto" via the
+                normal equations
+            memory_budget: Approximate size in bytes of each expanded row block
+        """
+        if solver not in ("auto", "normal", "lsqr"):
+            raise ValueError(f"Unsupported solver: {solver}")
+        self.degree = degree
+        self.interaction_only = interaction_only
+        self.solver = solver
+        self.max_iter = max_iter
+        self.tol = tol
+        self.max_normal_features = max_normal_features
+        self.memory_budget = memory_budget
+        self.expansion = PolynomialExpansion(degree, interaction_only)
+
+    def fit(self, X: Any, y: Union[pd.Series, np.ndarray]) -> "PolynomialRegression":
+        """
+        Fit the coefficients of the expanded features and the intercept.
+
+        Args:
+            X: Features (DataFrame, array or scipy sparse matrix)
+            y: Target variable of shape (n,) or (n, k)
+
+        Returns:
+            PolynomialRegression: self
+        """
+        X = _as_features(X)
+        y = np.asarray(y, dtype=float)
+        expansion = self.expansion.fit(X)
+        solver = self.solver
+        if solver == "auto":
+            solver = (
+                "normal" if expansion.n_output_features_ <= self.max_normal_features else "lsqr"
+            )
+
+        if solver == "normal":
+            equations = _NormalEquations()
+            for rows, block in expansion.iter_transform(X, self.memory_budget):
+                equations.update(block, y[rows])
+            self.coef_, self.intercept_ = equations.solve()
+            return self
+
+        from scipy.sparse.linalg import LinearOperator, lsqr
+
+        # Center and scale the expanded columns implicitly; LSQR converges much
+        # faster on the standardized design
+        n = X.shape[0]
+        mean = expansion.rmatvec(X, np.ones(n)) / n
+        squares = X.multiply(X) if _issparse(X) else X * X
+        variance = np.maximum(expansion.rmatvec(squares, np.ones(n)) / n - mean**2, 0)
+        scale = np.sqrt(variance)
+        scale[scale == 0] = 1.0
+        operator = LinearOperator(
+            (n, expansion.n_output_features_),
+            matvec=lambda w: expansion.matvec(X, np.ravel(w) / scale)
+            - mean @ (np.ravel(w) / scale),
+            rmatvec=lambda u: (expansion.rmatvec(X, np.ravel(u)) - mean * np.sum(u)) / scale,
+            dtype=float,
+        )
+        targets = y.reshape(n, -1)
+        coef = np.empty((targets.shape[1], expansion.n_output_features_))
+        for i, target in enumerate(targets.T):
+            solution = lsqr(
+                operator,
+                target - target.mean(),
+                atol=self.tol,
+                btol=self.tol,
+                iter_lim=self.max_iter,
+            )[0]
+            coef[i] = solution / scale
+        intercept = targets.mean(axis=0) - coef @ mean
+        self.coef_, self.intercept_ = (coef[0], intercept[0]) if y.ndim == 1 else (coef, intercept)
+        return self
+
+    def predict(self, X: Any) -> np.ndarray:
+        """
+        Predict with the fitted coefficients.
+
+        Args:
+            X: Features (DataFrame, array or scipy sparse matrix)
+
+        Returns:
+            np.ndarray: Predicted values
+        """
+        X = _as_features(X)
+        coef = np.atleast_2d(self.coef_)
+        predictions = np.column_stack([self.expansion.matvec(X, c) for c in coef])
+        predictions = predictions + self.intercept_
+        return predictions[:, 0] if np.ndim(self.coef_) == 1 else predictions
+
+
+def _as_features(X: Any) -> Any:
+    """Convert features to a float array, keeping scipy sparse matrices sparse (CSR)."""
+    if _issparse(X):
+        return X.tocsr().astype(float)
+    return np.asarray(X, dtype=float)
+
+
+# Estimator parameters the normal-equation path of partial_fit honours; the
+# PolynomialRegression solver settings only change how fit() solves
+_STREAMING_PARAMS = {
+    "linear": ("fit_intercept", "copy_X", "n_jobs", "tol"),
+    "polynomial": (
+        "degree",
+        "interaction_only",
+        "solver",
+        "max_iter",
+        "tol",
+        "max_normal_features",
+        "memory_budget",
+    ),
+}
 
 
 class RegressionModel:
     """Base class for regression models."""
 
-    def __init__(self, model_type: str = "linear"):
+    def __init__(self, model_type: str = "linear", **model_params):
         """
         Initialize regression model.
 
         Args:
             model_type: Type of regression model ("linear" or "polynomial")
+            **model_params: Additional arguments passed to the underlying estimator
+                (LinearRegression or PolynomialRegression, e.g. degree=3)
         """
         self.model_type = model_type
-        self.model = LinearRegression()
+        if model_type == "linear":
+            from sklearn.linear_model import LinearRegression
+
+            self.model = LinearRegression(**model_params)
+        elif model_type == "polynomial":
+            self.model = PolynomialRegression(**model_params)
+        else:
+            raise ValueError("Unsupported model type")
+        self.model_params = model_params
         self.is_fitted = False
+        self._normal_equations = self._new_normal_equations()
 
+    def _new_normal_equations(self) -> _NormalEquations:
+        return _NormalEquations(self.model_params.get("fit_intercept", True))
+
+    def _check_streaming(self) -> None:
+        """Reject estimator parameters that partial_fit and merge cannot honour."""
+        supported = _STREAMING_PARAMS[self.model_type]
+        defaults = inspect.signature(type(self.model)).parameters
+        unsupported = sorted(
+            name
+            for name, value in self.model_params.items()
+            if name not in supported and value != defaults[name].default
+        )
+        if unsupported:
+            raise ValueError(f"partial_fit and merge do not support parameters: {unsupported}")
+
+    @instrument
     def fit(self, X: Union[pd.DataFrame, np.ndarray], y: Union[pd.Series, np.ndarray]) -> None:
         """
         Fit the regression model.
@@ -37,7 +728,65 @@ class RegressionModel:
         """
         self.model.fit(X, y)
         self.is_fitted = True
+        self._normal_equations = self._new_normal_equations()
+
+    @instrument
+    def partial_fit(
+        self, X: Union[pd.DataFrame, np.ndarray], y: Union[pd.Series, np.ndarray]
+    ) -> None:
+        """
+        Update the model with a chunk of training data.
+
+        The normal equations are accumulated chunk by chunk, so the model can be
+        trained on data that does not fit in memory. After any number of calls
+        the coefficients equal those of a batch fit on all chunks seen so far.
+
+        Args:
+            X: Features of the chunk
+            y: Target variable of the chunk
+        """
+        self._check_streaming()
+        features, target = np.asarray(X, dtype=float), np.asarray(y, dtype=float)
+        if self.model_type == "polynomial":
+            expansion = self.model.expansion
+            if not hasattr(expansion, "n_output_features_"):
+                expansion.fit(features)
+            for rows, block in expansion.iter_transform(features, self.model.memory_budget):
+                self._normal_equations.update(block, target[rows])
+        else:
+            self._normal_equations.update(features, target)
+        self._set_coefficients(X)
+
+    def merge(self, other: "RegressionModel") -> None:
+        """
+        Combine the training data accumulated by partial_fit on another model.
+
+        This lets chunks be fitted on separate workers and the results merged.
+
+        Args:
+            other: Model trained with partial_fit on other chunks
+        """
+        self._check_streaming()
+        if other._normal_equations.n == 0:
+            raise ValueError("Only models trained with partial_fit can be merged")
+        self._normal_equations.merge(other._normal_equations)
+        if self.model_type == "polynomial":
+            self.model.expansion = other.model.expansion
+        self.model.n_features_in_ = other.model.n_features_in_
+        if hasattr(other.model, "feature_names_in_"):
+            self.model.feature_names_in_ = other.model.feature_names_in_
+        self._set_coefficients(None)
+
+    def _set_coefficients(self, X: Optional[Union[pd.DataFrame, np.ndarray]]) -> None:
+        """Solve the accumulated normal equations into the wrapped estimator."""
+        self.model.coef_, self.model.intercept_ = self._normal_equations.solve()
+        if X is not None:
+            self.model.n_features_in_ = np.shape(X)[1]
+            if isinstance(X, pd.DataFrame):
+                self.model.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        self.is_fitted = True
 
+    @instrument
     def predict(self, X: Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
         """
         Make predictions using the fitted model.
@@ -52,6 +801,7 @@ class RegressionModel:
             raise ValueError("Model must be fitted before making predictions")
         return self.model.predict(X)
 
+    @instrument
     def evaluate(
         self, X: Union[pd.DataFrame, np.ndarray], y: Union[pd.Series, np.ndarray]
     ) -> Dict[str, float]:
@@ -65,35 +815,302 @@ class RegressionModel:
         Returns:
             Dict[str, float]: Dictionary containing evaluation metrics
         """
-        predictions = self.predict(X)
+        return RegressionMetrics().update(y, self.predict(X)).result()
+
+    def save(self, path: str) -> None:
+        """
+        Save the model to a directory.
+
+        Large arrays are stored as raw buffer files that load() can memory-map.
+
+        Args:
+            path: Directory to write the model to
+        """
+        _save_model(self, path)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "RegressionModel":
+        """
+        Load a model saved with save().
+
+        The saved files are unpickled, so only load models from trusted sources.
+
+        Args:
+            path: Directory the model was saved to
+            mmap: If True, memory-map the model's arrays instead of reading them,
+                so that processes loading the same model share one physical copy
+
+        Returns:
+            RegressionModel: The loaded model
+        """
+        return _load_model(cls, path, mmap)
+
+
+class ApproximateKNeighborsClassifier:
+    """
+    k-nearest-neighbours classifier backed by a random-projection forest.
+
+    Each tree recursively splits the training points by the hyperplane halfway
+    between two random points until leaves hold at most leaf_size points. A
+    query descends every tree to one leaf, and exact distances are computed
+    only to the union of those leaves' points. More trees or larger leaves
+    raise recall at the cost of query time. Query batches are scored in
+    parallel threads.
+    """
+
+    def __init__(
+        self,
+        n_neighbors: int = 5,
+        n_trees: int = 10,
+        leaf_size: int = 32,
+        batch_size: int = 1024,
+        n_jobs: int = 1,
+        random_state: Optional[int] = None,
+    ):
+        """
+        Initialize the classifier.
+
+        Args:
+            n_neighbors: Number of neighbours used for voting
+            n_trees: Number of random-projection trees (recall/speed trade-off)
+            leaf_size: Maximum number of training points per leaf (recall/speed
+                trade-off)
+            batch_size: Number of queries scored together
+            n_jobs: Number of threads scoring query batches
+            random_state: Seed for building the trees
+        """
+        self.n_neighbors = n_neighbors
+        self.n_trees = n_trees
+        self.leaf_size = leaf_size
+        self.batch_size = batch_size
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+
+    def _build_tree(self, rng: np.random.Generator) -> dict:
+        X = self._fit_X
+        normals, offsets, children, leaves = [], [], [], []
+        # Each stack entry is (indices, parent node, side of the parent)
+        stack = [(np.arange(len(X)), -1, 0)]
+        while stack:
+            indices, parent, side = stack.pop()
+            if len(indices) <= self.leaf_size:
+                node = -len(leaves) - 1
+                leaves.append(indices)
+            else:
+                a, b = X[rng.choice(indices, 2, replace=False)]
+                normal = a - b
+                offset = normal @ (a + b) / 2
+                right = X[indices] @ normal > offset
+                if right.all() or not right.any():
+                    # Degenerate split (duplicate points): fall back to a random halving
+                    right = rng.permutation(len(indices)) < len(indices) // 2
+                node = len(normals)
+                normals.append(normal)
+                offsets.append(offset)
+                children.append([0, 0])
+                stack.append((indices[~right], node, 0))
+                stack.append((indices[right], node, 1))
+            if parent >= 0:
+                children[parent][side] = node
+
+        padded = np.full((len(leaves), self.leaf_size), -1, dtype=np.intp)
+        for i, leaf in enumerate(leaves):
+            padded[i, : len(leaf)] = leaf
+        dims = X.shape[1]
         return {
-            "mse": mean_squared_error(y, predictions),
-            "rmse": np.sqrt(mean_squared_error(y, predictions)),
-            "r2": r2_score(y, predictions),
+            "normals": np.array(normals).reshape(-1, dims),
+            "offsets": np.array(offsets, dtype=float),
+            "children": np.array(children, dtype=np.intp).reshape(-1, 2),
+            "leaves": padded,
         }
 
+    def fit(self, X: Union[pd.DataFrame, np.ndarray], y: Union[pd.Series, np.ndarray]) -> None:
+        """
+        Build the forest on the training data.
+
+        Args:
+            X: Features
+            y: Target classes
+        """
+        self._fit_X = np.ascontiguousarray(X, dtype=float)
+        self.classes_, self._y = np.unique(np.asarray(y), return_inverse=True)
+        self._norms = (self._fit_X**2).sum(axis=1)
+        rng = np.random.default_rng(self.random_state)
+        self._trees = [self._build_tree(rng) for _ in range(self.n_trees)]
+
+    def _query(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        candidates = []
+        for tree in self._trees:
+            node = np.zeros(len(queries), dtype=np.intp)
+            if len(tree["normals"]):
+                internal = np.ones(len(queries), dtype=bool)
+                while internal.any():
+                    rows = np.flatnonzero(internal)
+                    current = node[rows]
+                    right = (
+                        np.einsum("ij,ij->i", queries[rows], tree["normals"][current])
+                        > tree["offsets"][current]
+                    )
+                    node[rows] = tree["children"][current, right.astype(np.intp)]
+                    internal = node >= 0
+            else:
+                node[:] = -1
+            candidates.append(tree["leaves"][-node - 1])
+
+        # Deduplicate the union of leaves; padding and repeats get infinite distance
+        candidates = np.sort(np.hstack(candidates), axis=1)
+        invalid = candidates < 0
+        invalid[:, 1:] |= candidates[:, 1:] == candidates[:, :-1]
+        safe = np.where(invalid, 0, candidates)
+        distances = (
+            (queries**2).sum(axis=1)[:, None]
+            - 2 * np.einsum("qd,qcd->qc", queries, self._fit_X[safe])
+            + self._norms[safe]
+        )
+        distances[invalid] = np.inf
+
+        k = min(k, distances.shape[1])
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        order = np.take_along_axis(distances, nearest, axis=1).argsort(axis=1)
+        nearest = np.take_along_axis(nearest, order, axis=1)
+        best = np.take_along_axis(distances, nearest, axis=1)
+        indices = np.where(np.isinf(best), -1, np.take_along_axis(candidates, nearest, axis=1))
+        return np.sqrt(np.maximum(best, 0)), indices
+
+    def kneighbors(
+        self, X: Union[pd.DataFrame, np.ndarray], n_neighbors: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the approximate nearest training points of each query.
+
+        Args:
+            X: Query features
+            n_neighbors: Number of neighbours (defaults to n_neighbors)
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Euclidean distances and training
+            indices, nearest first (-1 where fewer candidates were found)
+        """
+        queries = np.ascontiguousarray(X, dtype=float)
+        k = n_neighbors or self.n_neighbors
+        batches = [
+            queries[start : start + self.batch_size]
+            for start in range(0, len(queries), self.batch_size)
+        ]
+        if self.n_jobs > 1 and len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=self.n_jobs) as executor:
+                results = list(executor.map(lambda batch: self._query(batch, k), batches))
+        else:
+            results = [self._query(batch, k) for batch in batches]
+        if not results:
+            return np.empty((0, k)), np.empty((0, k), dtype=np.intp)
+        return np.vstack([r[0] for r in results]), np.vstack([r[1] for r in results])
+
+    def predict_proba(self, X: Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
+        """
+        Get class probabilities from the votes of the approximate neighbours.
+
+        Args:
+            X: Features to predict
+
+        Returns:
+            np.ndarray: Probability estimates, one column per class in classes_
+        """
+        _, indices = self.kneighbors(X)
+        found = indices >= 0
+        labels = self._y[np.where(found, indices, 0)]
+        votes = np.zeros((len(indices), len(self.classes_)))
+        for column in range(indices.shape[1]):
+            np.add.at(votes, (np.arange(len(indices)), labels[:, column]), found[:, column])
+        return votes / votes.sum(axis=1, keepdims=True)
+
+    def predict(self, X: Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
+        """
+        Predict the majority class of the approximate neighbours.
+
+        Args:
+            X: Features to predict
+
+        Returns:
+            np.ndarray: Predicted classes
+        """
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+def benchmark_knn_recall(
+    model: "ClassificationModel", X: Union[pd.DataFrame, np.ndarray], k: Optional[int] = None
+) -> Dict[str, float]:
+    """
+    Compare an approximate knn model with exact brute-force neighbours.
+
+    Args:
+        model: Fitted ClassificationModel of type "approximate_knn"
+        X: Query features
+        k: Number of neighbours to compare (defaults to the model's n_neighbors)
+
+    Returns:
+        Dict[str, float]: recall@k (fraction of the exact k nearest neighbours
+        that were found), query times of both methods in seconds, and speedup
+    """
+    if model.model_type != "approximate_knn" or not model.is_fitted:
+        raise ValueError("Model must be a fitted 'approximate_knn' classifier")
+    estimator = model.model
+    k = k or estimator.n_neighbors
+    queries = np.asarray(X, dtype=float)
+
+    start = time.perf_counter()
+    _, approximate = estimator.kneighbors(queries, k)
+    ann_seconds = time.perf_counter() - start
+
+    from sklearn.neighbors import NearestNeighbors
+
+    exact_model = NearestNeighbors(n_neighbors=k, algorithm="brute").fit(estimator._fit_X)
+    start = time.perf_counter()
+    _, exact = exact_model.kneighbors(queries)
+    exact_seconds = time.perf_counter() - start
+
+    hits = sum(len(np.intersect1d(a, e)) for a, e in zip(approximate, exact))
+    return {
+        "recall": hits / exact.size if exact.size else 1.0,
+        "ann_seconds": ann_seconds,
+        "exact_seconds": exact_seconds,
+        "speedup": exact_seconds / ann_seconds if ann_seconds > 0 else float("inf"),
+    }
+
 
 class ClassificationModel:
     """Base class for classification models."""
 
-    def __init__(self, model_type: str = "logistic"):
+    def __init__(self, model_type: str = "logistic", **model_params):
         """
         Initialize classification model.
 
         Args:
-            model_type: Type of classifier ("logistic", "decision_tree", or "knn")
+            model_type: Type of classifier ("logistic", "decision_tree", "knn", or
+                "approximate_knn")
+            **model_params: Additional arguments passed to the underlying estimator
         """
         self.model_type = model_type
+        # Estimators are imported on first use to keep `import datalib.ml` fast
         if model_type == "logistic":
-            self.model = LogisticRegression()
+            from sklearn.linear_model import LogisticRegression
+
+            self.model = LogisticRegression(**model_params)
         elif model_type == "decision_tree":
-            self.model = DecisionTreeClassifier()
+            from sklearn.tree import DecisionTreeClassifier
+
+            self.model = DecisionTreeClassifier(**model_params)
         elif model_type == "knn":
-            self.model = KNeighborsClassifier()
+            from sklearn.neighbors import KNeighborsClassifier
+
+            self.model = KNeighborsClassifier(**model_params)
+        elif model_type == "approximate_knn":
+            self.model = ApproximateKNeighborsClassifier(**model_params)
         else:
             raise ValueError("Unsupported model type")
         self.is_fitted = False
 
+    @instrument
     def fit(self, X: Union[pd.DataFrame, np.ndarray], y: Union[pd.Series, np.ndarray]) -> None:
         """
         Fit the classification model.
@@ -105,6 +1122,7 @@ class ClassificationModel:
         self.model.fit(X, y)
         self.is_fitted = True
 
+    @instrument
     def predict(self, X: Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
         """
         Make predictions using the fitted model.
@@ -119,6 +1137,7 @@ class ClassificationModel:
             raise ValueError("Model must be fitted before making predictions")
         return self.model.predict(X)
 
+    @instrument
     def predict_proba(self, X: Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
         """
         Get probability estimates for each class.
@@ -133,50 +1152,690 @@ class ClassificationModel:
             raise ValueError("Model must be fitted before making predictions")
         return self.model.predict_proba(X)
 
+    @instrument
     def evaluate(
-        self, X: Union[pd.DataFrame, np.ndarray], y: Union[pd.Series, np.ndarray]
-    ) -> Dict[str, float]:
+        self,
+        X: Union[pd.DataFrame, np.ndarray],
+        y: Union[pd.Series, np.ndarray],
+        report: bool = True,
+    ) -> Dict[str, Any]:
         """
         Evaluate model performance.
 
         Args:
             X: Features
             y: True classes
+            report: If True, also build the text classification_report; pass
+                False in evaluation loops that only need the numeric metrics
 
         Returns:
-            Dict[str, float]: Dictionary containing evaluation metrics
+            Dict[str, Any]: Dictionary containing evaluation metrics
         """
         predictions = self.predict(X)
+        metrics: Dict[str, Any] = ClassificationMetrics().update(y, predictions).result()
+        if report:
+            from sklearn.metrics import classification_report
+
+            metrics["classification_report"] = classification_report(y, predictions)
+        return metrics
+
+    def save(self, path: str) -> None:
+        """
+        Save the model to a directory.
+
+        Large arrays are stored as raw buffer files that load() can memory-map.
+
+        Args:
+            path: Directory to write the model to
+        """
+        _save_model(self, path)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "ClassificationModel":
+        """
+        Load a model saved with save().
+
+        The saved files are unpickled, so only load models from trusted sources.
+
+        Args:
+            path: Directory the model was saved to
+            mmap: If True, memory-map the model's arrays instead of reading them,
+                so that processes loading the same model share one physical copy
+
+        Returns:
+            ClassificationModel: The loaded model
+        """
+        return _load_model(cls, path, mmap)
+
+
+class BatchingPredictor:
+    """
+    Micro-batching front end for ClassificationModel.predict_proba.
+
+    Requests submitted concurrently (from threads or asyncio tasks) are queued,
+    collected by a background thread for at most max_wait seconds or until
+    max_batch_size rows are pending, scored with one vectorized predict_proba
+    call, and the results are handed back to each caller.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self, model: "ClassificationModel", max_batch_size: int = 64, max_wait: float = 0.005
+    ):
+        """
+        Initialize the predictor and start its batching thread.
+
+        Args:
+            model: Fitted classification model
+            max_batch_size: Maximum number of rows scored in one call
+            max_wait: Maximum time in seconds to wait for more requests after the
+                first one of a batch arrives
+        """
+        if not model.is_fitted:
+            raise ValueError("Model must be fitted before making predictions")
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._started = time.perf_counter()
+        self._counters = {
+            "requests": 0,
+            "rows": 0,
+            "batches": 0,
+            "latency": 0.0,
+            "max_latency": 0.0,
+        }
+        self._thread = threading.Thread(target=self._run, name="BatchingPredictor", daemon=True)
+        self._thread.start()
+
+    def submit(self, X: Union[pd.DataFrame, np.ndarray]) -> Future:
+        """
+        Queue rows for scoring without waiting for the result.
+
+        Args:
+            X: Features of one or more rows (a 1-D array is a single row)
+
+        Returns:
+            Future: Resolves to the probability estimates of the rows
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BatchingPredictor is closed")
+            future: Future = Future()
+            self._queue.put((X, future, time.perf_counter()))
+        return future
+
+    def predict_proba(self, X: Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
+        """
+        Get probability estimates, batched with concurrent requests.
+
+        Args:
+            X: Features of one or more rows (a 1-D array is a single row)
+
+        Returns:
+            np.ndarray: Probability estimates
+        """
+        return self.submit(X).result()
+
+    async def predict_proba_async(self, X: Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
+        """
+        Asynchronous version of predict_proba.
+
+        Args:
+            X: Features of one or more rows (a 1-D array is a single row)
+
+        Returns:
+            np.ndarray: Probability estimates
+        """
+        return await asyncio.wrap_future(self.submit(X))
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get latency and throughput counters.
+
+        Returns:
+            Dict[str, float]: Request, row and batch counts, mean batch size,
+            mean and maximum request latency in seconds, and rows per second
+        """
+        with self._lock:
+            counters = dict(self._counters)
+        elapsed = time.perf_counter() - self._started
+        batches, requests = counters["batches"], counters["requests"]
         return {
-            "accuracy": accuracy_score(y, predictions),
-            "classification_report": classification_report(y, predictions),
+            "requests": requests,
+            "rows": counters["rows"],
+            "batches": batches,
+            "mean_batch_size": counters["rows"] / batches if batches else 0.0,
+            "mean_latency": counters["latency"] / requests if requests else 0.0,
+            "max_latency": counters["max_latency"],
+            "throughput": counters["rows"] / elapsed if elapsed > 0 else 0.0,
         }
 
+    def close(self) -> None:
+        """Score any pending requests and stop the batching thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(self._STOP)
+        self._thread.join()
 
-def prepare_data(
+    def __enter__(self) -> "BatchingPredictor":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @staticmethod
+    def _rows(X) -> int:
+        """Number of rows of a request; malformed requests count as one."""
+        try:
+            return len(np.atleast_2d(X))
+        except Exception:
+            return 1
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is self._STOP:
+                break
+            if not item[1].set_running_or_notify_cancel():
+                continue
+            batch = [item]
+            rows = self._rows(item[0])
+            deadline = time.perf_counter() + self.max_wait
+            while rows < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                try:
+                    item = (
+                        self._queue.get(timeout=timeout)
+                        if timeout > 0
+                        else self._queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stopping = True
+                    break
+                if not item[1].set_running_or_notify_cancel():
+                    # Cancelled by the caller while queued
+                    continue
+                batch.append(item)
+                rows += self._rows(item[0])
+            self._score(batch)
+
+    def _score(self, batch: list) -> None:
+        inputs = [X for X, _, _ in batch]
+        try:
+            single = [np.ndim(X) == 1 for X in inputs]
+            if all(isinstance(X, pd.DataFrame) for X in inputs):
+                combined = pd.concat(inputs, ignore_index=True)
+            else:
+                combined = np.vstack([np.atleast_2d(np.asarray(X)) for X in inputs])
+            sizes = [len(np.atleast_2d(X)) for X in inputs]
+            probabilities = self.model.predict_proba(combined)
+        except Exception as error:
+            if len(batch) == 1:
+                self._resolve(batch[0][1], error=error)
+                return
+            # Score requests one by one so only the malformed ones fail
+            for item in batch:
+                self._score([item])
+            return
+
+        done = time.perf_counter()
+        offsets = np.cumsum([0] + sizes)
+        with self._lock:
+            self._counters["batches"] += 1
+            self._counters["requests"] += len(batch)
+            self._counters["rows"] += int(offsets[-1])
+            for _, _, submitted in batch:
+                self._counters["latency"] += done - submitted
+                self._counters["max_latency"] = max(self._counters["max_latency"], done - submitted)
+        for (_, future, _), start, end, is_single in zip(batch, offsets, offsets[1:], single):
+            result = probabilities[start:end]
+            self._resolve(future, result[0] if is_single else result)
+
+    @staticmethod
+    def _resolve(future: Future, result: Any = None, error: Optional[Exception] = None) -> None:
+        """Hand a result or error to a request; a future finished elsewhere is left alone."""
+        try:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            pass
+
+
+REGRESSION_MODEL_TYPES = ("linear", "polynomial")
+
+_tune_arrays: Dict[str, np.ndarray] = {}
+_tune_segments: List[shared_memory.SharedMemory] = []
+
+
+def _share_array(array: np.ndarray) -> Tuple[shared_memory.SharedMemory, tuple]:
+    """Copy an array into a new shared memory segment; return it and its attach spec."""
+    segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[...] = array
+    return segment, (segment.name, array.shape, array.dtype.str)
+
+
+def _attach_tune_arrays(specs: Dict[str, tuple]) -> None:
+    """Process pool initializer: map the shared arrays without copying them."""
+    for name, (segment_name, shape, dtype) in specs.items():
+        segment = shared_memory.SharedMemory(name=segment_name)
+        _tune_segments.append(segment)
+        _tune_arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf)
+
+
+def _tune_task(
+    model_type: str, params: dict, fold: int, fraction: float
+) -> Tuple[float, float, float, Optional[str]]:
+    """
+    Fit one parameter combination on one fold.
+
+    Returns the score, fit time, score time and, if fitting or scoring failed,
+    the error (with a NaN score) instead of raising it.
+    """
+    X, y = _tune_arrays["X"], _tune_arrays["y"]
+    train = _tune_arrays["folds"] != fold
+    if fraction < 1:
+        train &= _tune_arrays["order"] < fraction * len(y)
+    test = _tune_arrays["folds"] == fold
+
+    start = fit_time = time.perf_counter()
+    try:
+        if model_type in REGRESSION_MODEL_TYPES:
+            model: Any = RegressionModel(model_type, **params)
+            metrics: Any = RegressionMetrics()
+            metric = "r2"
+        else:
+            model = ClassificationModel(model_type, **params)
+            metrics = ClassificationMetrics()
+            metric = "accuracy"
+        model.fit(X[train], y[train])
+        fit_time = time.perf_counter() - start
+        start = time.perf_counter()
+        score = metrics.update(y[test], model.predict(X[test])).result()[metric]
+    except Exception as error:
+        return np.nan, time.perf_counter() - start, 0.0, f"{type(error).__name__}: {error}"
+    return score, fit_time, time.perf_counter() - start, None
+
+
+def _default_min_resources(
+    model_type: str, candidates: List[dict], cv: int, n_classes: Optional[int]
+) -> int:
+    """Smallest training subsample of successive halving, like HalvingGridSearchCV's."""
+    min_resources = 2 * cv * (n_classes or 1)
+    if n_classes is not None:
+        # Neighbour-based classifiers need at least n_neighbors training rows
+        for params in candidates:
+            try:
+                model = ClassificationModel(model_type, **params).model
+            except Exception:
+                continue
+            min_resources = max(min_resources, getattr(model, "n_neighbors", 0))
+    return min_resources
+
+
+def _halving_fractions(
+    model_type: str,
+    candidates: List[dict],
+    y: np.ndarray,
+    cv: int,
+    factor: int,
+    min_resources: Optional[int],
+) -> List[float]:
+    """Fractions of the training rows used by each successive halving round."""
+    if min_resources is None:
+        n_classes = int(y.max()) + 1 if model_type not in REGRESSION_MODEL_TYPES else None
+        min_resources = _default_min_resources(model_type, candidates, cv, n_classes)
+    n_train = len(y) * (cv - 1) // cv
+    rounds = int(np.ceil(np.log(len(candidates)) / np.log(factor)))
+    if n_train > min_resources:
+        # The first round must still train on at least min_resources rows
+        rounds = min(rounds, int(np.log(n_train / min_resources) / np.log(factor)) + 1)
+    else:
+        rounds = 1
+    return [float(factor) ** (i - rounds + 1) for i in range(rounds)]
+
+
+def _tune_round(
+    executor: Optional[ProcessPoolExecutor],
+    model_type: str,
+    candidates: List[dict],
+    cv: int,
+    fraction: float,
+    errors: List[str],
+) -> np.ndarray:
+    """Score every candidate on every fold; return (candidate, fold, [score, fit, score time])."""
+    tasks = [(params, fold) for params in candidates for fold in range(cv)]
+    if executor is not None:
+        futures = [
+            executor.submit(_tune_task, model_type, params, fold, fraction)
+            for params, fold in tasks
+        ]
+        results = [future.result() for future in futures]
+    else:
+        results = [_tune_task(model_type, params, fold, fraction) for params, fold in tasks]
+    errors.extend(error for *_, error in results if error is not None)
+    return np.array([result[:3] for result in results]).reshape(len(candidates), cv, 3)
+
+
+def _assign_folds(y: np.ndarray, cv: int, stratify: bool, rng: np.random.Generator) -> np.ndarray:
+    """Shuffled k-fold assignment, stratified by class if requested."""
+    order = rng.permutation(len(y))
+    if stratify:
+        order = order[np.argsort(y[order], kind="stable")]
+    folds = np.empty(len(y), dtype=np.int32)
+    folds[order] = np.arange(len(y)) % cv
+    return folds
+
+
+@instrument
+def tune(
+    model_type: str,
+    param_grid: Dict[str, List[Any]],
     data: pd.DataFrame,
     target: str,
+    cv: int = 5,
+    features: Optional[List[str]] = None,
+    n_jobs: Optional[int] = None,
+    successive_halving: bool = False,
+    factor: int = 3,
+    min_resources: Optional[int] = None,
+    random_state: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Cross-validate every combination of a parameter grid in parallel.
+
+    Fold and parameter combinations run in a process pool. The feature matrix,
+    target and fold assignment are placed in shared memory once, so tasks only
+    carry their parameters. Regression models are scored by R^2 and classifiers
+    by accuracy; classification folds are stratified. A candidate whose fit
+    fails is scored NaN, ranked last and eliminated, with a warning.
+
+    Args:
+        model_type: A RegressionModel ("linear" or "polynomial") or
+            ClassificationModel model type
+        param_grid: Estimator parameter names mapped to lists of values to try
+        data: Input DataFrame
+        target: Name of target column
+        cv: Number of cross-validation folds
+        features: List of feature columns (if None, use all except target)
+        n_jobs: Number of worker processes (defaults to the CPU count; 1 runs
+            in the current process)
+        successive_halving: If True, evaluate all candidates on a small subsample
+            of the training rows first and keep only the best 1/factor of them
+            for each following round, which uses factor times more rows
+        factor: Reduction factor of successive halving
+        min_resources: Minimum number of training rows of the first successive
+            halving round; fewer rounds are run if needed (defaults to 2 * cv
+            rows per class, and at least the largest n_neighbors of the grid)
+        random_state: Seed for the fold assignment and subsampling
+
+    Returns:
+        pd.DataFrame: One row per candidate and round with the parameters,
+        "round", "resource" (fraction of training rows used), "mean_score",
+        "std_score", "mean_fit_time" and "mean_score_time", best candidate first
+    """
+    if cv < 2:
+        raise ValueError("cv must be at least 2")
+    if features is None:
+        features = [col for col in data.columns if col != target]
+    X = data[features].to_numpy(dtype=float)
+    y = data[target].to_numpy()
+    classification = model_type not in REGRESSION_MODEL_TYPES
+    y = np.unique(y, return_inverse=True)[1] if classification else y.astype(float)
+
+    rng = np.random.default_rng(random_state)
+    arrays = {
+        "X": X,
+        "y": y,
+        "folds": _assign_folds(y, cv, classification, rng),
+        "order": rng.permutation(len(y)),
+    }
+    names = list(param_grid)
+    candidates = [dict(zip(names, values)) for values in itertools.product(*param_grid.values())]
+
+    fractions = [1.0]
+    if successive_halving and len(candidates) > 1:
+        fractions = _halving_fractions(model_type, candidates, y, cv, factor, min_resources)
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    segments: List[shared_memory.SharedMemory] = []
+    executor = None
+    if n_jobs > 1:
+        specs = {}
+        for name, array in arrays.items():
+            segment, specs[name] = _share_array(array)
+            segments.append(segment)
+        executor = ProcessPoolExecutor(
+            max_workers=n_jobs, initializer=_attach_tune_arrays, initargs=(specs,)
+        )
+    else:
+        _tune_arrays.update(arrays)
+
+    rows = []
+    errors: List[str] = []
+    try:
+        for round_index, fraction in enumerate(fractions):
+            scores = _tune_round(executor, model_type, candidates, cv, fraction, errors)
+            round_rows = [
+                {
+                    **{f"param_{name}": params[name] for name in names},
+                    "params": params,
+                    "round": round_index,
+                    "resource": fraction,
+                    "mean_score": candidate[:, 0].mean(),
+                    "std_score": candidate[:, 0].std(),
+                    "mean_fit_time": candidate[:, 1].mean(),
+                    "mean_score_time": candidate[:, 2].mean(),
+                }
+                for params, candidate in zip(candidates, scores)
+            ]
+            rows.extend(round_rows)
+            # NaN scores sort last and are never kept
+            mean_scores = scores[:, :, 0].mean(axis=1)
+            ranking = np.argsort(-mean_scores, kind="stable")[
+                : int(np.ceil(len(candidates) / factor))
+            ]
+            candidates = [candidates[i] for i in ranking if np.isfinite(mean_scores[i])]
+            if not candidates:
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+        _tune_arrays.clear()
+
+    if errors:
+        warnings.warn(f"{len(errors)} fits failed and were scored NaN; first error: {errors[0]}")
+    results = pd.DataFrame(rows)
+    return results.sort_values(["round", "mean_score"], ascending=False, kind="stable").reset_index(
+        drop=True
+    )
+
+
+def _split_labels(data, stratify) -> Tuple[int, Optional[np.ndarray]]:
+    """Return the row count of data and, if requested, its stratification labels as codes."""
+    if isinstance(data, np.ndarray):
+        n = len(data)
+        labels = data[:, stratify] if isinstance(stratify, (int, np.integer)) else stratify
+    elif _is_chunked(data):
+        n, parts = 0, []
+        for chunk in data:
+            n += len(chunk)
+            if isinstance(stratify, str):
+                parts.append(chunk[stratify].to_numpy())
+        labels = np.concatenate(parts) if parts else stratify
+    else:
+        n = len(data)
+        labels = data[stratify] if isinstance(stratify, str) else stratify
+
+    if labels is None:
+        return n, None
+    codes = pd.factorize(np.asarray(labels), use_na_sentinel=False)[0]
+    if len(codes) != n:
+        raise ValueError(f"stratify has {len(codes)} labels but data has {n} rows")
+    return n, codes
+
+
+@instrument
+def split_indices(
+    data: Union[pd.DataFrame, np.ndarray, Iterable[pd.DataFrame]],
+    test_size: float = 0.2,
+    stratify: Optional[Union[str, int, np.ndarray]] = None,
+    shuffle: bool = True,
+    random_state: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Split the rows of a dataset into train and test positions without copying it.
+
+    Only the row count and the stratification labels are read, so the split
+    needs O(n) integers of memory regardless of the number of features. Chunked
+    input (e.g. ``read_csv(..., stream=True)``) is scanned once.
+
+    Args:
+        data: DataFrame, array (including memory-mapped arrays) or re-iterable
+            DataFrame chunks
+        test_size: Proportion of rows to use for testing
+        stratify: Labels to preserve the class proportions of: a column name,
+            a column position for arrays, or an array of labels
+        shuffle: If False, keep row order and put the last rows (of every class,
+            if stratified) in the test set, e.g. for time-ordered data
+        random_state: Random seed for reproducibility
+
+    Returns:
+        Tuple containing sorted train and test row positions
+    """
+    if not 0 < test_size < 1:
+        raise ValueError("test_size must be between 0 and 1")
+    n, labels = _split_labels(data, stratify)
+    n_test = int(np.ceil(test_size * n))
+    if n_test >= n:
+        raise ValueError(f"Cannot split {n} rows with test_size={test_size}")
+
+    order = np.random.default_rng(random_state).permutation(n) if shuffle else np.arange(n)
+    if labels is None:
+        test = order[n - n_test :] if not shuffle else order[:n_test]
+        train = order[: n - n_test] if not shuffle else order[n_test:]
+        return np.sort(train), np.sort(test)
+
+    # Allocate test rows per class by largest remainder so the total is exactly n_test
+    counts = np.bincount(labels)
+    quotas = counts * (n_test / n)
+    per_class = np.floor(quotas).astype(np.intp)
+    remainder = np.argsort(per_class - quotas, kind="stable")[: n_test - per_class.sum()]
+    per_class[remainder] += 1
+
+    # Rank every row within its class; time-ordered splits test on the latest rows
+    grouped = order[np.argsort(labels[order], kind="stable")]
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    rank = np.arange(n) - np.repeat(starts, counts)
+    if not shuffle:
+        rank = np.repeat(counts, counts) - 1 - rank
+    is_test = rank < np.repeat(per_class, counts)
+    return np.sort(grouped[~is_test]), np.sort(grouped[is_test])
+
+
+def take_rows(
+    data: Union[pd.DataFrame, np.ndarray, Iterable[pd.DataFrame]], indices: np.ndarray
+) -> Union[pd.DataFrame, np.ndarray, Iterator[pd.DataFrame]]:
+    """
+    Select rows by position, avoiding copies where possible.
+
+    A contiguous run of positions (as produced by an unshuffled split) is
+    returned as a slice, which is a view for arrays and memory-mapped arrays.
+    Chunked input yields the selected rows of each chunk lazily.
+
+    Args:
+        data: DataFrame, array or re-iterable DataFrame chunks
+        indices: Sorted row positions, e.g. from split_indices
+
+    Returns:
+        The selected rows, or a generator of selected chunk rows for chunked input
+    """
+    indices = np.asarray(indices)
+    if isinstance(data, (pd.DataFrame, np.ndarray)):
+        if len(indices) and indices[-1] - indices[0] == len(indices) - 1:
+            rows = slice(indices[0], indices[-1] + 1)
+        else:
+            rows = indices
+        return data.iloc[rows] if isinstance(data, pd.DataFrame) else data[rows]
+    if _is_chunked(data):
+        return _take_chunk_rows(data, indices)
+    raise ValueError(f"Unsupported data type: {type(data).__name__}")
+
+
+def _take_chunk_rows(chunks: Iterable[pd.DataFrame], indices: np.ndarray) -> Iterator[pd.DataFrame]:
+    """Yield the rows of each chunk whose global positions are in indices."""
+    offset = 0
+    for chunk in chunks:
+        start, stop = np.searchsorted(indices, [offset, offset + len(chunk)])
+        if stop > start:
+            yield chunk.iloc[indices[start:stop] - offset]
+        offset += len(chunk)
+
+
+@instrument
+def prepare_data(
+    data: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+    target: str,
     features: Optional[List[str]] = None,
     test_size: float = 0.2,
     random_state: Optional[int] = None,
-) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    stratify: bool = False,
+    shuffle: bool = True,
+    return_indices: bool = False,
+) -> Tuple[np.ndarray, ...]:
     """
     Prepare data for machine learning by splitting into train and test sets.
 
     Args:
-        data: Input DataFrame
+        data: Input DataFrame, or re-iterable DataFrame chunks if return_indices is True
         target: Name of target column
         features: List of feature columns (if None, use all except target)
         test_size: Proportion of data to use for testing
         random_state: Random seed for reproducibility
+        stratify: If True, preserve the class proportions of the target column
+        shuffle: If False, split in row order with the last rows as the test set
+        return_indices: If True, return train and test row positions instead of
+            copies of the data (see split_indices and take_rows)
 
     Returns:
-        Tuple containing X_train, X_test, y_train, y_test
+        Tuple containing X_train, X_test, y_train, y_test, or train and test row
+        positions if return_indices is True
     """
+    if return_indices:
+        return split_indices(
+            data,
+            test_size=test_size,
+            stratify=target if stratify else None,
+            shuffle=shuffle,
+            random_state=random_state,
+        )
+
     if features is None:
         features = [col for col in data.columns if col != target]
 
     X = data[features]
     y = data[target]
 
-    return train_test_split(X, y, test_size=test_size, random_state=random_state)
+    from sklearn.model_selection import train_test_split
+
+    return train_test_split(
+        X,
+        y,
+        test_size=test_size,
+        random_state=random_state,
+        shuffle=shuffle,
+        stratify=y if stratify else None,
+    )
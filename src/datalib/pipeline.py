@@ -0,0 +1,388 @@
+"""
+Lazy pipelines that plan reads and computations before touching the data.
+"""
+
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .data_manipulation import read_csv
+from .instrumentation import instrument
+from .statistics import _ColumnSummary, _CorrelationSums, _Moments
+
+NORMALIZE_METHODS = ("minmax", "zscore")
+
+
+class _RawStats:
+    """Count, mean, variance, min and max of a set of columns, accumulated over chunks."""
+
+    def __init__(self, columns: List[str]):
+        self.columns = columns
+        self.moments = _Moments(len(columns))
+        self.minimum = np.full(len(columns), np.inf)
+        self.maximum = np.full(len(columns), -np.inf)
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        values = chunk[self.columns].to_numpy(dtype=float)
+        self.moments.merge(_Moments.from_array(values))
+        valid = ~np.isnan(values)
+        self.minimum = np.fmin(self.minimum, np.min(values, axis=0, initial=np.inf, where=valid))
+        self.maximum = np.fmax(self.maximum, np.max(values, axis=0, initial=-np.inf, where=valid))
+
+
+class LazyFrame:
+    """
+    Lazily evaluated chain of column operations on a CSV file, DataFrame or chunks.
+
+    Operations are only recorded; an action (collect, iter_chunks, describe,
+    correlation or compute) plans and runs them:
+
+    - only the columns the action needs are read (passed to read_csv as usecols);
+    - successive normalizations of a column are fused into one affine map
+      (value * scale + shift), applied in a single step;
+    - several aggregations share one pass over the data;
+    - normalization is a positive affine map, so describe measures of a
+      normalized column are derived from those of the raw column and Pearson
+      correlations are unchanged: aggregations never run a transform pass.
+
+    CSV sources are read in chunks of about memory_budget bytes, so pipelines
+    run on files larger than memory. Chunked sources must be re-iterable when
+    an action needs two passes (collecting normalized columns).
+    """
+
+    def __init__(
+        self,
+        source: Union[str, os.PathLike, pd.DataFrame, Iterable[pd.DataFrame]],
+        memory_budget: Optional[int] = None,
+        **read_kwargs,
+    ):
+        """
+        Initialize a pipeline without reading anything.
+
+        Args:
+            source: Path to a CSV file, a DataFrame, or re-iterable DataFrame chunks
+            memory_budget: Approximate size in bytes of each chunk read from a CSV file
+            **read_kwargs: Additional arguments passed to read_csv
+        """
+        self._source = source
+        self._memory_budget = memory_budget
+        self._read_kwargs = read_kwargs
+        self._ops: Tuple[tuple, ...] = ()
+
+    def _with(self, op: tuple) -> "LazyFrame":
+        frame = LazyFrame.__new__(LazyFrame)
+        frame.__dict__.update(self.__dict__)
+        frame._ops = self._ops + (op,)
+        frame._resolve()
+        return frame
+
+    def select(self, columns: List[str]) -> "LazyFrame":
+        """
+        Keep only the given columns.
+
+        Args:
+            columns: Columns to keep, in output order
+
+        Returns:
+            LazyFrame: A new pipeline with the selection appended
+        """
+        return self._with(("select", list(columns)))
+
+    def normalize(self, column: str, method: str = "minmax") -> "LazyFrame":
+        """
+        Normalize a column, like normalize_column.
+
+        Args:
+            column: Name of the column to normalize
+            method: Normalization method ("minmax" or "zscore")
+
+        Returns:
+            LazyFrame: A new pipeline with the normalization appended
+        """
+        if method not in NORMALIZE_METHODS:
+            raise ValueError("Method must be either 'minmax' or 'zscore'")
+        return self._with(("normalize", column, method))
+
+    def _resolve(self) -> Tuple[Optional[List[str]], Dict[str, List[str]]]:
+        """Return the output columns (None if all) and the normalizations of each column."""
+        columns: Optional[List[str]] = None
+        normalizations: Dict[str, List[str]] = {}
+        for op in self._ops:
+            if op[0] == "select":
+                missing = [col for col in op[1] if columns is not None and col not in columns]
+                if missing:
+                    raise ValueError(f"Columns not available after earlier selection: {missing}")
+                columns = op[1]
+            else:
+                if columns is not None and op[1] not in columns:
+                    raise ValueError(f"Column {op[1]!r} is not selected")
+                normalizations.setdefault(op[1], []).append(op[2])
+        if columns is not None:
+            normalizations = {col: m for col, m in normalizations.items() if col in columns}
+        return columns, normalizations
+
+    @property
+    def columns(self) -> Optional[List[str]]:
+        """Output columns, or None if every column of the source is kept."""
+        return self._resolve()[0]
+
+    def _scan(self, columns: Optional[List[str]]) -> Iterable[pd.DataFrame]:
+        """Chunks of the source restricted to columns (None reads all)."""
+        source = self._source
+        if isinstance(source, (str, os.PathLike)):
+            kwargs = dict(self._read_kwargs)
+            if columns is not None:
+                kwargs["usecols"] = columns
+            return read_csv(source, stream=True, memory_budget=self._memory_budget, **kwargs)
+        if isinstance(source, pd.DataFrame):
+            return [source if columns is None else source[columns]]
+        return (chunk if columns is None else chunk[columns] for chunk in source)
+
+    def _affine_maps(
+        self, normalizations: Dict[str, List[str]], stats: _RawStats
+    ) -> Dict[str, Tuple[float, float]]:
+        """Compose each column's normalizations into one (scale, shift) map of the raw values."""
+        summary = stats.moments.summary()
+        maps = {}
+        for i, column in enumerate(stats.columns):
+            scale, shift = 1.0, 0.0
+            for method in normalizations[column]:
+                # Statistics of the current values follow from the raw ones
+                if method == "minmax":
+                    low = stats.minimum[i] * scale + shift
+                    offset, spread = low, (stats.maximum[i] - stats.minimum[i]) * scale
+                else:
+                    offset, spread = summary["mean"][i] * scale + shift, summary["std"][i] * scale
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    scale, shift = scale / spread, (shift - offset) / spread
+            maps[column] = (scale, shift)
+        return maps
+
+    def explain(
+        self,
+        describe: Optional[Union[str, List[str]]] = None,
+        correlation: Optional[Union[bool, List[str]]] = None,
+    ) -> dict:
+        """
+        Describe how an action would be executed, without running it.
+
+        Args:
+            describe: Columns to describe (as in compute); if neither describe
+                nor correlation is given, the plan of collect is returned
+            correlation: Columns to correlate, or True for all numerical columns
+
+        Returns:
+            dict: "usecols" (columns read, None for all), "passes" over the data,
+            and "normalize" with the fused normalizations of each column
+        """
+        columns, normalizations = self._resolve()
+        if describe is None and correlation is None:
+            passes = 2 if normalizations else 1
+            return {"usecols": columns, "passes": passes, "normalize": normalizations}
+        needed = self._aggregation_columns(columns, describe, correlation)
+        if needed is not None:
+            normalizations = {col: m for col, m in normalizations.items() if col in needed}
+        return {"usecols": needed, "passes": 1, "normalize": normalizations}
+
+    @staticmethod
+    def _aggregation_columns(
+        columns: Optional[List[str]],
+        describe: Optional[Union[str, List[str]]],
+        correlation: Optional[Union[bool, List[str]]],
+    ) -> Optional[List[str]]:
+        """Columns an aggregation reads (None for all columns of the source)."""
+        describe = [describe] if isinstance(describe, str) else list(describe or [])
+        if correlation is True:
+            if columns is None:
+                return None
+            correlation = columns
+        needed = list(dict.fromkeys(describe + list(correlation or [])))
+        missing = [col for col in needed if columns is not None and col not in columns]
+        if missing:
+            raise ValueError(f"Columns are not selected: {missing}")
+        return needed
+
+    @instrument
+    def compute(
+        self,
+        describe: Optional[Union[str, List[str]]] = None,
+        correlation: Optional[Union[bool, List[str]]] = None,
+        approximate: bool = False,
+    ) -> dict:
+        """
+        Run several aggregations together in a single pass over the data.
+
+        Args:
+            describe: Column or columns to summarize like describe_column
+            correlation: Columns to compute the Pearson correlation matrix of, or
+                True for all numerical columns
+            approximate: Estimate medians and modes with sketches (see
+                describe_column) so memory stays bounded
+
+        Returns:
+            dict: "describe" mapping each described column to its measures, and
+            "correlation" with the correlation matrix (if requested)
+        """
+        columns, normalizations = self._resolve()
+        needed = self._aggregation_columns(columns, describe, correlation)
+        described = [describe] if isinstance(describe, str) else list(describe or [])
+
+        summaries = {col: _ColumnSummary(approximate) for col in described}
+        sums, stats = self._accumulate(needed, columns, normalizations, summaries, correlation)
+        maps = self._affine_maps(normalizations, stats) if stats is not None else {}
+        return _aggregation_results(summaries, sums, maps)
+
+    def _accumulate(
+        self,
+        needed: Optional[List[str]],
+        columns: Optional[List[str]],
+        normalizations: Dict[str, List[str]],
+        summaries: Dict[str, _ColumnSummary],
+        correlation: Optional[Union[bool, List[str]]],
+    ) -> Tuple[Optional[_CorrelationSums], Optional[_RawStats]]:
+        """Feed every chunk of the needed columns to all accumulators in one pass."""
+        sums = _CorrelationSums(correlation) if isinstance(correlation, list) else None
+        stats: Optional[_RawStats] = None
+        for chunk in self._scan(needed):
+            if stats is None:
+                stats = _RawStats([col for col in normalizations if col in chunk.columns])
+                if correlation is True:
+                    # All numerical columns of the selection, or of the source
+                    output = chunk if columns is None else chunk[columns]
+                    sums = _CorrelationSums(list(output.select_dtypes(include=[np.number]).columns))
+            for col, summary in summaries.items():
+                summary.update(chunk[col])
+            if sums is not None:
+                sums.update(chunk)
+            if stats.columns:
+                stats.update(chunk)
+        return sums, stats
+
+    def describe(self, column: str, approximate: bool = False) -> dict:
+        """
+        Calculate the describe_column measures of a column of the pipeline's output.
+
+        Args:
+            column: Name of the column to analyze
+            approximate: Estimate the median and mode with sketches
+
+        Returns:
+            dict: Dictionary containing statistical measures
+        """
+        return self.compute(describe=[column], approximate=approximate)["describe"][column]
+
+    def correlation(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Calculate the Pearson correlation matrix of the pipeline's output.
+
+        Args:
+            columns: Columns to correlate (if None, all numerical columns)
+
+        Returns:
+            pd.DataFrame: Correlation matrix
+        """
+        return self.compute(correlation=columns if columns is not None else True)["correlation"]
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """
+        Execute the pipeline chunk by chunk.
+
+        Normalization parameters are fitted first, in one pass over only the
+        normalized columns; the returned iterator then reads the output columns
+        and applies each column's fused affine map.
+
+        Returns:
+            Iterator[pd.DataFrame]: Lazy iterator of output chunks
+        """
+        columns, normalizations = self._resolve()
+        maps: Dict[str, Tuple[float, float]] = {}
+        if normalizations:
+            source = self._source
+            if not isinstance(source, (str, os.PathLike, pd.DataFrame)) and iter(source) is source:
+                raise ValueError("Normalizing chunked input requires a re-iterable source")
+            stats = _RawStats(list(normalizations))
+            for chunk in self._scan(list(normalizations)):
+                stats.update(chunk)
+            maps = self._affine_maps(normalizations, stats)
+        return self._transform_chunks(columns, maps)
+
+    def _transform_chunks(
+        self, columns: Optional[List[str]], maps: Dict[str, Tuple[float, float]]
+    ) -> Iterator[pd.DataFrame]:
+        # Only chunks read from a CSV file are fresh; any others belong to the caller
+        owned = isinstance(self._source, (str, os.PathLike))
+        for chunk in self._scan(columns):
+            if maps:
+                chunk = chunk if owned else chunk.copy()
+                with np.errstate(invalid="ignore"):
+                    for col, (scale, shift) in maps.items():
+                        chunk[col] = chunk[col].to_numpy(dtype=float) * scale + shift
+            yield chunk if columns is None else chunk[columns]
+
+    @instrument
+    def collect(self) -> pd.DataFrame:
+        """
+        Execute the pipeline and return its output as one DataFrame.
+
+        Returns:
+            pd.DataFrame: The resulting data
+        """
+        chunks = list(self.iter_chunks())
+        if len(chunks) == 1:
+            return chunks[0]
+        return pd.concat(chunks)
+
+
+def _aggregation_results(
+    summaries: Dict[str, _ColumnSummary],
+    sums: Optional[_CorrelationSums],
+    maps: Dict[str, Tuple[float, float]],
+) -> dict:
+    """Finish the accumulators, mapping measures of normalized columns from the raw ones."""
+    results: dict = {"describe": {}}
+    for col, summary in summaries.items():
+        measures = summary.result()
+        if col in maps:
+            measures = _affine_describe(measures, *maps[col])
+        results["describe"][col] = measures
+    if sums is not None:
+        corr = sums.result()
+        for col, (scale, _) in maps.items():
+            # A constant column normalizes to missing values
+            if col in corr.index and not (np.isfinite(scale) and scale > 0):
+                corr.loc[col, :] = np.nan
+                corr.loc[:, col] = np.nan
+        results["correlation"] = corr
+    return results
+
+
+def _affine_describe(measures: dict, scale: float, shift: float) -> dict:
+    """Map describe_column measures of raw values to those of value * scale + shift."""
+    if not (np.isfinite(scale) and scale > 0):
+        return {key: np.nan for key in measures}
+    return {
+        "mean": measures["mean"] * scale + shift,
+        "median": measures["median"] * scale + shift,
+        "mode": measures["mode"] * scale + shift,
+        "std": measures["std"] * scale,
+        "variance": measures["variance"] * scale**2,
+        "skewness": measures["skewness"],
+        "kurtosis": measures["kurtosis"],
+    }
+
+
+def scan_csv(filepath: str, memory_budget: Optional[int] = None, **kwargs) -> LazyFrame:
+    """
+    Start a lazy pipeline on a CSV file.
+
+    Args:
+        filepath: Path to the CSV file
+        memory_budget: Approximate size in bytes of each chunk read
+        **kwargs: Additional arguments passed to read_csv
+
+    Returns:
+        LazyFrame: Pipeline reading the file
+    """
+    return LazyFrame(filepath, memory_budget=memory_budget, **kwargs)
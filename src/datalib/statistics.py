@@ -2,24 +2,547 @@
 Statistical computations module providing basic and advanced statistical functions.
 """
 
-from typing import Optional, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
-from scipy import stats
 
+from .data_manipulation import _is_chunked
+from .instrumentation import instrument
+from .memoization import memoize
 
-def describe_column(data: pd.DataFrame, column: str) -> dict:
+
+class _Moments:
+    """
+    Mergeable count, mean and central moment sums (M2, M3, M4) for a set of columns.
+
+    Partial results from separate chunks are combined with the pairwise update
+    formulas of Pébay (2008), so a column can be summarized in a single pass.
+    """
+
+    def __init__(self, size: int):
+        self.n = np.zeros(size)
+        self.mean = np.zeros(size)
+        self.m2 = np.zeros(size)
+        self.m3 = np.zeros(size)
+        self.m4 = np.zeros(size)
+
+    @classmethod
+    def from_array(cls, values: np.ndarray) -> "_Moments":
+        """Compute the moments of each column of a 2-D float array, ignoring NaNs."""
+        moments = cls(values.shape[1])
+        valid = ~np.isnan(values)
+        complete = valid.all()
+        moments.n = valid.sum(axis=0).astype(float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            total = values.sum(axis=0) if complete else np.nansum(values, axis=0)
+            moments.mean = total / moments.n
+        moments.mean[moments.n == 0] = 0.0
+        # Reuse one temporary for every power to keep the pass cheap on wide blocks
+        delta = np.subtract(values, moments.mean, order="K")
+        if not complete:
+            delta[~valid] = 0.0
+        power = delta * delta
+        moments.m2 = power.sum(axis=0)
+        power *= delta
+        moments.m3 = power.sum(axis=0)
+        power *= delta
+        moments.m4 = power.sum(axis=0)
+        return moments
+
+    def merge(self, other: "_Moments") -> None:
+        """Fold the moments of another partition into this one."""
+        na, nb = self.n, other.n
+        n = na + nb
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = np.where(n > 0, other.mean - self.mean, 0.0)
+            ratio = np.where(n > 0, na * nb / n, 0.0)
+            m2 = self.m2 + other.m2 + delta**2 * ratio
+            m3 = (
+                self.m3
+                + other.m3
+                + np.where(n > 0, delta**3 * ratio * (na - nb) / n, 0.0)
+                + np.where(n > 0, 3 * delta * (na * other.m2 - nb * self.m2) / n, 0.0)
+            )
+            m4 = (
+                self.m4
+                + other.m4
+                + np.where(n > 0, delta**4 * ratio * (na**2 - na * nb + nb**2) / n**2, 0.0)
+                + np.where(n > 0, 6 * delta**2 * (na**2 * other.m2 + nb**2 * self.m2) / n**2, 0.0)
+                + np.where(n > 0, 4 * delta * (na * other.m3 - nb * self.m3) / n, 0.0)
+            )
+            self.mean = np.where(n > 0, self.mean + delta * nb / n, 0.0)
+        self.n, self.m2, self.m3, self.m4 = n, m2, m3, m4
+
+    def summary(self) -> dict:
+        """Return mean, std, variance, skewness and kurtosis arrays with pandas' conventions."""
+        n, m2, m3, m4 = self.n, self.m2, self.m3, self.m4
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(n > 0, self.mean, np.nan)
+            variance = np.where(n > 1, m2 / (n - 1), np.nan)
+            skewness = np.where(m2 == 0, 0.0, n * np.sqrt(n - 1) / (n - 2) * m3 / m2**1.5)
+            kurtosis = np.where(
+                m2 == 0,
+                0.0,
+                n * (n + 1) * (n - 1) * m4 / ((n - 2) * (n - 3) * m2**2)
+                - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3)),
+            )
+        return {
+            "mean": mean,
+            "std": np.sqrt(variance),
+            "variance": variance,
+            "skewness": np.where(n > 2, skewness, np.nan),
+            "kurtosis": np.where(n > 3, kurtosis, np.nan),
+        }
+
+
+def _hash_values(values) -> np.ndarray:
+    """Deterministic 64-bit hashes; numbers hash by value regardless of integer/float dtype."""
+    array = np.asarray(values)
+    array = array.astype(np.float64) if array.dtype.kind in "biuf" else array.astype(object)
+    return pd.util.hash_array(array)
+
+
+def _valid_values(values) -> pd.Series:
+    """Return values as a Series with missing entries dropped."""
+    return pd.Series(values).dropna().reset_index(drop=True)
+
+
+class KLLSketch:
+    """
+    Mergeable quantile sketch (Karnin, Lang and Liberty, 2016).
+
+    Keeps a hierarchy of compactors whose items carry weight 2**level. With
+    parameter k the normalized rank error of a quantile query is about 1.7 / k
+    with high probability (roughly 1% for the default k=200), and the sketch
+    holds O(k) items regardless of the number of values seen.
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        """
+        Initialize the sketch.
+
+        Args:
+            k: Accuracy parameter (size of the top compactor)
+            seed: Seed for the random compaction offsets
+        """
+        self.k = k
+        self.n = 0
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self) -> None:
+        while True:
+            for level, items in enumerate(self.levels):
+                if len(items) >= self._capacity(level):
+                    break
+            else:
+                return
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            items = np.sort(items)
+            # An odd item out stays behind; the rest is halved by keeping every other one
+            keep = items[len(items) - len(items) % 2 :]
+            promoted = items[self._rng.integers(2) : len(items) - len(keep) : 2]
+            self.levels[level] = keep
+            self.levels[level + 1] = np.concatenate((self.levels[level + 1], promoted))
+
+    def update(self, values) -> None:
+        """
+        Add values to the sketch.
+
+        Args:
+            values: Array-like of numbers; missing values are ignored
+        """
+        values = _valid_values(values).to_numpy(dtype=float)
+        self.n += len(values)
+        self.levels[0] = np.concatenate((self.levels[0], values))
+        self._compress()
+
+    def merge(self, other: "KLLSketch") -> None:
+        """
+        Fold another sketch of the same k into this one.
+
+        Args:
+            other: Sketch built on another partition
+        """
+        if other.k != self.k:
+            raise ValueError("Only sketches with the same k can be merged")
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate((self.levels[level], items))
+        self.n += other.n
+        self._compress()
+
+    def quantile(self, q: Union[float, List[float]]) -> Union[float, np.ndarray]:
+        """
+        Estimate one or more quantiles.
+
+        Args:
+            q: Quantile or list of quantiles in [0, 1]
+
+        Returns:
+            Union[float, np.ndarray]: Estimated value(s)
+        """
+        if self.n == 0:
+            raise ValueError("Cannot compute quantiles of an empty sketch")
+        items = np.concatenate(self.levels)
+        weights = np.concatenate(
+            [np.full(len(level), 2.0**i) for i, level in enumerate(self.levels)]
+        )
+        order = np.argsort(items, kind="stable")
+        cumulative = weights[order].cumsum()
+        positions = np.searchsorted(cumulative, np.asarray(q) * cumulative[-1], side="left")
+        result = items[order][np.minimum(positions, len(items) - 1)]
+        return result if np.ndim(q) else float(result)
+
+    def to_dict(self) -> dict:
+        """
+        Serialize the sketch to a JSON-compatible dictionary.
+
+        Returns:
+            dict: Serialized sketch
+        """
+        return {"k": self.k, "n": self.n, "levels": [level.tolist() for level in self.levels]}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "KLLSketch":
+        """
+        Rebuild a sketch serialized with to_dict.
+
+        Args:
+            state: Serialized sketch
+
+        Returns:
+            KLLSketch: The restored sketch
+        """
+        sketch = cls(k=state["k"])
+        sketch.n = state["n"]
+        sketch.levels = [np.asarray(level, dtype=float) for level in state["levels"]]
+        return sketch
+
+
+class CountMinSketch:
+    """
+    Count-Min frequency sketch with heavy-hitter tracking (Cormode and Muthukrishnan, 2005).
+
+    Frequency estimates never undercount; with probability at least
+    1 - exp(-depth) they overcount by at most e / width times the total number
+    of values seen. The most frequent values are tracked as candidates, so the
+    mode of a stream can be estimated in O(width * depth) memory.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 5, heavy_hitters: int = 32):
+        """
+        Initialize the sketch.
+
+        Args:
+            width: Number of counters per row
+            depth: Number of hash rows
+            heavy_hitters: Number of most frequent candidate values to track
+        """
+        self.width = width
+        self.depth = depth
+        self.heavy_hitters = heavy_hitters
+        self.n = 0
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self._candidates: list = []
+
+    def _columns(self, values) -> np.ndarray:
+        # Double hashing derives every row's index from one 64-bit hash
+        hashes = _hash_values(values)
+        low = hashes & np.uint64(0xFFFFFFFF)
+        high = (hashes >> np.uint64(32)) | np.uint64(1)
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+        return ((low + rows * high) % np.uint64(self.width)).astype(np.intp)
+
+    def estimate(self, values) -> np.ndarray:
+        """
+        Estimate the frequency of values.
+
+        Args:
+            values: Array-like of values to look up
+
+        Returns:
+            np.ndarray: Estimated counts
+        """
+        if len(values) == 0:
+            return np.zeros(0, dtype=np.int64)
+        columns = self._columns(values)
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    def _track(self, candidates: list) -> None:
+        candidates = pd.unique(pd.Series(self._candidates + candidates, dtype=object))
+        estimates = self.estimate(candidates)
+        top = np.argsort(-estimates, kind="stable")[: self.heavy_hitters]
+        self._candidates = list(candidates[top])
+
+    def update(self, values) -> None:
+        """
+        Add values to the sketch.
+
+        Args:
+            values: Array-like of values; missing values are ignored
+        """
+        counts = _valid_values(values).value_counts()
+        if counts.empty:
+            return
+        self.n += int(counts.sum())
+        columns = self._columns(counts.index)
+        for row in range(self.depth):
+            np.add.at(self.table[row], columns[row], counts.to_numpy())
+        self._track(counts.index[: self.heavy_hitters].tolist())
+
+    def merge(self, other: "CountMinSketch") -> None:
+        """
+        Fold another sketch of the same shape into this one.
+
+        Args:
+            other: Sketch built on another partition
+        """
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Only sketches with the same width and depth can be merged")
+        self.table += other.table
+        self.n += other.n
+        self._track(list(other._candidates))
+
+    def most_common(self) -> pd.Series:
+        """
+        Get the tracked heavy hitters.
+
+        Returns:
+            pd.Series: Estimated counts indexed by value, most frequent first
+        """
+        counts = pd.Series(self.estimate(self._candidates), index=self._candidates)
+        return counts.sort_values(ascending=False, kind="stable")
+
+    def mode(self):
+        """
+        Estimate the most frequent value.
+
+        Returns:
+            The tracked value with the highest estimated count
+        """
+        if self.n == 0:
+            raise ValueError("Cannot compute the mode of an empty sketch")
+        return self.most_common().index[0]
+
+    def to_dict(self) -> dict:
+        """
+        Serialize the sketch to a JSON-compatible dictionary.
+
+        Returns:
+            dict: Serialized sketch
+        """
+        return {
+            "width": self.width,
+            "depth": self.depth,
+            "heavy_hitters": self.heavy_hitters,
+            "n": self.n,
+            "table": self.table.tolist(),
+            "candidates": pd.Series(self._candidates, dtype=object).tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "CountMinSketch":
+        """
+        Rebuild a sketch serialized with to_dict.
+
+        Args:
+            state: Serialized sketch
+
+        Returns:
+            CountMinSketch: The restored sketch
+        """
+        sketch = cls(state["width"], state["depth"], state["heavy_hitters"])
+        sketch.n = state["n"]
+        sketch.table = np.asarray(state["table"], dtype=np.int64)
+        sketch._candidates = list(state["candidates"])
+        return sketch
+
+
+class HyperLogLog:
+    """
+    Mergeable distinct-count sketch (Flajolet et al., 2007).
+
+    Uses 2**precision one-byte registers; the relative standard error of the
+    estimate is about 1.04 / sqrt(2**precision), i.e. 0.8% for the default
+    precision of 14.
+    """
+
+    def __init__(self, precision: int = 14):
+        """
+        Initialize the sketch.
+
+        Args:
+            precision: Number of hash bits used to select a register (4 to 18)
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = np.zeros(2**precision, dtype=np.uint8)
+
+    def update(self, values) -> None:
+        """
+        Add values to the sketch.
+
+        Args:
+            values: Array-like of values; missing values are ignored
+        """
+        values = _valid_values(values)
+        if values.empty:
+            return
+        hashes = _hash_values(values)
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.intp)
+        rest = hashes << np.uint64(self.precision)
+        # Bit length of the remaining bits, computed exactly on 32-bit halves
+        high = np.frexp((rest >> np.uint64(32)).astype(np.float64))[1]
+        low = np.frexp((rest & np.uint64(0xFFFFFFFF)).astype(np.float64))[1]
+        bit_length = np.where(high > 0, 32 + high, low)
+        rank = np.minimum(64 - bit_length + 1, 64 - self.precision + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """
+        Fold another sketch of the same precision into this one.
+
+        Args:
+            other: Sketch built on another partition
+        """
+        if other.precision != self.precision:
+            raise ValueError("Only sketches with the same precision can be merged")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self) -> float:
+        """
+        Estimate the number of distinct values seen.
+
+        Returns:
+            float: Estimated distinct count
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m**2 / np.sum(2.0 ** -self.registers.astype(float))
+        zeros = np.count_nonzero(self.registers == 0)
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            return float(m * np.log(m / zeros))
+        return float(estimate)
+
+    def to_dict(self) -> dict:
+        """
+        Serialize the sketch to a JSON-compatible dictionary.
+
+        Returns:
+            dict: Serialized sketch
+        """
+        return {"precision": self.precision, "registers": self.registers.tolist()}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "HyperLogLog":
+        """
+        Rebuild a sketch serialized with to_dict.
+
+        Args:
+            state: Serialized sketch
+
+        Returns:
+            HyperLogLog: The restored sketch
+        """
+        sketch = cls(state["precision"])
+        sketch.registers = np.asarray(state["registers"], dtype=np.uint8)
+        return sketch
+
+
+def _median_from_counts(counts: pd.Series) -> float:
+    """Exact median of the values summarized by a value -> frequency Series."""
+    if counts.empty:
+        return np.nan
+    counts = counts.sort_index()
+    cumulative = counts.to_numpy().cumsum()
+    total = cumulative[-1]
+    values = counts.index.to_numpy()
+    lower = values[np.searchsorted(cumulative, (total - 1) // 2, side="right")]
+    upper = values[np.searchsorted(cumulative, total // 2, side="right")]
+    return (lower + upper) / 2
+
+
+class _ColumnSummary:
+    """Mergeable single-pass state behind describe_column for one column."""
+
+    def __init__(self, approximate: bool = False):
+        self.approximate = approximate
+        self.moments = _Moments(1)
+        self.counts = pd.Series(dtype=float)
+        self.quantiles, self.frequencies = KLLSketch(), CountMinSketch()
+
+    def update(self, series: pd.Series) -> None:
+        """Add the values of a chunk of the column."""
+        self.moments.merge(_Moments.from_array(series.to_numpy(dtype=float)[:, None]))
+        if self.approximate:
+            self.quantiles.update(series)
+            self.frequencies.update(series)
+        else:
+            self.counts = self.counts.add(series.value_counts(), fill_value=0)
+
+    def result(self) -> dict:
+        """Return the describe_column measures."""
+        summary = {key: value[0] for key, value in self.moments.summary().items()}
+        if self.approximate and self.moments.n[0] == 0:
+            median = mode = np.nan
+        elif self.approximate:
+            median, mode = self.quantiles.quantile(0.5), self.frequencies.mode()
+        else:
+            counts = self.counts
+            median, mode = _median_from_counts(counts), counts[counts == counts.max()].index.min()
+        return {
+            "mean": summary["mean"],
+            "median": median,
+            "mode": mode,
+            "std": summary["std"],
+            "variance": summary["variance"],
+            "skewness": summary["skewness"],
+            "kurtosis": summary["kurtosis"],
+        }
+
+
+def _describe_chunks(chunks: Iterable[pd.DataFrame], column: str, approximate: bool) -> dict:
+    """Single-pass describe_column over an iterable of DataFrame chunks."""
+    summary = _ColumnSummary(approximate)
+    for chunk in chunks:
+        summary.update(chunk[column])
+    return summary.result()
+
+
+@instrument
+@memoize(lambda args: args["data"][[args["column"]]])
+def describe_column(
+    data: Union[pd.DataFrame, Iterable[pd.DataFrame]], column: str, approximate: bool = False
+) -> dict:
     """
     Calculate basic statistical measures for a column.
 
     Args:
-        data: Input DataFrame
+        data: Input DataFrame, or an iterable of DataFrame chunks such as the
+            result of read_csv(..., stream=True). Chunked input is summarized in
+            a single pass keeping only the column's value counts in memory.
         column: Name of the column to analyze
+        approximate: For chunked input, estimate the median and mode with
+            KLLSketch and CountMinSketch instead of exact value counts, so memory
+            stays bounded however many distinct values the column has
 
     Returns:
         dict: Dictionary containing statistical measures
     """
+    if _is_chunked(data):
+        return _describe_chunks(data, column, approximate)
+
     series = data[column]
     return {
         "mean": series.mean(),
@@ -32,20 +555,314 @@ def describe_column(data: pd.DataFrame, column: str) -> dict:
     }
 
 
-def correlation_analysis(data: pd.DataFrame, method: str = "pearson") -> pd.DataFrame:
+@instrument
+def describe_frame(data: pd.DataFrame, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Calculate the describe_column measures for many columns at once.
+
+    All columns are processed together as one 2-D NumPy block: the moments come
+    from a single vectorized pass, and the median and mode from one sort per
+    column.
+
+    Args:
+        data: Input DataFrame
+        columns: Columns to analyze (if None, use all numerical columns)
+
+    Returns:
+        pd.DataFrame: One row per column with count, mean, median, mode, std,
+        variance, skewness and kurtosis
+    """
+    if columns is None:
+        columns = list(data.select_dtypes(include=[np.number]).columns)
+    values = data[columns].to_numpy(dtype=float)
+    moments = _Moments.from_array(values)
+
+    median = np.full(len(columns), np.nan)
+    mode = np.full(len(columns), np.nan)
+    n = moments.n.astype(int)
+    # NaNs sort to the end, so each column's valid values are its first n rows
+    ordered = np.sort(values, axis=0)
+    for j, count in enumerate(n):
+        if count == 0:
+            continue
+        column = ordered[:count, j]
+        median[j] = (column[(count - 1) // 2] + column[count // 2]) / 2
+        # Runs of equal values; argmax picks the first, i.e. smallest, most frequent value
+        bounds = np.concatenate(([0], np.flatnonzero(column[1:] != column[:-1]) + 1, [count]))
+        mode[j] = column[bounds[np.diff(bounds).argmax()]]
+
+    summary = moments.summary()
+    return pd.DataFrame(
+        {
+            "count": n,
+            "mean": summary["mean"],
+            "median": median,
+            "mode": mode,
+            "std": summary["std"],
+            "variance": summary["variance"],
+            "skewness": summary["skewness"],
+            "kurtosis": summary["kurtosis"],
+        },
+        index=pd.Index(columns),
+    )
+
+
+class _CorrelationSums:
+    """Pairwise-complete sums behind the single-pass chunked Pearson correlation."""
+
+    def __init__(self, columns: Optional[List[str]] = None):
+        self.columns = pd.Index(columns) if columns is not None else None
+        self.n: Optional[np.ndarray] = None
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Add a chunk; without explicit columns, its numerical columns are used."""
+        if self.columns is None:
+            self.columns = chunk.select_dtypes(include=[np.number]).columns
+        if self.n is None:
+            k = len(self.columns)
+            # Shifting by the first chunk's means keeps the raw sums well conditioned
+            self.shift = chunk[self.columns].mean().fillna(0).to_numpy(dtype=float)
+            self.n = np.zeros((k, k))
+            self.sx = np.zeros((k, k))
+            self.sxx = np.zeros((k, k))
+            self.sxy = np.zeros((k, k))
+        values = chunk[self.columns].to_numpy(dtype=float)
+        valid = (~np.isnan(values)).astype(float)
+        centered = np.where(valid > 0, values - self.shift, 0.0)
+        self.n += valid.T @ valid
+        self.sx += centered.T @ valid
+        self.sxx += (centered**2).T @ valid
+        self.sxy += centered.T @ centered
+
+    def result(self) -> pd.DataFrame:
+        """Return the correlation matrix."""
+        if self.n is None:
+            return pd.DataFrame()
+        n, sx = self.n, self.sx
+        with np.errstate(invalid="ignore", divide="ignore"):
+            covariance = n * self.sxy - sx * sx.T
+            variance_x = n * self.sxx - sx**2
+            variance_y = variance_x.T
+            corr = covariance / np.sqrt(variance_x * variance_y)
+        corr[n < 2] = np.nan
+        return pd.DataFrame(np.clip(corr, -1, 1), index=self.columns, columns=self.columns)
+
+
+def _correlate_chunks(chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """Single-pass pairwise-complete Pearson correlation over DataFrame chunks."""
+    sums = _CorrelationSums()
+    for chunk in chunks:
+        sums.update(chunk)
+    return sums.result()
+
+
+@instrument
+@memoize(lambda args: args["data"].select_dtypes(include=[np.number]))
+def correlation_analysis(
+    data: Union[pd.DataFrame, Iterable[pd.DataFrame]], method: str = "pearson"
+) -> pd.DataFrame:
     """
     Calculate correlation matrix for numerical columns.
 
+    Args:
+        data: Input DataFrame, or an iterable of DataFrame chunks such as the
+            result of read_csv(..., stream=True) (Pearson only)
+        method: Correlation method ("pearson", "spearman", or "kendall")
+
+    Returns:
+        pd.DataFrame: Correlation matrix
+    """
+    if _is_chunked(data):
+        if method != "pearson":
+            raise ValueError("Only the 'pearson' method is supported for chunked input")
+        return _correlate_chunks(data)
+
+    return correlation_matrix(data, method=method)
+
+
+DEFAULT_BLOCK_SIZE = 256
+
+_kendall_values: Optional[np.ndarray] = None
+
+
+def _init_kendall_worker(values: np.ndarray) -> None:
+    """Process pool initializer: receive the data matrix once per worker."""
+    global _kendall_values
+    _kendall_values = values
+
+
+def _kendall_pairs(pairs: List[Tuple[int, int]], values: Optional[np.ndarray] = None) -> list:
+    """Kendall's tau-b for column pairs, using scipy's O(n log n) algorithm."""
+    from scipy import stats
+
+    values = _kendall_values if values is None else values
+    taus = []
+    for i, j in pairs:
+        x, y = values[:, i], values[:, j]
+        both = ~(np.isnan(x) | np.isnan(y))
+        taus.append(stats.kendalltau(x[both], y[both]).statistic if both.sum() > 1 else np.nan)
+    return taus
+
+
+def _kendall(values: np.ndarray, pairs: List[Tuple[int, int]], n_jobs: int) -> list:
+    """Kendall's tau for the given column pairs, split across n_jobs processes."""
+    if n_jobs <= 1 or len(pairs) < 2:
+        return _kendall_pairs(pairs, values)
+    batches = [list(batch) for batch in np.array_split(np.array(pairs), n_jobs * 4) if len(batch)]
+    with ProcessPoolExecutor(
+        max_workers=n_jobs, initializer=_init_kendall_worker, initargs=(values,)
+    ) as executor:
+        results = executor.map(_kendall_pairs, [[tuple(p) for p in b] for b in batches])
+        return [tau for batch in results for tau in batch]
+
+
+def _standardize(values: np.ndarray, method: str) -> np.ndarray:
+    """Scale columns so that Pearson correlation is a plain matrix product."""
+    if method == "spearman":
+        # Rank every column once; Spearman is then Pearson on the ranks
+        from scipy import stats
+
+        values = stats.rankdata(values, axis=0)
+    centered = values - values.mean(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return centered / np.sqrt((centered**2).sum(axis=0))
+
+
+def _correlation_blocks(standardized: np.ndarray, block_size: int):
+    """Yield (row offset, column offset, block) for the upper triangle of the matrix."""
+    k = standardized.shape[1]
+    for i in range(0, k, block_size):
+        left = standardized[:, i : i + block_size]
+        for j in range(i, k, block_size):
+            block = left.T @ standardized[:, j : j + block_size]
+            yield i, j, np.clip(block, -1, 1)
+
+
+def _numeric_values(data: pd.DataFrame) -> Tuple[pd.Index, np.ndarray]:
+    numeric = data.select_dtypes(include=[np.number])
+    return numeric.columns, numeric.to_numpy(dtype=float)
+
+
+@instrument
+def correlation_matrix(
+    data: pd.DataFrame,
+    method: str = "pearson",
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    n_jobs: int = 1,
+) -> pd.DataFrame:
+    """
+    Calculate the correlation matrix of numerical columns with a fast engine.
+
+    Pearson is computed as a blocked product of the standardized data matrix,
+    and Spearman as Pearson on columns ranked once. Kendall's tau-b uses an
+    O(n log n) algorithm per column pair, optionally spread over processes.
+    Pearson and Spearman fall back to pandas for data with missing values, to
+    keep its pairwise-complete semantics.
+
     Args:
         data: Input DataFrame
         method: Correlation method ("pearson", "spearman", or "kendall")
+        block_size: Number of columns per block of the matrix product
+        n_jobs: Number of processes for Kendall's tau
 
     Returns:
         pd.DataFrame: Correlation matrix
     """
-    return data.select_dtypes(include=[np.number]).corr(method=method)
+    if method not in ("pearson", "spearman", "kendall"):
+        raise ValueError("Method must be 'pearson', 'spearman' or 'kendall'")
+    columns, values = _numeric_values(data)
+    k = len(columns)
+    corr = np.full((k, k), np.nan)
+
+    if method == "kendall":
+        pairs = [(i, j) for i in range(k) for j in range(i + 1, k)]
+        for (i, j), tau in zip(pairs, _kendall(values, pairs, n_jobs)):
+            corr[i, j] = corr[j, i] = tau
+    elif np.isnan(values).any():
+        return data[columns].corr(method=method)
+    else:
+        for i, j, block in _correlation_blocks(_standardize(values, method), block_size):
+            corr[i : i + block.shape[0], j : j + block.shape[1]] = block
+            corr[j : j + block.shape[1], i : i + block.shape[0]] = block.T
+
+    # Match pandas: Pearson and Spearman leave constant columns undefined, while
+    # Kendall treats any column with values as perfectly self-correlated
+    if method == "kendall":
+        defined = ~np.isnan(values).all(axis=0)
+    else:
+        defined = np.nanmax(values, axis=0, initial=-np.inf) > np.nanmin(
+            values, axis=0, initial=np.inf
+        )
+    corr[np.diag_indices(k)] = np.where(defined, 1.0, np.nan)
+    return pd.DataFrame(corr, index=columns, columns=columns)
+
+
+@instrument
+def top_correlations(
+    data: pd.DataFrame,
+    k: int = 10,
+    threshold: float = 0.0,
+    method: str = "pearson",
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    n_jobs: int = 1,
+) -> pd.DataFrame:
+    """
+    Find the most strongly correlated pairs of numerical columns.
+
+    The correlation matrix is scanned block by block and only the best pairs
+    are kept, so the full matrix is never materialized for Pearson and Spearman.
+
+    Args:
+        data: Input DataFrame (Pearson and Spearman require no missing values)
+        k: Maximum number of pairs to return
+        threshold: Minimum absolute correlation of a returned pair
+        method: Correlation method ("pearson", "spearman", or "kendall")
+        block_size: Number of columns per block of the matrix product
+        n_jobs: Number of processes for Kendall's tau
+
+    Returns:
+        pd.DataFrame: Columns "column1", "column2" and "correlation", sorted by
+        decreasing absolute correlation
+    """
+    if method not in ("pearson", "spearman", "kendall"):
+        raise ValueError("Method must be 'pearson', 'spearman' or 'kendall'")
+    columns, values = _numeric_values(data)
+    rows, cols, scores = [], [], []
+
+    def keep(i: np.ndarray, j: np.ndarray, r: np.ndarray) -> None:
+        selected = np.abs(r) >= threshold
+        rows.append(i[selected])
+        cols.append(j[selected])
+        scores.append(r[selected])
+        if sum(len(s) for s in scores) > 2 * k:
+            # Prune the running candidates back to the best k
+            i, j, r = (np.concatenate(a) for a in (rows, cols, scores))
+            best = np.argsort(-np.abs(r), kind="stable")[:k]
+            rows[:], cols[:], scores[:] = [i[best]], [j[best]], [r[best]]
+
+    if method == "kendall":
+        pairs = [(i, j) for i in range(len(columns)) for j in range(i + 1, len(columns))]
+        taus = np.array(_kendall(values, pairs, n_jobs), dtype=float)
+        pair_index = np.array(pairs, dtype=int).reshape(-1, 2)
+        keep(pair_index[:, 0], pair_index[:, 1], taus)
+    else:
+        if np.isnan(values).any():
+            raise ValueError("top_correlations requires data without missing values")
+        for i, j, block in _correlation_blocks(_standardize(values, method), block_size):
+            bi, bj = np.indices(block.shape).reshape(2, -1)
+            upper = bi + i < bj + j
+            keep(bi[upper] + i, bj[upper] + j, block[bi[upper], bj[upper]])
 
+    i, j, r = (np.concatenate(a) for a in (rows, cols, scores))
+    valid = ~np.isnan(r)
+    i, j, r = i[valid], j[valid], r[valid]
+    best = np.argsort(-np.abs(r), kind="stable")[:k]
+    return pd.DataFrame(
+        {"column1": columns[i[best]], "column2": columns[j[best]], "correlation": r[best]}
+    )
 
+
+@instrument
 def ttest_columns(data: pd.DataFrame, col1: str, col2: str) -> Tuple[float, float]:
     """
     Perform Student's t-test between two columns.
@@ -58,5 +875,151 @@ def ttest_columns(data: pd.DataFrame, col1: str, col2: str) -> Tuple[float, floa
     Returns:
         Tuple[float, float]: t-statistic and p-value
     """
+    from scipy import stats
+
     t_stat, p_value = stats.ttest_ind(data[col1], data[col2])
     return t_stat, p_value
+
+
+def _adjust_pvalues(p_values: np.ndarray, correction: str) -> np.ndarray:
+    """Apply a multiple-testing correction, ignoring NaN p-values."""
+    adjusted = np.full(p_values.shape, np.nan)
+    valid = ~np.isnan(p_values)
+    p = p_values[valid]
+    m = len(p)
+    if correction == "bonferroni":
+        adjusted[valid] = np.minimum(p * m, 1.0)
+    elif correction == "fdr_bh":
+        # Benjamini-Hochberg step-up: running minimum from the largest p-value down
+        order = np.argsort(p)
+        scaled = p[order] * m / np.arange(1, m + 1)
+        stepped = np.minimum.accumulate(scaled[::-1])[::-1]
+        result = np.empty(m)
+        result[order] = np.minimum(stepped, 1.0)
+        adjusted[valid] = result
+    else:
+        raise ValueError("Correction must be either 'bonferroni' or 'fdr_bh'")
+    return adjusted
+
+
+@instrument
+def ttest_from_stats(
+    mean1: Union[float, np.ndarray],
+    var1: Union[float, np.ndarray],
+    n1: Union[int, np.ndarray],
+    mean2: Union[float, np.ndarray],
+    var2: Union[float, np.ndarray],
+    n2: Union[int, np.ndarray],
+    equal_var: bool = True,
+    correction: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Perform many two-sample t-tests from summary statistics.
+
+    All tests are computed together with vectorized NumPy operations, so only
+    the per-sample means, variances (ddof=1) and counts are needed.
+
+    Args:
+        mean1: Means of the first samples
+        var1: Variances of the first samples
+        n1: Sizes of the first samples
+        mean2: Means of the second samples
+        var2: Variances of the second samples
+        n2: Sizes of the second samples
+        equal_var: If True, perform Student's t-test; otherwise Welch's t-test
+        correction: Optional multiple-testing correction of the p-values
+            ("bonferroni" or "fdr_bh")
+
+    Returns:
+        pd.DataFrame: One row per test with t_stat, df and p_value columns, plus
+        p_adjusted if a correction is requested
+    """
+    mean1, var1, n1, mean2, var2, n2 = np.broadcast_arrays(
+        *(
+            np.atleast_1d(np.asarray(value, dtype=float))
+            for value in (mean1, var1, n1, mean2, var2, n2)
+        )
+    )
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if equal_var:
+            dof = n1 + n2 - 2
+            pooled = ((n1 - 1) * var1 + (n2 - 1) * var2) / dof
+            stderr = np.sqrt(pooled * (1 / n1 + 1 / n2))
+        else:
+            se1, se2 = var1 / n1, var2 / n2
+            stderr = np.sqrt(se1 + se2)
+            dof = (se1 + se2) ** 2 / (se1**2 / (n1 - 1) + se2**2 / (n2 - 1))
+        t_stat = (mean1 - mean2) / stderr
+    from scipy import stats
+
+    p_value = 2 * stats.t.sf(np.abs(t_stat), dof)
+
+    result = pd.DataFrame({"t_stat": t_stat, "df": dof, "p_value": p_value})
+    if correction is not None:
+        result["p_adjusted"] = _adjust_pvalues(p_value, correction)
+    return result
+
+
+@instrument
+def ttest_many(
+    data: pd.DataFrame,
+    pairs: Optional[List[Tuple[str, str]]] = None,
+    group_column: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    equal_var: bool = True,
+    correction: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Perform many t-tests at once, between column pairs or between two groups.
+
+    The means and variances of every column involved are computed once, and the
+    tests are then evaluated together with ttest_from_stats. Missing values are
+    ignored.
+
+    Args:
+        data: Input DataFrame
+        pairs: Column pairs to compare, as with ttest_columns
+        group_column: Alternatively, a column splitting the rows into exactly two
+            groups; each of the columns is then compared between the first and
+            second group in sorted order
+        columns: Columns to compare between groups (if None, use all numerical
+            columns other than group_column)
+        equal_var: If True, perform Student's t-test; otherwise Welch's t-test
+        correction: Optional multiple-testing correction of the p-values
+            ("bonferroni" or "fdr_bh")
+
+    Returns:
+        pd.DataFrame: One row per test, indexed by column pair or column name
+    """
+    if (pairs is None) == (group_column is None):
+        raise ValueError("Exactly one of pairs and group_column must be given")
+
+    if pairs is not None:
+        first, second = [list(side) for side in zip(*pairs)] if pairs else ([], [])
+        involved = list(dict.fromkeys(first + second))
+        summary = data[involved].agg(["mean", "var", "count"])
+        first_stats, second_stats = summary[first], summary[second]
+        index = pd.MultiIndex.from_tuples(pairs, names=["column1", "column2"])
+    else:
+        if columns is None:
+            numeric = data.select_dtypes(include=[np.number]).columns
+            columns = [column for column in numeric if column != group_column]
+        summary = data.groupby(group_column)[columns].agg(["mean", "var", "count"])
+        if len(summary) != 2:
+            raise ValueError("group_column must split the data into exactly two groups")
+        first_stats = summary.iloc[0].unstack().T
+        second_stats = summary.iloc[1].unstack().T
+        index = pd.Index(columns)
+
+    result = ttest_from_stats(
+        first_stats.loc["mean"].to_numpy(),
+        first_stats.loc["var"].to_numpy(),
+        first_stats.loc["count"].to_numpy(),
+        second_stats.loc["mean"].to_numpy(),
+        second_stats.loc["var"].to_numpy(),
+        second_stats.loc["count"].to_numpy(),
+        equal_var=equal_var,
+        correction=correction,
+    )
+    result.index = index
+    return result
@@ -2,97 +2,394 @@
 Visualization module providing plotting and charting capabilities.
 """
 
-import matplotlib
+import os
+import time
+from multiprocessing import Pool
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, Union
 
-matplotlib.use("Agg")  # Use non-interactive backend
-from typing import Any, Dict, List, Optional, Tuple, Union
-
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-import seaborn as sns
 
+from .data_manipulation import _is_chunked
+from .instrumentation import instrument
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+    from matplotlib.figure import Figure
+
+
+def _new_figure(figsize: Tuple[int, int]) -> Tuple["Figure", "Axes"]:
+    """
+    Create a standalone figure with one axes.
+
+    matplotlib is imported here rather than at module import time, and the
+    figure is not registered with pyplot, so it is freed with its last reference.
+    """
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    return fig, fig.subplots()
+
+
+class HistogramAccumulator:
+    """
+    Histogram whose counts are updated incrementally from chunks or partitions.
+
+    With a fixed range the bin edges never change and values outside it are
+    only counted in n_outside. Without one the range is taken from the first
+    values and grows as needed by doubling the bin width (merging neighbouring
+    bins), so the number of bins stays fixed and the counts stay exact.
+    Accumulators built on separate partitions can be merged and serialized, so
+    a plot can be redrawn from aggregated state without rescanning the data.
+    """
+
+    def __init__(
+        self,
+        bins: int = 30,
+        range: Optional[Tuple[float, float]] = None,
+        edges: Optional[Union[List[float], np.ndarray]] = None,
+    ):
+        """
+        Initialize an empty histogram.
+
+        Args:
+            bins: Number of bins (must be even for an adaptive range)
+            range: Fixed (low, high) range of equal-width bins; if neither range
+                nor edges is given, the range adapts to the data
+            edges: Fixed, possibly unequal, bin edges (overrides bins and range)
+        """
+        if edges is not None:
+            self.edges: Optional[np.ndarray] = np.asarray(edges, dtype=float)
+        elif range is not None:
+            self.edges = np.linspace(range[0], range[1], bins + 1)
+        else:
+            if bins % 2:
+                raise ValueError("An adaptive histogram needs an even number of bins")
+            self.edges = None
+        self.bins = bins if self.edges is None else len(self.edges) - 1
+        self.adaptive = self.edges is None
+        self.counts = np.zeros(self.bins, dtype=np.int64)
+        self.n_outside = 0
+        # Values on the closed right edge, counted in the last bin; once the
+        # range grows past that edge they belong to the bin starting there
+        self.n_right_edge = 0
 
+    @property
+    def total(self) -> int:
+        """Number of values counted in the bins."""
+        return int(self.counts.sum())
+
+    def _grow(self, low: float, high: float) -> None:
+        """Double the bin width of an adaptive histogram until it covers [low, high]."""
+        if self.edges is None:
+            if high == low:
+                low, high = low - 0.5, high + 0.5
+            self.edges = np.linspace(low, high, self.bins + 1)
+            return
+        edges = self.edges
+        while low < edges[0] or high > edges[-1]:
+            start, width = edges[0], (edges[-1] - edges[0]) / self.bins
+            # Doubling the width adds bins old-width slots; put an even number j of
+            # them on the left so old bin pairs fall into one new bin, keeping the
+            # old range as central as the new values allow
+            left = max(0, int(np.ceil((start - low) / width)))
+            right = max(0, int(np.ceil((high - start) / width)) - self.bins)
+            centre = left + (self.bins - left - right) // 2
+            candidates = [j for j in (centre, centre - 1, centre + 1) if j % 2 == 0]
+            fitting = [j for j in candidates if left <= j <= self.bins - right]
+            shift = fitting[0] if fitting else self.bins // 2 - self.bins // 2 % 2
+            # Every other old edge is kept as is, so values on it stay in the same bin
+            kept = edges[0::2]
+            first = shift // 2
+            edges = np.empty(self.bins + 1)
+            edges[first : first + len(kept)] = kept
+            edges[:first] = kept[0] - 2 * width * np.arange(first, 0, -1)
+            edges[first + len(kept) :] = kept[-1] + 2 * width * np.arange(
+                1, self.bins + 2 - first - len(kept)
+            )
+            merged = self.counts[0::2] + self.counts[1::2]
+            self.counts = np.zeros(self.bins, dtype=np.int64)
+            self.counts[first : first + len(merged)] = merged
+            if shift < self.bins:
+                # The old right edge is now interior: move its values up a bin
+                edge_bin = first + len(merged)
+                self.counts[edge_bin - 1] -= self.n_right_edge
+                self.counts[edge_bin] += self.n_right_edge
+                self.n_right_edge = 0
+        self.edges = edges
+
+    def update(self, values) -> None:
+        """
+        Add values to the histogram.
+
+        Args:
+            values: Array-like of numbers; missing values are ignored
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return
+        if self.adaptive:
+            self._grow(values.min(), values.max())
+        counts, _ = np.histogram(values, bins=self.edges)
+        self.counts += counts
+        self.n_outside += len(values) - int(counts.sum())
+        if self.adaptive:
+            self.n_right_edge += int(np.count_nonzero(values == self.edges[-1]))
+
+    def merge(self, other: "HistogramAccumulator") -> None:
+        """
+        Fold another histogram into this one.
+
+        Histograms with the same edges merge exactly, as do adaptive histograms
+        whose grids line up (e.g. built from the same initial range). Otherwise
+        an adaptive histogram assigns the other histogram's counts by bin centre.
+
+        Args:
+            other: Histogram built on another partition
+        """
+        if other.edges is None:
+            return
+        self.n_outside += other.n_outside
+        if self.edges is not None and np.array_equal(self.edges, other.edges):
+            self.counts += other.counts
+            self.n_right_edge += other.n_right_edge
+            return
+        if not self.adaptive:
+            raise ValueError("Only histograms with the same edges can be merged")
+        self._grow(other.edges[0], other.edges[-1])
+        centres = (other.edges[:-1] + other.edges[1:]) / 2
+        positions = np.clip(
+            np.searchsorted(self.edges, centres, side="right") - 1, 0, self.bins - 1
+        )
+        np.add.at(self.counts, positions, other.counts)
+        edge_bin = np.searchsorted(self.edges, other.edges[-1], side="right") - 1
+        if edge_bin < self.bins:
+            self.counts[positions[-1]] -= other.n_right_edge
+            self.counts[edge_bin] += other.n_right_edge
+        else:
+            self.n_right_edge += other.n_right_edge
+
+    def to_dict(self) -> dict:
+        """
+        Serialize the histogram to a JSON-compatible dictionary.
+
+        Returns:
+            dict: Serialized histogram
+        """
+        return {
+            "bins": self.bins,
+            "adaptive": self.adaptive,
+            "edges": None if self.edges is None else self.edges.tolist(),
+            "counts": self.counts.tolist(),
+            "n_outside": self.n_outside,
+            "n_right_edge": self.n_right_edge,
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "HistogramAccumulator":
+        """
+        Rebuild a histogram serialized with to_dict.
+
+        Args:
+            state: Serialized histogram
+
+        Returns:
+            HistogramAccumulator: The restored histogram
+        """
+        histogram = cls(bins=state["bins"], edges=None if state["adaptive"] else state["edges"])
+        if state["edges"] is not None:
+            histogram.edges = np.asarray(state["edges"], dtype=float)
+        histogram.counts = np.asarray(state["counts"], dtype=np.int64)
+        histogram.n_outside = state["n_outside"]
+        histogram.n_right_edge = state.get("n_right_edge", 0)
+        return histogram
+
+
+@instrument
 def plot_histogram(
-    data: pd.DataFrame,
-    column: str,
+    data: Union[pd.DataFrame, Iterable[pd.DataFrame], HistogramAccumulator],
+    column: Optional[str] = None,
     bins: int = 30,
     title: Optional[str] = None,
     figsize: Tuple[int, int] = (10, 6),
-) -> plt.Figure:
+) -> "Figure":
     """
     Create a histogram for a numerical column.
 
+    Chunked input is accumulated chunk by chunk into an adaptive
+    HistogramAccumulator; an accumulator is drawn from its counts directly.
+
     Args:
-        data: Input DataFrame
-        column: Name of the column to plot
+        data: Input DataFrame, re-iterable DataFrame chunks, or precomputed
+            HistogramAccumulator
+        column: Name of the column to plot (only used as label for an accumulator)
         bins: Number of bins in histogram
         title: Plot title
         figsize: Figure size as (width, height)
 
     Returns:
-        plt.Figure: The generated figure
+        Figure: The generated figure
     """
-    fig, ax = plt.subplots(figsize=figsize)
-    ax.hist(data[column], bins=bins, edgecolor="black")
-    ax.set_xlabel(column)
+    if _is_chunked(data):
+        histogram = HistogramAccumulator(bins=bins + bins % 2)
+        for chunk in data:
+            histogram.update(chunk[column])
+        data = histogram
+
+    fig, ax = _new_figure(figsize)
+    if isinstance(data, HistogramAccumulator):
+        if data.edges is not None:
+            ax.hist(data.edges[:-1], bins=data.edges, weights=data.counts, edgecolor="black")
+    else:
+        ax.hist(data[column], bins=bins, edgecolor="black")
+    label = column or "value"
+    ax.set_xlabel(label)
     ax.set_ylabel("Frequency")
-    ax.set_title(title or f"Histogram of {column}")
+    ax.set_title(title or f"Histogram of {label}")
     return fig
 
 
+def _scatter_sample(
+    x: np.ndarray, y: np.ndarray, max_points: int, bins: int, rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Pick at most about max_points indices that keep outliers and sparse regions.
+
+    Points more than 3 robust standard deviations from the median on either axis
+    are kept first (the most extreme ones if there are too many). The remaining
+    budget is spread over a bins x bins grid, sampling each cell with a
+    probability that gives every non-empty cell at least one point.
+    """
+    scores = np.zeros(len(x))
+    for values in (x, y):
+        median = np.median(values)
+        spread = 1.4826 * np.median(np.abs(values - median)) or np.std(values) or 1.0
+        scores = np.maximum(scores, np.abs(values - median) / spread)
+    outliers = np.flatnonzero(scores > 3)
+    if len(outliers) > max_points // 2:
+        outliers = outliers[np.argpartition(-scores[outliers], max_points // 2)[: max_points // 2]]
+
+    budget = max_points - len(outliers)
+    cells = _grid_cells(x, bins) * bins + _grid_cells(y, bins)
+    counts = np.bincount(cells, minlength=bins * bins)
+    quota = np.maximum(counts * (budget / len(x)), 1)
+    keep = rng.random(len(x)) < quota[cells] / counts[cells]
+    keep[outliers] = True
+    return np.flatnonzero(keep)
+
+
+def _grid_cells(values: np.ndarray, bins: int) -> np.ndarray:
+    """Index of the equal-width bin (out of bins over the value range) of every value."""
+    low, high = values.min(), values.max()
+    scaled = (values - low) * (bins / (high - low)) if high > low else np.zeros(len(values))
+    return np.minimum(scaled.astype(np.intp), bins - 1)
+
+
+@instrument
 def plot_scatter(
     data: pd.DataFrame,
     x_col: str,
     y_col: str,
     title: Optional[str] = None,
     figsize: Tuple[int, int] = (10, 6),
-) -> plt.Figure:
+    mode: str = "points",
+    bins: int = 200,
+    max_points: int = 10000,
+    random_state: Optional[int] = None,
+) -> "Figure":
     """
     Create a scatter plot between two numerical columns.
 
+    For large data, "density" and "sample" render in roughly constant time
+    regardless of the number of rows.
+
     Args:
         data: Input DataFrame
         x_col: Name of the column for x-axis
         y_col: Name of the column for y-axis
         title: Plot title
         figsize: Figure size as (width, height)
+        mode: "points" to draw every row, "density" to draw a 2-D histogram of
+            bins x bins cells as an image, or "sample" to draw at most about
+            max_points rows, stratified over the plane and keeping outliers
+        bins: Number of histogram bins per axis in "density" mode
+        max_points: Maximum number of points drawn in "sample" mode
+        random_state: Random seed for "sample" mode
 
     Returns:
-        plt.Figure: The generated figure
+        Figure: The generated figure
     """
-    fig, ax = plt.subplots(figsize=figsize)
-    ax.scatter(data[x_col], data[y_col], alpha=0.5)
+    if mode not in ("points", "density", "sample"):
+        raise ValueError(f"Unsupported mode: {mode}")
+
+    fig, ax = _new_figure(figsize)
+    if mode == "points":
+        ax.scatter(data[x_col], data[y_col], alpha=0.5)
+    else:
+        x = data[x_col].to_numpy(dtype=float)
+        y = data[y_col].to_numpy(dtype=float)
+        finite = np.isfinite(x) & np.isfinite(y)
+        x, y = x[finite], y[finite]
+        if mode == "density":
+            from matplotlib.colors import LogNorm
+
+            counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins)
+            image = ax.imshow(
+                np.ma.masked_equal(counts.T, 0),
+                origin="lower",
+                extent=(x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]),
+                aspect="auto",
+                norm=LogNorm(),
+                cmap="viridis",
+                interpolation="nearest",
+            )
+            fig.colorbar(image, ax=ax, label="Count")
+        else:
+            if len(x) > max_points:
+                rng = np.random.default_rng(random_state)
+                rows = _scatter_sample(x, y, max_points, int(np.sqrt(max_points)) // 4 or 1, rng)
+                x, y = x[rows], y[rows]
+            ax.scatter(x, y, alpha=0.5)
     ax.set_xlabel(x_col)
     ax.set_ylabel(y_col)
     ax.set_title(title or f"Scatter Plot: {x_col} vs {y_col}")
     return fig
 
 
+@instrument
 def plot_correlation_matrix(
     data: pd.DataFrame, figsize: Tuple[int, int] = (10, 8), cmap: str = "coolwarm"
-) -> plt.Figure:
+) -> "Figure":
     """
     Create a heatmap of correlation matrix.
 
+    The matrix comes from correlation_analysis, so it is reused from the memo
+    when memoization is enabled.
+
     Args:
         data: Input DataFrame
         figsize: Figure size as (width, height)
         cmap: Color map for the heatmap
 
     Returns:
-        plt.Figure: The generated figure
+        Figure: The generated figure
     """
-    corr = data.select_dtypes(include=[np.number]).corr()
-    fig, ax = plt.subplots(figsize=figsize)
+    import seaborn as sns
+
+    from .statistics import correlation_analysis
+
+    corr = correlation_analysis(data)
+    fig, ax = _new_figure(figsize)
     sns.heatmap(corr, annot=True, cmap=cmap, ax=ax)
     ax.set_title("Correlation Matrix")
     return fig
 
 
+@instrument
 def plot_boxplot(
     data: pd.DataFrame, columns: Union[str, List[str]], figsize: Tuple[int, int] = (10, 6)
-) -> plt.Figure:
+) -> "Figure":
     """
     Create box plots for one or more numerical columns.
 
@@ -102,13 +399,99 @@ def plot_boxplot(
         figsize: Figure size as (width, height)
 
     Returns:
-        plt.Figure: The generated figure
+        Figure: The generated figure
     """
     if isinstance(columns, str):
         columns = [columns]
 
-    fig, ax = plt.subplots(figsize=figsize)
+    fig, ax = _new_figure(figsize)
     data[columns].boxplot(ax=ax)
     ax.set_title("Box Plot")
-    plt.xticks(rotation=45)
+    ax.tick_params(axis="x", labelrotation=45)
     return fig
+
+
+PLOT_FUNCTIONS = {
+    "histogram": plot_histogram,
+    "scatter": plot_scatter,
+    "correlation_matrix": plot_correlation_matrix,
+    "boxplot": plot_boxplot,
+}
+
+
+def _render_spec(job: Tuple[int, Dict[str, Any], str, Tuple[str, ...], int]) -> Dict[str, Any]:
+    """Render and save one plot spec, always releasing its figure."""
+    index, spec, output_dir, formats, dpi = job
+    name = spec.get("name", f"figure-{index}")
+    result: Dict[str, Any] = {"name": name, "plot": spec["plot"], "paths": [], "error": None}
+    start = time.perf_counter()
+    fig = None
+    try:
+        data = spec["data"]
+        if isinstance(data, str):
+            data = pd.read_csv(data)
+        fig = PLOT_FUNCTIONS[spec["plot"]](data, **spec.get("params", {}))
+        result["render_seconds"] = time.perf_counter() - start
+        start = time.perf_counter()
+        for fmt in spec.get("formats", formats):
+            path = os.path.join(output_dir, f"{name}.{fmt}")
+            fig.savefig(path, format=fmt, dpi=dpi)
+            result["paths"].append(path)
+        result["save_seconds"] = time.perf_counter() - start
+    except Exception as error:
+        result["error"] = f"{type(error).__name__}: {error}"
+    finally:
+        if fig is not None:
+            fig.clear()
+    return result
+
+
+@instrument
+def render_figures(
+    specs: List[Dict[str, Any]],
+    output_dir: str,
+    formats: Tuple[str, ...] = ("png",),
+    processes: Optional[int] = None,
+    maxtasksperchild: int = 100,
+    dpi: int = 100,
+) -> pd.DataFrame:
+    """
+    Render and save many figures in a process pool.
+
+    Every spec is drawn with one of the plot functions on a standalone Agg
+    figure (never registered with pyplot) and cleared right after saving.
+    Worker processes are replaced after maxtasksperchild figures, so memory
+    stays flat over arbitrarily long runs. A failing spec is reported and does
+    not stop the others.
+
+    Args:
+        specs: Plot specs, each a dict with "plot" (one of "histogram",
+            "scatter", "correlation_matrix", "boxplot"), "data" (a DataFrame, or
+            a CSV path read in the worker), and optionally "params" (keyword
+            arguments of the plot function), "name" (file name without
+            extension) and "formats"
+        output_dir: Directory to save the figures to
+        formats: File formats to save every figure in (e.g. "png", "svg")
+        processes: Number of worker processes (defaults to the CPU count; 1
+            renders in the current process)
+        maxtasksperchild: Number of figures a worker renders before it is replaced
+        dpi: Resolution of raster formats
+
+    Returns:
+        pd.DataFrame: One row per spec, in order, with "name", "plot", "paths",
+        "render_seconds", "save_seconds" and "error" (missing on success)
+    """
+    unknown = {spec["plot"] for spec in specs} - set(PLOT_FUNCTIONS)
+    if unknown:
+        raise ValueError(f"Unsupported plot types: {sorted(unknown)}")
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = [(index, spec, output_dir, tuple(formats), dpi) for index, spec in enumerate(specs)]
+
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        results = [_render_spec(job) for job in jobs]
+    else:
+        with Pool(processes, maxtasksperchild=maxtasksperchild) as pool:
+            results = pool.map(_render_spec, jobs, chunksize=1)
+    columns = ["name", "plot", "paths", "render_seconds", "save_seconds", "error"]
+    return pd.DataFrame(results, columns=columns)
@@ -6,7 +6,14 @@ import numpy as np
 import pandas as pd
 import pytest
 
-from datalib.data_manipulation import normalize_column
+from datalib.data_manipulation import (
+    CSVChunks,
+    Normalizer,
+    compact_frame,
+    normalize_column,
+    read_csv,
+    read_csv_many,
+)
 
 
 def test_normalize_column_minmax():
@@ -37,3 +44,170 @@ def test_normalize_column_invalid_method():
     df = pd.DataFrame({"A": [1, 2, 3]})
     with pytest.raises(ValueError):
         normalize_column(df, "A", method="invalid")
+
+
+def test_read_csv_stream(tmp_path):
+    """Test streaming read with a memory budget"""
+    path = tmp_path / "data.csv"
+    pd.DataFrame({"A": np.arange(1000), "B": np.arange(1000) * 2.0}).to_csv(path, index=False)
+
+    chunks = read_csv(path, stream=True, memory_budget=1024)
+    assert isinstance(chunks, CSVChunks)
+
+    sizes = [len(chunk) for chunk in chunks]
+    assert max(sizes) < 1000
+    assert sum(sizes) == 1000
+
+    # The reader can be iterated more than once
+    assert pd.concat(chunks, ignore_index=True).equals(read_csv(path))
+
+
+def test_normalize_column_stream(tmp_path):
+    """Test normalization of streamed chunks matches the in-memory result"""
+    path = tmp_path / "data.csv"
+    df = pd.DataFrame({"A": np.random.default_rng(0).normal(5, 2, 500)})
+    df.to_csv(path, index=False)
+
+    for method in ["minmax", "zscore"]:
+        chunks = read_csv(path, stream=True, chunksize=64)
+        result = pd.concat(normalize_column(chunks, "A", method=method), ignore_index=True)
+        expected = normalize_column(read_csv(path), "A", method=method)
+        np.testing.assert_allclose(result["A"], expected["A"])
+
+    # Chunks passed in by the caller are left unchanged
+    chunks = [df.iloc[:250], df.iloc[250:]]
+    result = pd.concat(normalize_column(chunks, "A"), ignore_index=True)
+    np.testing.assert_allclose(result["A"], normalize_column(df, "A")["A"])
+    pd.testing.assert_frame_equal(pd.concat(chunks), df)
+
+    with pytest.raises(ValueError):
+        normalize_column(iter([df]), "A")
+
+
+def test_read_csv_cache(tmp_path):
+    """Test the columnar on-disk cache round-trips and invalidates"""
+    path = tmp_path / "data.csv"
+    cache_dir = tmp_path / "cache"
+    df = pd.DataFrame(
+        {"A": [1, 2, 3], "B": [0.5, np.nan, 1.5], "C": ["x", None, "y"], "D": [True, False, True]}
+    )
+    df.to_csv(path, index=False)
+
+    first = read_csv(path, cache_dir=cache_dir)
+    second = read_csv(path, cache_dir=cache_dir)
+    pd.testing.assert_frame_equal(first, read_csv(path))
+    pd.testing.assert_frame_equal(second, first)
+
+    # Cached numeric columns are memory-mapped rather than copied
+    base = second["A"].to_numpy()
+    while base.base is not None and not isinstance(base, np.memmap):
+        base = base.base
+    assert isinstance(base, np.memmap)
+
+    # Different read arguments and a modified file get their own entries
+    read_csv(path, cache_dir=cache_dir, usecols=["A"])
+    assert len(list(cache_dir.iterdir())) == 2
+    pd.DataFrame({"A": [9]}).to_csv(path, index=False)
+    assert read_csv(path, cache_dir=cache_dir)["A"].tolist() == [9]
+
+    # Eviction keeps the cache within its size bound
+    read_csv(path, cache_dir=cache_dir, cache_max_bytes=0, usecols=["A"])
+    assert list(cache_dir.iterdir()) == []
+
+
+def test_read_csv_many(tmp_path):
+    """Test parallel multi-file reading"""
+    pd.DataFrame({"A": [1, 2], "B": ["x", "y"]}).to_csv(tmp_path / "part-0.csv", index=False)
+    pd.DataFrame({"A": [3.5, 4.5], "B": [None, None]}).to_csv(tmp_path / "part-1.csv", index=False)
+    pd.DataFrame({"A": [5, 6], "B": ["z", "w"]}).to_csv(tmp_path / "part-2.csv", index=False)
+
+    result = read_csv_many(
+        str(tmp_path / "part-*.csv"), max_workers=2, max_memory=1, source_column="source"
+    )
+    assert result["A"].tolist() == [1, 2, 3.5, 4.5, 5, 6]
+    assert result["A"].dtype == np.float64
+    assert result["B"].dtype == read_csv(tmp_path / "part-0.csv")["B"].dtype
+    assert result["source"].tolist() == [
+        str(tmp_path / f"part-{i}.csv") for i in [0, 0, 1, 1, 2, 2]
+    ]
+
+    # Serial reading gives the same result
+    paths = sorted(tmp_path.glob("part-*.csv"))
+    pd.testing.assert_frame_equal(
+        read_csv_many(paths, max_workers=1), result.drop(columns="source")
+    )
+
+    with pytest.raises(ValueError):
+        read_csv_many(str(tmp_path / "missing-*.csv"))
+
+
+def test_compact_frame():
+    """Test dtype downcasting and categorical compaction"""
+    df = pd.DataFrame(
+        {
+            "small": np.arange(100),
+            "signed": np.arange(100) - 50,
+            "wide": np.arange(100) * 100_000,
+            "half": np.arange(100) / 2,
+            "precise": np.arange(100) / 3,
+            "label": ["a", "b"] * 50,
+            "unique": [str(i) for i in range(100)],
+        }
+    )
+    result, report = compact_frame(df)
+
+    assert result["small"].dtype == np.uint8
+    assert result["signed"].dtype == np.int8
+    assert result["wide"].dtype == np.uint32
+    assert result["half"].dtype == np.float32
+    assert result["precise"].dtype == np.float64
+    assert result["label"].dtype == "category"
+    assert result["unique"].dtype == df["unique"].dtype
+    assert report["after"] < report["before"]
+    pd.testing.assert_frame_equal(result, df, check_dtype=False, check_categorical=False)
+
+
+def test_read_csv_optimize_memory(tmp_path):
+    """Test memory-optimized loading"""
+    path = tmp_path / "data.csv"
+    pd.DataFrame({"A": np.arange(100), "B": ["x", "y", "z", "w"] * 25}).to_csv(path, index=False)
+
+    result = read_csv(path, optimize_memory=True)
+    assert result["A"].dtype == np.uint8
+    assert result["B"].dtype == "category"
+
+    cached = read_csv(path, optimize_memory=True, cache_dir=tmp_path / "cache")
+    cached = read_csv(path, optimize_memory=True, cache_dir=tmp_path / "cache")
+    pd.testing.assert_frame_equal(cached, result)
+
+
+def test_normalizer():
+    """Test multi-column normalization with reusable parameters"""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"A": rng.normal(5, 2, 200), "B": rng.uniform(0, 10, 200), "C": ["x"] * 200})
+    df.loc[::7, "B"] = np.nan
+
+    for method in ["minmax", "zscore"]:
+        normalizer = Normalizer(method=method)
+        result = normalizer.fit_transform(df)
+        assert normalizer.columns == ["A", "B"]
+        for column in ["A", "B"]:
+            expected = normalize_column(df, column, method=method)[column]
+            np.testing.assert_allclose(result[column], expected)
+
+        # Incremental fitting over chunks gives the same parameters
+        incremental = Normalizer(method=method)
+        for start in range(0, 200, 30):
+            incremental.partial_fit(df.iloc[start : start + 30])
+        pd.testing.assert_frame_equal(incremental.parameters(), normalizer.parameters())
+
+    # In-place mode writes into the input frame
+    data = df.copy()
+    result = Normalizer(columns=["A"]).fit(data).transform(data, copy=False)
+    assert result is data
+    assert data["A"].min() == 0 and data["A"].max() == 1
+
+    with pytest.raises(ValueError):
+        Normalizer().transform(df)
+    with pytest.raises(ValueError):
+        Normalizer(method="invalid")
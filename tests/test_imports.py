@@ -0,0 +1,58 @@
+"""
+Import-time regression tests for the datalib package.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ["sklearn", "scipy", "matplotlib", "seaborn"]
+
+SCRIPT = """
+import json, sys
+import {module}
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"heavy": heavy}}))
+"""
+
+
+def _import_in_subprocess(module):
+    """Import a module in a fresh interpreter and report the heavy modules it loaded."""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    script = SCRIPT.format(module=module, heavy=HEAVY_MODULES)
+    output = subprocess.run(
+        [sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output)
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "datalib",
+        "datalib.data_manipulation",
+        "datalib.statistics",
+        "datalib.visualization",
+        "datalib.ml",
+        "datalib.instrumentation",
+        "datalib.pipeline",
+        "datalib.memoization",
+    ],
+)
+def test_import_is_lazy(module):
+    """Test that importing a submodule defers heavy dependencies"""
+    report = _import_in_subprocess(module)
+    assert report["heavy"] == []
+
+
+def test_submodules_load_on_attribute_access():
+    """Test that submodules are reachable as attributes of the package"""
+    import datalib
+
+    assert datalib.statistics.describe_column is not None
+    assert "ml" in dir(datalib)
+    with pytest.raises(AttributeError):
+        datalib.missing_module
@@ -0,0 +1,97 @@
+"""
+Tests for the instrumentation module.
+"""
+
+import io
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from datalib import instrumentation
+from datalib.data_manipulation import normalize_column
+from datalib.ml import RegressionModel
+from datalib.statistics import describe_column
+
+
+@pytest.fixture
+def sample_data():
+    """Create sample data for testing"""
+    np.random.seed(42)
+    return pd.DataFrame({"A": np.random.normal(0, 1, 100), "B": np.random.normal(0, 1, 100)})
+
+
+@pytest.fixture(autouse=True)
+def disable_instrumentation():
+    """Make sure no test leaves instrumentation enabled"""
+    yield
+    instrumentation.disable()
+
+
+def test_disabled_by_default(sample_data):
+    """Test that nothing is recorded unless enabled"""
+    events = []
+    sink = instrumentation.CallbackSink(events.append)
+    assert not instrumentation.is_enabled()
+    describe_column(sample_data, "A")
+    assert events == []
+
+    with instrumentation.instrumented(sink):
+        describe_column(sample_data, "A")
+    describe_column(sample_data, "A")
+    assert len(events) == 1
+
+
+def test_memory_sink(sample_data):
+    """Test aggregation of calls, rows, errors and memory"""
+    # Import scikit-learn before tracing; imports under tracemalloc are slow
+    RegressionModel()
+    with instrumentation.instrumented(track_memory=True) as sink:
+        model = RegressionModel()
+        model.fit(sample_data[["A"]], sample_data["B"])
+        model.predict(sample_data[["A"]])
+        model.predict(sample_data[["A"]].head(10))
+        with pytest.raises(KeyError):
+            describe_column(sample_data, "missing")
+
+    summary = sink.summary()
+    predict = summary.loc["datalib.ml.RegressionModel.predict"]
+    assert predict["calls"] == 2
+    assert predict["rows"] == 110
+    assert predict["wall_seconds"] >= predict["max_wall_seconds"] > 0
+    assert summary.loc["datalib.ml.RegressionModel.fit", "bytes"] > 0
+    assert summary.loc["datalib.statistics.describe_column", "errors"] == 1
+
+    sink.reset()
+    assert sink.summary().empty
+
+
+def test_memory_without_reset_peak(monkeypatch):
+    """Test the traced-delta fallback for Python versions without tracemalloc.reset_peak"""
+    monkeypatch.setattr(instrumentation, "_CAN_RESET_PEAK", False)
+    data = pd.DataFrame({"A": np.arange(100_000, dtype=float)})
+    with instrumentation.instrumented(track_memory=True) as sink:
+        result = normalize_column(data, "A")
+    assert sink.summary().loc["datalib.data_manipulation.normalize_column", "bytes"] > 0
+    assert len(result) == len(data)
+
+
+def test_json_lines_sink(tmp_path, sample_data):
+    """Test writing events as JSON lines to a path or file"""
+    path = tmp_path / "events.jsonl"
+    sink = instrumentation.JSONLinesSink(str(path))
+    with instrumentation.instrumented(sink):
+        describe_column(sample_data, "A")
+        describe_column(sample_data, "B")
+    sink.close()
+
+    events = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [event["name"] for event in events] == ["datalib.statistics.describe_column"] * 2
+    assert events[0]["rows"] == 100
+    assert events[0]["bytes"] is None
+
+    buffer = io.StringIO()
+    with instrumentation.instrumented(instrumentation.JSONLinesSink(buffer)):
+        describe_column(sample_data, "A")
+    assert json.loads(buffer.getvalue())["error"] is None
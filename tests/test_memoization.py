@@ -0,0 +1,125 @@
+"""
+Tests for the memoization module.
+"""
+
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from datalib import memoization
+from datalib.memoization import Memo, fingerprint
+from datalib.statistics import correlation_analysis, describe_column
+from datalib.visualization import plot_correlation_matrix
+
+
+@pytest.fixture
+def sample_data():
+    """Create sample data for testing"""
+    np.random.seed(42)
+    return pd.DataFrame(
+        {
+            "A": np.random.normal(0, 1, 100),
+            "B": np.random.normal(0, 1, 100),
+            "C": np.random.choice(["x", "y"], 100),
+        }
+    )
+
+
+@pytest.fixture(autouse=True)
+def disable_memoization():
+    """Make sure no test leaves memoization enabled"""
+    yield
+    memoization.disable()
+
+
+def test_fingerprint():
+    """Test that fingerprints follow content, names and dtypes, not identity"""
+    values = np.arange(1_000_000, dtype=float)
+    data = pd.DataFrame({"A": values})
+    assert fingerprint(data) == fingerprint(data.copy())
+    assert fingerprint(data) != fingerprint(data.rename(columns={"A": "B"}))
+    assert fingerprint(data) != fingerprint(data.astype(np.float32))
+
+    # A single value outside the sampled blocks is caught by the checksum
+    changed = data.copy()
+    changed.loc[123_457, "A"] += 1
+    assert fingerprint(data) != fingerprint(changed)
+
+
+def test_memoized_results(sample_data):
+    """Test hits, misses, result copies and reuse by plot_correlation_matrix"""
+    memo = memoization.enable()
+    first = describe_column(sample_data, "A")
+    first["mean"] = None
+    assert describe_column(sample_data, "A")["mean"] == sample_data["A"].mean()
+    assert (memo.hits, memo.misses) == (1, 1)
+
+    # Other columns and arguments are separate entries
+    describe_column(sample_data, "B")
+    assert memo.misses == 2
+    sample_data["C"] = "z"
+    describe_column(sample_data, "A")
+    assert memo.hits == 2
+
+    corr = correlation_analysis(sample_data)
+    fig = plot_correlation_matrix(sample_data)
+    assert memo.hits == 3
+    np.testing.assert_allclose(corr.to_numpy(), sample_data[["A", "B"]].corr().to_numpy())
+    assert len(fig.axes) >= 1
+
+
+def test_lru_and_invalidation(sample_data):
+    """Test the bounded LRU and explicit invalidation"""
+    memo = memoization.enable(max_entries=2)
+    for column in ["A", "B", "A"]:
+        describe_column(sample_data, column)
+    correlation_analysis(sample_data)
+    assert len(memo) == 2
+    describe_column(sample_data, "B")
+    assert memo.misses == 4
+
+    # Invalidating a frame drops every result derived from any of its columns
+    memoization.invalidate(sample_data[["C"]])
+    assert len(memo) == 2
+    memoization.invalidate(sample_data)
+    assert len(memo) == 0
+
+    describe_column(sample_data, "A")
+    describe_column(sample_data, "B")
+    memoization.invalidate(sample_data[["A"]])
+    assert len(memo) == 1
+    memoization.invalidate()
+    assert len(memo) == 0
+
+
+def test_disk_tier(sample_data, tmp_path):
+    """Test that results survive in the on-disk tier and can be invalidated"""
+    memoization.enable(cache_dir=str(tmp_path))
+    expected = correlation_analysis(sample_data, method="spearman")
+
+    memo = memoization.enable(cache_dir=str(tmp_path))
+    pd.testing.assert_frame_equal(correlation_analysis(sample_data, method="spearman"), expected)
+    assert memo.hits == 1
+
+    # Invalidating the frame also drops the result stored on disk
+    describe_column(sample_data, "A")
+    memoization.enable(cache_dir=str(tmp_path)).invalidate(sample_data)
+    assert list(tmp_path.glob("*.pkl")) == []
+
+    describe_column(sample_data, "A")
+    memo.clear()
+    assert list(tmp_path.glob("*")) == []
+
+    # Entries that cannot be unpickled are misses and are deleted
+    memo = Memo(cache_dir=str(tmp_path))
+    memo.put("stale", expected)
+    (tmp_path / "stale.pkl").write_bytes(pickle.dumps(expected).replace(b"pandas", b"pandaz"))
+    assert Memo(cache_dir=str(tmp_path)).get("stale") is None
+    assert not (tmp_path / "stale.pkl").exists()
+
+    small = Memo(cache_dir=str(tmp_path), cache_max_bytes=0)
+    small.put("key", expected)
+    assert list(tmp_path.glob("*.pkl")) == []
+    assert small.get("key") is not None
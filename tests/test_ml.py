@@ -2,11 +2,31 @@
 Tests for the machine learning module.
 """
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pandas as pd
 import pytest
+from scipy import sparse
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import f1_score, mean_squared_error, r2_score
+from sklearn.preprocessing import PolynomialFeatures
 
-from datalib.ml import ClassificationModel, RegressionModel, prepare_data
+from datalib.data_manipulation import CSVChunks
+from datalib.ml import (
+    BatchingPredictor,
+    ClassificationMetrics,
+    ClassificationModel,
+    PolynomialExpansion,
+    RegressionMetrics,
+    RegressionModel,
+    benchmark_knn_recall,
+    prepare_data,
+    split_indices,
+    take_rows,
+    tune,
+)
 
 
 @pytest.fixture
@@ -98,6 +118,8 @@ def test_invalid_model_type():
     """Test error handling for invalid model type"""
     with pytest.raises(ValueError):
         ClassificationModel(model_type="invalid_type")
+    with pytest.raises(ValueError):
+        RegressionModel(model_type="invalid_type")
 
 
 def test_predict_before_fit(regression_data):
@@ -107,3 +129,284 @@ def test_predict_before_fit(regression_data):
 
     with pytest.raises(ValueError):
         model.predict(X)
+
+
+def test_regression_partial_fit(regression_data):
+    """Test incremental fitting matches the batch fit"""
+    X, y = regression_data
+    batch = RegressionModel()
+    batch.fit(X, y)
+
+    streamed = RegressionModel()
+    for start in range(0, len(X), 15):
+        streamed.partial_fit(X.iloc[start : start + 15], y.iloc[start : start + 15])
+    np.testing.assert_allclose(streamed.model.coef_, batch.model.coef_)
+    np.testing.assert_allclose(streamed.predict(X), batch.predict(X))
+
+    # Accumulators built on separate workers can be merged
+    left, right = RegressionModel(), RegressionModel()
+    left.partial_fit(X.iloc[:40], y.iloc[:40])
+    right.partial_fit(X.iloc[40:], y.iloc[40:])
+    left.merge(right)
+    np.testing.assert_allclose(left.predict(X), batch.predict(X))
+
+    with pytest.raises(ValueError):
+        left.merge(batch)
+
+    # Without an intercept the streamed fit still matches the batch fit
+    batch = RegressionModel(fit_intercept=False)
+    batch.fit(X, y + 5)
+    streamed = RegressionModel(fit_intercept=False)
+    for start in range(0, len(X), 15):
+        streamed.partial_fit(X.iloc[start : start + 15], y.iloc[start : start + 15] + 5)
+    np.testing.assert_allclose(streamed.model.coef_, batch.model.coef_)
+    assert streamed.model.intercept_ == 0
+
+    with pytest.raises(ValueError):
+        RegressionModel(positive=True).partial_fit(X, y)
+
+
+def test_model_save_load(tmp_path, regression_data, classification_data):
+    """Test model persistence with memory-mapped arrays"""
+    X, y = regression_data
+    model = RegressionModel()
+    model.fit(X, y)
+    model.save(tmp_path / "regression")
+    loaded = RegressionModel.load(tmp_path / "regression")
+    np.testing.assert_allclose(loaded.predict(X), model.predict(X))
+
+    X, y = classification_data
+    for model_type in ["logistic", "decision_tree", "knn"]:
+        model = ClassificationModel(model_type=model_type)
+        model.fit(X, y)
+        model.save(tmp_path / model_type)
+        for mmap in [True, False]:
+            loaded = ClassificationModel.load(tmp_path / model_type, mmap=mmap)
+            assert loaded.model_type == model_type
+            np.testing.assert_allclose(loaded.predict_proba(X), model.predict_proba(X))
+
+    with pytest.raises(ValueError):
+        RegressionModel.load(tmp_path / "knn")
+
+
+def test_batching_predictor(classification_data):
+    """Test micro-batched predictions from threads and asyncio"""
+    X, y = classification_data
+    model = ClassificationModel()
+    model.fit(X.to_numpy(), y)
+    expected = model.predict_proba(X.to_numpy())
+
+    with BatchingPredictor(model, max_batch_size=32, max_wait=0.05) as predictor:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(predictor.predict_proba, X.to_numpy()))
+        np.testing.assert_allclose(np.array(results), expected)
+
+        async def score_all():
+            rows = [
+                predictor.predict_proba_async(X.to_numpy()[i : i + 10]) for i in range(0, 100, 10)
+            ]
+            return await asyncio.gather(*rows)
+
+        np.testing.assert_allclose(np.vstack(asyncio.run(score_all())), expected)
+
+        stats = predictor.stats()
+        assert stats["requests"] == 110
+        assert stats["rows"] == 200
+        assert stats["batches"] < stats["requests"]
+
+        # A malformed request fails on its own without stopping the batching thread
+        good = predictor.submit(X.to_numpy()[0])
+        bad = predictor.submit(np.zeros(X.shape[1] + 1))
+        np.testing.assert_allclose(good.result(timeout=5), expected[0])
+        with pytest.raises(ValueError):
+            bad.result(timeout=5)
+        np.testing.assert_allclose(predictor.predict_proba(X.to_numpy()[:2]), expected[:2])
+
+        # Requests cancelled by their callers are dropped without stopping the thread
+        for row in X.to_numpy()[:20]:
+            predictor.submit(row).cancel()
+
+        async def cancelled():
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(predictor.predict_proba_async(X.to_numpy()[0]), 0)
+
+        asyncio.run(cancelled())
+        later = predictor.submit(X.to_numpy()[1])
+        np.testing.assert_allclose(later.result(timeout=5), expected[1])
+
+    with pytest.raises(RuntimeError):
+        predictor.predict_proba(X.to_numpy()[:1])
+
+
+def test_approximate_knn(classification_data):
+    """Test the random-projection forest knn classifier"""
+    X, y = classification_data
+    model = ClassificationModel(
+        model_type="approximate_knn",
+        n_trees=20,
+        leaf_size=10,
+        batch_size=16,
+        n_jobs=2,
+        random_state=0,
+    )
+    model.fit(X, y)
+
+    probas = model.predict_proba(X)
+    assert probas.shape == (len(y), 2)
+    np.testing.assert_allclose(probas.sum(axis=1), 1)
+    assert model.evaluate(X, y)["accuracy"] > 0.9
+
+    report = benchmark_knn_recall(model, X, k=5)
+    assert report["recall"] > 0.9
+    assert report["ann_seconds"] > 0
+
+    with pytest.raises(ValueError):
+        benchmark_knn_recall(ClassificationModel(model_type="knn"), X)
+
+
+def test_tune(regression_data, classification_data):
+    """Test parallel cross-validated grid search"""
+    X, y = regression_data
+    results = tune(
+        "linear",
+        {"fit_intercept": [True, False]},
+        X.assign(target=y),
+        "target",
+        cv=3,
+        n_jobs=2,
+        random_state=0,
+    )
+    assert len(results) == 2
+    assert results["mean_score"].iloc[0] > 0.99
+    assert (results["mean_fit_time"] > 0).all()
+
+    X, y = classification_data
+    results = tune(
+        "knn",
+        {"n_neighbors": [1, 3, 5, 7], "weights": ["uniform", "distance"]},
+        X.assign(target=y),
+        "target",
+        cv=3,
+        n_jobs=1,
+        successive_halving=True,
+        factor=2,
+        random_state=0,
+    )
+    rounds = results.groupby("round").size()
+    assert rounds.tolist() == [8, 4, 2]
+    assert results["resource"].iloc[0] == 1
+    assert results["mean_score"].iloc[0] > 0.8
+
+    with pytest.raises(ValueError):
+        tune("linear", {}, X.assign(target=y), "target", cv=1)
+
+
+def test_tune_successive_halving_small_data():
+    """Test that halving rounds stay above min_resources and failed fits are eliminated"""
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(300, 3)), columns=["a", "b", "c"])
+    data = X.assign(target=(X["a"] + X["b"] > 0).astype(int))
+    grid = {"n_neighbors": list(range(1, 54, 6)), "weights": ["uniform", "distance", "bogus"]}
+    with pytest.warns(UserWarning, match="fits failed"):
+        results = tune(
+            "knn", grid, data, "target", cv=3, n_jobs=1, successive_halving=True, random_state=0
+        )
+
+    # The first round still trains on at least the largest n_neighbors rows
+    assert results["resource"].min() * 200 >= 49
+    first = results[results["round"] == 0]
+    assert len(first) == 27
+    assert first.loc[first["param_weights"] == "bogus", "mean_score"].isna().all()
+    assert (results.loc[results["round"] > 0, "param_weights"] != "bogus").all()
+    assert results["mean_score"].iloc[0] > 0.8
+
+
+def test_split_indices(tmp_path, classification_data):
+    """Test index-based splitting of frames, arrays and chunks"""
+    X, y = classification_data
+    df = X.assign(target=y)
+
+    train, test = split_indices(df, test_size=0.25, stratify="target", random_state=0)
+    assert len(train) == 75 and len(test) == 25
+    assert len(np.intersect1d(train, test)) == 0
+    assert abs(y.iloc[test].mean() - y.mean()) < 0.05
+
+    train, test = split_indices(X.to_numpy(), test_size=0.2, shuffle=False)
+    np.testing.assert_array_equal(test, np.arange(80, 100))
+    view = take_rows(X.to_numpy(), train)
+    assert view.base is not None
+
+    filepath = tmp_path / "data.csv"
+    df.to_csv(filepath, index=False)
+    chunks = CSVChunks(filepath, chunksize=30)
+    chunk_train, chunk_test = prepare_data(
+        chunks, "target", stratify=True, random_state=0, return_indices=True, test_size=0.25
+    )
+    expected_train, expected_test = split_indices(
+        df, test_size=0.25, stratify="target", random_state=0
+    )
+    np.testing.assert_array_equal(chunk_test, expected_test)
+    selected = pd.concat(take_rows(chunks, chunk_train), ignore_index=True)
+    np.testing.assert_allclose(selected["X1"], df["X1"].iloc[expected_train])
+
+    with pytest.raises(ValueError):
+        split_indices(df, test_size=1.5)
+
+
+def test_streaming_metrics(regression_data, classification_data):
+    """Test incremental metric accumulators against scikit-learn"""
+    X, y = regression_data
+    model = RegressionModel()
+    model.fit(X, y)
+    predictions = model.predict(X)
+    metrics = RegressionMetrics()
+    for start in range(0, len(y), 30):
+        metrics.update(y[start : start + 30], predictions[start : start + 30])
+    result = metrics.result()
+    assert result["mse"] == pytest.approx(mean_squared_error(y, predictions))
+    assert result["rmse"] == pytest.approx(np.sqrt(result["mse"]))
+    assert result["r2"] == pytest.approx(r2_score(y, predictions))
+    assert model.evaluate(X, y) == pytest.approx(result)
+
+    X, y = classification_data
+    predictions = np.where(np.arange(len(y)) % 7 == 0, 2, y)
+    first = ClassificationMetrics().update(y[:40], predictions[:40])
+    second = ClassificationMetrics().update(y[40:], predictions[40:])
+    result = first.merge(second).result()
+    assert result["accuracy"] == pytest.approx(np.mean(predictions == y))
+    assert result["macro_f1"] == pytest.approx(
+        f1_score(y, predictions, average="macro", zero_division=0)
+    )
+    assert first.confusion_matrix().shape == (3, 3)
+    assert first.per_class().loc[2, "support"] == 0
+
+    model = ClassificationModel()
+    model.fit(X, y)
+    assert "classification_report" not in model.evaluate(X, y, report=False)
+
+
+def test_polynomial_regression(regression_data):
+    """Test lazily expanded polynomial regression against a dense expansion"""
+    X, _ = regression_data
+    X = X.assign(X3=X["X1"] * 0.5 + 1)
+    y = 1 + X["X1"] * X["X2"] - 0.5 * X["X2"] ** 3 + X["X3"]
+    dense = PolynomialFeatures(degree=3, include_bias=False).fit_transform(X)
+
+    expansion = PolynomialExpansion(degree=3).fit(X.to_numpy())
+    v = np.arange(expansion.n_output_features_, dtype=float)
+    assert expansion.n_output_features_ == dense.shape[1]
+    np.testing.assert_allclose(expansion.transform(X.to_numpy()), dense)
+    np.testing.assert_allclose(expansion.matvec(X.to_numpy(), v), dense @ v)
+    np.testing.assert_allclose(expansion.rmatvec(sparse.csr_matrix(X), y.to_numpy()), dense.T @ y)
+
+    expected = LinearRegression().fit(dense, y).predict(dense)
+    for solver in ["normal", "lsqr"]:
+        model = RegressionModel(model_type="polynomial", degree=3, solver=solver)
+        model.fit(X, y)
+        np.testing.assert_allclose(model.predict(X), expected, atol=1e-6)
+        assert model.evaluate(X, y)["r2"] > 0.9999
+
+    chunked = RegressionModel(model_type="polynomial", degree=3, memory_budget=1024)
+    for start in range(0, len(X), 40):
+        chunked.partial_fit(X[start : start + 40], y[start : start + 40])
+    np.testing.assert_allclose(chunked.predict(X), expected, atol=1e-6)
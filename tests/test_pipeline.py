@@ -0,0 +1,111 @@
+"""
+Tests for the pipeline module.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from datalib.data_manipulation import normalize_column
+from datalib.pipeline import LazyFrame, scan_csv
+from datalib.statistics import correlation_analysis, describe_column
+
+
+@pytest.fixture
+def sample_data():
+    """Create sample data for testing"""
+    np.random.seed(42)
+    data = pd.DataFrame(
+        {
+            "A": np.random.normal(0, 1, 500),
+            "B": np.random.normal(5, 2, 500),
+            "C": np.random.exponential(1, 500),
+            "D": np.random.choice(["x", "y"], 500),
+        }
+    )
+    data["B"] += data["A"]
+    data.loc[::50, "C"] = np.nan
+    return data
+
+
+@pytest.fixture
+def sample_csv(sample_data, tmp_path):
+    """Write the sample data to a CSV file"""
+    path = tmp_path / "sample.csv"
+    sample_data.to_csv(path, index=False)
+    return str(path)
+
+
+def _assert_measures_close(actual, expected):
+    assert set(actual) == set(expected)
+    for key in expected:
+        assert np.isclose(actual[key], expected[key], equal_nan=True), key
+
+
+def test_collect_matches_eager(sample_data, sample_csv):
+    """Test that collecting a chunked pipeline matches the eager functions"""
+    frame = scan_csv(sample_csv, chunksize=64).select(["C", "A"]).normalize("A", "zscore")
+    frame = frame.normalize("A").normalize("C")
+    result = frame.collect()
+
+    expected = sample_data[["C", "A"]]
+    expected = normalize_column(expected, "A", "zscore")
+    expected = normalize_column(normalize_column(expected, "A"), "C")
+    assert list(result.columns) == ["C", "A"]
+    assert len(result) == len(sample_data)
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), atol=1e-12)
+    assert frame.explain() == {
+        "usecols": ["C", "A"],
+        "passes": 2,
+        "normalize": {"A": ["zscore", "minmax"], "C": ["minmax"]},
+    }
+
+
+def test_compute_single_pass(sample_data, sample_csv):
+    """Test that fused aggregations match the eager ones on normalized columns"""
+    frame = scan_csv(sample_csv, memory_budget=4096).normalize("B", "zscore")
+    result = frame.compute(describe=["B", "C"], correlation=["A", "B"])
+
+    expected = normalize_column(sample_data, "B", "zscore")
+    _assert_measures_close(result["describe"]["B"], describe_column(expected, "B"))
+    _assert_measures_close(result["describe"]["C"], describe_column(expected, "C"))
+    pd.testing.assert_frame_equal(
+        result["correlation"], correlation_analysis(expected[["A", "B"]]), check_exact=False
+    )
+    assert frame.explain(describe=["B", "C"], correlation=["A", "B"]) == {
+        "usecols": ["B", "C", "A"],
+        "passes": 1,
+        "normalize": {"B": ["zscore"]},
+    }
+
+
+def test_correlation_of_selection(sample_data):
+    """Test correlating all numerical columns of a selection of a DataFrame"""
+    frame = LazyFrame(sample_data).select(["A", "C", "D"]).normalize("C")
+    expected = sample_data[["A", "C"]].corr()
+    pd.testing.assert_frame_equal(frame.correlation(), expected, check_exact=False)
+    assert np.isclose(frame.describe("A")["mean"], sample_data["A"].mean())
+
+
+def test_chunk_iterables(sample_data):
+    """Test re-iterable chunk sources and the error on single-use iterators"""
+    chunks = [sample_data.iloc[i : i + 100] for i in range(0, len(sample_data), 100)]
+    result = LazyFrame(chunks).normalize("A").collect()
+    np.testing.assert_allclose(result["A"], normalize_column(sample_data, "A")["A"])
+    pd.testing.assert_frame_equal(pd.concat(chunks), sample_data)
+
+    with pytest.raises(ValueError):
+        LazyFrame(iter(chunks)).normalize("A").collect()
+    summary = LazyFrame(iter(chunks)).normalize("A").describe("A")
+    assert np.isclose(summary["median"], normalize_column(sample_data, "A")["A"].median())
+
+
+def test_invalid_operations(sample_data):
+    """Test error handling of invalid pipelines"""
+    frame = LazyFrame(sample_data).select(["A", "B"])
+    with pytest.raises(ValueError):
+        frame.normalize("A", "invalid")
+    with pytest.raises(ValueError):
+        frame.normalize("C")
+    with pytest.raises(ValueError):
+        frame.compute(describe="C")
@@ -2,11 +2,27 @@
 Tests for the statistics module.
 """
 
+import json
+
 import numpy as np
 import pandas as pd
 import pytest
+from scipy import stats as stats_module
 
-from datalib.statistics import correlation_analysis, describe_column, ttest_columns
+from datalib.data_manipulation import read_csv
+from datalib.statistics import (
+    CountMinSketch,
+    HyperLogLog,
+    KLLSketch,
+    correlation_analysis,
+    correlation_matrix,
+    describe_column,
+    describe_frame,
+    top_correlations,
+    ttest_columns,
+    ttest_from_stats,
+    ttest_many,
+)
 
 
 def test_describe_column():
@@ -39,3 +55,179 @@ def test_ttest_columns():
     # For identical distributions, t-stat should be 0 and p-value should be 1
     assert t_stat == pytest.approx(0, abs=1e-10)
     assert p_value == pytest.approx(1.0)
+
+
+def test_describe_column_stream(tmp_path):
+    """Test single-pass statistics over streamed chunks"""
+    path = tmp_path / "data.csv"
+    df = pd.DataFrame({"A": np.random.default_rng(0).integers(0, 50, 1001).astype(float)})
+    df.loc[::97, "A"] = np.nan
+    df.to_csv(path, index=False)
+
+    expected = describe_column(df, "A")
+    result = describe_column(read_csv(path, stream=True, chunksize=100), "A")
+    for key, value in expected.items():
+        assert result[key] == pytest.approx(value), key
+
+    # A column without values describes as missing values
+    empty = pd.DataFrame({"A": [np.nan] * 10})
+    for approximate in [False, True]:
+        result = describe_column([empty.iloc[:5], empty.iloc[5:]], "A", approximate=approximate)
+        assert all(np.isnan(value) for value in result.values())
+
+
+def test_correlation_analysis_stream(tmp_path):
+    """Test single-pass Pearson correlation over streamed chunks"""
+    path = tmp_path / "data.csv"
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"A": rng.normal(100, 1, 500), "B": rng.normal(0, 1, 500)})
+    df["C"] = df["A"] + df["B"]
+    df.loc[::13, "B"] = np.nan
+    df.to_csv(path, index=False)
+
+    result = correlation_analysis(read_csv(path, stream=True, chunksize=64))
+    pd.testing.assert_frame_equal(result, correlation_analysis(df))
+
+    with pytest.raises(ValueError):
+        correlation_analysis(read_csv(path, stream=True), method="kendall")
+
+
+def test_describe_frame():
+    """Test batched statistics for many columns"""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "A": [1, 2, 2, 3, 4, 5],
+            "B": rng.integers(0, 3, 6).astype(float),
+            "C": [np.nan, 1.0, 1.0, 2.0, 2.0, np.nan],
+            "D": ["a"] * 6,
+        }
+    )
+    result = describe_frame(df)
+
+    assert list(result.index) == ["A", "B", "C"]
+    assert result.loc["C", "count"] == 4
+    for column in result.index:
+        expected = describe_column(df, column)
+        for key, value in expected.items():
+            assert result.loc[column, key] == pytest.approx(value, nan_ok=True), (column, key)
+
+
+def test_sketches():
+    """Test mergeable quantile, frequency and distinct-count sketches"""
+    rng = np.random.default_rng(0)
+    values = rng.normal(0, 1, 100_000)
+    labels = rng.zipf(2.0, 100_000)
+    labels = labels[labels < 1000]
+
+    partitions = []
+    for part, part_labels in zip(np.array_split(values, 4), np.array_split(labels, 4)):
+        sketches = KLLSketch(seed=0), CountMinSketch(), HyperLogLog()
+        sketches[0].update(part)
+        sketches[1].update(part_labels)
+        sketches[2].update(part_labels)
+        partitions.append(sketches)
+
+    quantiles, frequencies, distinct = partitions[0]
+    for other in partitions[1:]:
+        quantiles.merge(other[0])
+        frequencies.merge(other[1])
+        distinct.merge(other[2])
+
+    assert quantiles.n == len(values)
+    for q in [0.1, 0.5, 0.9]:
+        assert np.mean(values <= quantiles.quantile(q)) == pytest.approx(q, abs=0.02)
+    assert frequencies.mode() == pd.Series(labels).mode()[0]
+    assert distinct.count() == pytest.approx(len(np.unique(labels)), rel=0.05)
+
+    # Serialization round-trips through JSON
+    for sketch in (quantiles, frequencies, distinct):
+        restored = type(sketch).from_dict(json.loads(json.dumps(sketch.to_dict())))
+        assert restored.to_dict() == sketch.to_dict()
+
+    with pytest.raises(ValueError):
+        quantiles.merge(KLLSketch(k=50))
+
+
+def test_describe_column_stream_approximate(tmp_path):
+    """Test sketch-based statistics over streamed chunks"""
+    path = tmp_path / "data.csv"
+    df = pd.DataFrame({"A": np.random.default_rng(0).integers(0, 100, 5000)})
+    df.loc[:999, "A"] = 7
+    df.to_csv(path, index=False)
+
+    result = describe_column(read_csv(path, stream=True, chunksize=500), "A", approximate=True)
+    assert result["mode"] == 7
+    assert result["mean"] == pytest.approx(df["A"].mean())
+    assert result["median"] == pytest.approx(df["A"].median(), abs=3)
+
+
+@pytest.mark.parametrize("method", ["pearson", "spearman", "kendall"])
+def test_correlation_matrix(method):
+    """Test the fast correlation engine against pandas"""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(200, 7)), columns=list("ABCDEFG"))
+    df["B"] = df["A"] + 0.1 * df["B"]
+    df["G"] = 1.0
+
+    expected = df.corr(method=method)
+    pd.testing.assert_frame_equal(correlation_matrix(df, method=method, block_size=3), expected)
+    pd.testing.assert_frame_equal(correlation_matrix(df, method=method, n_jobs=2), expected)
+
+    df.loc[::9, "C"] = np.nan
+    pd.testing.assert_frame_equal(correlation_matrix(df, method=method), df.corr(method=method))
+
+
+def test_top_correlations():
+    """Test top-k correlated pairs without the full matrix"""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(500, 20)))
+    df[1] = df[0] + 0.1 * df[1]
+    df[7] = -df[3] + 0.5 * df[7]
+
+    for method in ["pearson", "spearman", "kendall"]:
+        top = top_correlations(df, k=2, threshold=0.5, method=method, block_size=4)
+        assert list(zip(top["column1"], top["column2"])) == [(0, 1), (3, 7)]
+        assert top["correlation"].iloc[1] < 0
+
+    assert len(top_correlations(df, k=5, threshold=0.99)) == 1
+
+
+def test_ttest_many():
+    """Test batched t-tests against scipy"""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(60, 3)), columns=["A", "B", "C"])
+    df["C"] += 1
+    df["group"] = ["x", "y", "y"] * 20
+
+    result = ttest_many(df, pairs=[("A", "B"), ("A", "C")])
+    for col1, col2 in [("A", "B"), ("A", "C")]:
+        expected = ttest_columns(df, col1, col2)
+        assert tuple(result.loc[(col1, col2), ["t_stat", "p_value"]]) == pytest.approx(expected)
+
+    result = ttest_many(df, group_column="group", equal_var=False)
+    for column in ["A", "B", "C"]:
+        x, y = df.loc[df["group"] == "x", column], df.loc[df["group"] == "y", column]
+        expected = stats_module.ttest_ind(x, y, equal_var=False)
+        assert result.loc[column, "t_stat"] == pytest.approx(expected.statistic)
+        assert result.loc[column, "p_value"] == pytest.approx(expected.pvalue)
+
+    with pytest.raises(ValueError):
+        ttest_many(df)
+
+
+def test_ttest_from_stats_corrections():
+    """Test t-tests from summary statistics with multiple-testing corrections"""
+    result = ttest_from_stats(
+        [0.0, 0.5, 1.0, 0.0], 1.0, 50, [0.0, 0.0, 0.0, np.nan], 1.0, 50, correction="fdr_bh"
+    )
+    assert result["t_stat"].iloc[0] == 0
+    assert np.isnan(result["p_adjusted"].iloc[3])
+    p = result["p_value"].iloc[:3].to_numpy()
+    assert result["p_adjusted"].iloc[:3].tolist() == pytest.approx([p[0], p[1] * 3 / 2, p[2] * 3])
+
+    bonferroni = ttest_from_stats([0.5], 1.0, 50, [0.0], 1.0, 50, correction="bonferroni")
+    assert bonferroni["p_adjusted"].iloc[0] == pytest.approx(bonferroni["p_value"].iloc[0])
+
+    with pytest.raises(ValueError):
+        ttest_from_stats([0.5], 1.0, 50, [0.0], 1.0, 50, correction="invalid")
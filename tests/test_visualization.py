@@ -8,10 +8,12 @@ import pandas as pd
 import pytest
 
 from datalib.visualization import (
+    HistogramAccumulator,
     plot_boxplot,
     plot_correlation_matrix,
     plot_histogram,
     plot_scatter,
+    render_figures,
 )
 
 
@@ -35,6 +37,47 @@ def test_plot_histogram(sample_data):
     plt.close(fig)
 
 
+def test_histogram_accumulator(sample_data):
+    """Test incremental, mergeable histograms and plotting from counts"""
+    values = np.random.default_rng(0).normal(size=10000)
+    adaptive = HistogramAccumulator(bins=20)
+    for chunk in np.array_split(values, 25):
+        adaptive.update(chunk)
+    expected, _ = np.histogram(values, bins=adaptive.edges)
+    np.testing.assert_array_equal(adaptive.counts, expected)
+    assert adaptive.total == len(values)
+
+    left = HistogramAccumulator(bins=10, range=(-2, 2))
+    right = HistogramAccumulator(bins=10, range=(-2, 2))
+    left.update(values[:5000])
+    right.update(np.append(values[5000:], np.nan))
+    left.merge(right)
+    expected, _ = np.histogram(values, bins=left.edges)
+    np.testing.assert_array_equal(left.counts, expected)
+    assert left.n_outside == np.sum(np.abs(values) > 2)
+
+    # Values on the first chunk's maximum move up a bin once the range grows past it
+    grown = HistogramAccumulator(bins=4)
+    chunks = [np.array([0.0, 1.0, 1.0, 0.25]), np.array([2.0]), np.array([-0.5, 1.0, 9.0])]
+    for chunk in chunks:
+        grown.update(chunk)
+    expected, _ = np.histogram(np.concatenate(chunks), bins=grown.edges)
+    np.testing.assert_array_equal(grown.counts, expected)
+
+    restored = HistogramAccumulator.from_dict(adaptive.to_dict())
+    np.testing.assert_array_equal(restored.edges, adaptive.edges)
+    np.testing.assert_array_equal(restored.counts, adaptive.counts)
+
+    fig = plot_histogram(restored, "A")
+    assert len(fig.axes[0].patches) == 20
+    plt.close(fig)
+
+    chunks = [sample_data.iloc[:50], sample_data.iloc[50:]]
+    fig = plot_histogram(chunks, "A", bins=10)
+    assert sum(patch.get_height() for patch in fig.axes[0].patches) == len(sample_data)
+    plt.close(fig)
+
+
 def test_plot_scatter(sample_data):
     """Test scatter plot"""
     fig = plot_scatter(sample_data, "A", "B")
@@ -42,6 +85,26 @@ def test_plot_scatter(sample_data):
     plt.close(fig)
 
 
+def test_plot_scatter_large_modes():
+    """Test density and outlier-preserving sample scatter modes"""
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({"x": rng.normal(size=50000), "y": rng.normal(size=50000)})
+    data.loc[0, ["x", "y"]] = [100.0, -100.0]
+
+    fig = plot_scatter(data, "x", "y", mode="density", bins=50)
+    assert fig.axes[0].images[0].get_array().shape == (50, 50)
+    plt.close(fig)
+
+    fig = plot_scatter(data, "x", "y", mode="sample", max_points=1000, random_state=0)
+    points = fig.axes[0].collections[0].get_offsets()
+    assert len(points) < 1500
+    assert [100.0, -100.0] in np.asarray(points).tolist()
+    plt.close(fig)
+
+    with pytest.raises(ValueError):
+        plot_scatter(data, "x", "y", mode="invalid")
+
+
 def test_plot_correlation_matrix(sample_data):
     """Test correlation matrix plot"""
     fig = plot_correlation_matrix(sample_data)
@@ -61,3 +124,28 @@ def test_plot_boxplot_multiple(sample_data):
     fig = plot_boxplot(sample_data, ["A", "B", "C"])
     assert isinstance(fig, plt.Figure)
     plt.close(fig)
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_render_figures(tmp_path, sample_data, processes):
+    """Test batch figure export"""
+    csv_path = tmp_path / "data.csv"
+    sample_data.to_csv(csv_path, index=False)
+    specs = [
+        {"plot": "histogram", "data": sample_data, "params": {"column": "A"}, "name": "hist"},
+        {"plot": "scatter", "data": str(csv_path), "params": {"x_col": "A", "y_col": "B"}},
+        {"plot": "boxplot", "data": sample_data, "params": {"columns": "C"}, "formats": ["svg"]},
+        {"plot": "histogram", "data": sample_data, "params": {"column": "missing"}},
+    ]
+    report = render_figures(specs, str(tmp_path / "figures"), processes=processes)
+
+    assert report["name"].tolist() == ["hist", "figure-1", "figure-2", "figure-3"]
+    assert (tmp_path / "figures" / "hist.png").exists()
+    assert report["paths"].iloc[2][0].endswith("figure-2.svg")
+    assert (report["render_seconds"].iloc[:3] > 0).all()
+    assert report["error"].iloc[:3].isna().all()
+    assert "KeyError" in report["error"].iloc[3]
+    assert plt.get_fignums() == []
+
+    with pytest.raises(ValueError):
+        render_figures([{"plot": "pie", "data": sample_data}], str(tmp_path))